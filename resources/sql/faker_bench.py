@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - Benchmark de las vistas Power BI
+Siembra la BD con faker_data.py en varios puntos de escala y mide las vistas
+de powerbi_queries.sql y la query de KPIs en cada uno.
+
+Por cada escala:
+    1. Recrea el schema (vessel_schema.sql) y las vistas (powerbi_queries.sql)
+    2. Siembra con VesselFaker (misma semilla en todas las corridas)
+    3. ANALYZE TABLE y ejecuta cada query N veces (p50/p95/p99)
+    4. Guarda el EXPLAIN ANALYZE de cada query
+
+El reporte (JSON + Markdown) compara las escalas entre sí y, con --baseline,
+contra un reporte anterior para ver regresiones por cambios de índices o schema.
+
+⚠ Borra y recrea las tablas de --database: usar una BD dedicada.
+
+Uso:
+    python faker_bench.py --scales 10000,100000,1000000
+    python faker_bench.py --scales 10000,100000 --runs 20 --output bench/
+    python faker_bench.py --distributions distributions/retail.json  # Siembra con SKUs/bodegas calientes
+    python faker_bench.py --rollups  # Vistas sobre tablas crudas vs tablas rollup_*
+    python faker_bench.py --baseline bench/report.json --output bench_nuevo/  # Compara contra otra corrida
+
+MySQL local con Docker:
+    docker run -d --name vessel-bench -p 3307:3306 -e MYSQL_ROOT_PASSWORD=secret \\
+        -e MYSQL_DATABASE=vessel_bench mysql:8.0 --local-infile=1
+    python faker_bench.py --password secret
+
+Requisitos:
+    pip install faker numpy mysql-connector-python
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from faker_data import (
+    HAS_MYSQL, Distributions, TextPool, VesselFaker, apply_sql_file, connect_db, insert_direct_to_db, set_run_clock,
+    sql_statements,
+)
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+SQL_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_FILE = os.path.join(SQL_DIR, 'vessel_schema.sql')
+QUERIES_FILE = os.path.join(SQL_DIR, 'powerbi_queries.sql')
+ROLLUPS_FILE = os.path.join(SQL_DIR, 'rollups_schema.sql')
+
+# Vistas que importa Power BI y cuyo costo crece con el stock
+BENCH_VIEWS = ['vw_stock_by_location', 'vw_inventory_by_category', 'vw_low_stock_alerts', 'vw_expiring_soon']
+
+# Equivalentes precalculados (--rollups) de las vistas y la query de KPIs
+ROLLUP_QUERIES = {
+    'rollup_stock_by_location': "SELECT * FROM `rollup_stock_by_location`",
+    'rollup_inventory_by_category': "SELECT * FROM `rollup_inventory_by_category`",
+    'rollup_kpi_snapshot': "SELECT * FROM `rollup_kpi_snapshot` ORDER BY `snapshot_at` DESC LIMIT 1",
+}
+
+# Columnas de rollup_inventory_by_category que deben coincidir con vw_inventory_by_category
+CATEGORY_COLUMNS = ['category', 'total_items', 'total_stock_records', 'total_quantity', 'reserved',
+                    'avg_quantity_per_location']
+
+# Filas de las otras tablas por cada fila de stock_items en cada escala
+ITEMS_PER_STOCK = 0.15
+MOVEMENTS_PER_STOCK = 1.5
+
+# Tablas cuyo tamaño (datos + índices) se informa por escala
+SIZE_TABLES = ['catalog_items', 'catalog_item_identifiers', 'stock_items', 'stock_movements']
+
+PERCENTILES = [50, 95, 99]
+
+# Diferencia de p50 contra el baseline a partir de la cual se marca regresión
+REGRESSION_THRESHOLD = 0.20
+
+# =====================================================
+# QUERIES
+# =====================================================
+
+def load_queries(views=None, rollups=False, today=None):
+    """Retorna (sentencias CREATE VIEW, {nombre: query a medir}) de powerbi_queries.sql
+    
+    Con `today` las vistas usan esa fecha en lugar de CURDATE(): los datos se
+    generan con un 'ahora' fijo (--now) y vw_expiring_soon clasifica los
+    vencimientos contra el mismo día, corra cuando corra el benchmark.
+    """
+    creates = []
+    kpi = None
+    for statement in sql_statements(QUERIES_FILE):
+        if today:
+            statement = statement.replace('CURDATE()', f"DATE('{today:%Y-%m-%d}')")
+        if statement.upper().startswith('CREATE'):
+            creates.append(statement)
+        elif statement.upper().startswith('SELECT'):
+            kpi = statement
+    
+    # Power BI importa cada vista completa
+    queries = {view: f"SELECT * FROM `{view}`" for view in views or BENCH_VIEWS}
+    if kpi:
+        queries['kpi_dashboard'] = kpi
+    if rollups:
+        queries.update(ROLLUP_QUERIES)
+    return creates, queries
+
+
+def is_mariadb(cursor):
+    cursor.execute("SELECT VERSION()")
+    return 'mariadb' in cursor.fetchone()[0].lower()
+
+
+def explain_analyze(cursor, query, mariadb=False):
+    """EXPLAIN ANALYZE (MySQL 8.0.18+) o ANALYZE FORMAT=JSON (MariaDB) de una query"""
+    try:
+        cursor.execute(f"ANALYZE FORMAT=JSON {query}" if mariadb else f"EXPLAIN ANALYZE {query}")
+        return '\n'.join(str(row[0]) for row in cursor.fetchall())
+    except Exception as e:
+        return f"(no disponible: {e})"
+
+
+def time_query(cursor, query, runs, warmup=1, params=None):
+    """Ejecuta la query `warmup` + `runs` veces. Retorna (latencias en ms, filas)"""
+    latencies = []
+    rows = 0
+    for i in range(warmup + runs):
+        started = time.perf_counter()
+        cursor.execute(query, params)
+        rows = len(cursor.fetchall())
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            latencies.append(elapsed)
+    return latencies, rows
+
+
+def latency_stats(latencies):
+    values = np.asarray(latencies)
+    stats = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    stats.update({
+        'min': round(float(values.min()), 3),
+        'max': round(float(values.max()), 3),
+        'mean': round(float(values.mean()), 3),
+    })
+    return stats
+
+
+def category_rollup_mismatches(cursor):
+    """Categorías en las que rollup_inventory_by_category no coincide con vw_inventory_by_category"""
+    totals = []
+    for table in ('vw_inventory_by_category', 'rollup_inventory_by_category'):
+        cursor.execute(f"SELECT {', '.join(f'`{c}`' for c in CATEGORY_COLUMNS)} FROM `{table}`")
+        # SUM/AVG sin filas de stock son NULL en la vista y 0/NULL en el rollup
+        totals.append({category: [round(float(value or 0), 2) for value in values]
+                       for category, *values in cursor.fetchall()})
+    view, rollup = totals
+    return sorted(category for category in view.keys() | rollup.keys() if view.get(category) != rollup.get(category))
+
+
+def table_sizes(cursor, database):
+    cursor.execute(
+        "SELECT table_name, table_rows, data_length, index_length FROM information_schema.tables "
+        f"WHERE table_schema = %s AND table_name IN ({', '.join(['%s'] * len(SIZE_TABLES))})",
+        (database, *SIZE_TABLES)
+    )
+    return {
+        name: {'rows': rows, 'data_mb': round(data / 1024 / 1024, 2), 'index_mb': round(index / 1024 / 1024, 2)}
+        for name, rows, data, index in cursor.fetchall()
+    }
+
+# =====================================================
+# BENCHMARK
+# =====================================================
+
+def seed_scale(args, stock_count, text_pool, schema_changes=()):
+    """Recrea schema y vistas y siembra una escala. Retorna las filas sembradas
+    
+    `schema_changes` se ejecutan sobre el schema recién creado, antes de sembrar
+    (variantes de índices, ver faker_variants.py).
+    """
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database, args.loader)
+    cursor = conn.cursor()
+    try:
+        apply_sql_file(cursor, SCHEMA_FILE)
+        if args.rollups:
+            apply_sql_file(cursor, ROLLUPS_FILE)
+        for statement in schema_changes:
+            cursor.execute(statement)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    
+    counts = {
+        'items': max(int(stock_count * ITEMS_PER_STOCK), 100),
+        'locations': args.locations,
+        'stock': stock_count,
+        'movements': int(stock_count * MOVEMENTS_PER_STOCK),
+    }
+    faker = VesselFaker(seed=args.seed, workers=args.workers, text_pool=text_pool, rollups=args.rollups,
+                        distributions=args.distributions)
+    insert_direct_to_db(
+        faker,
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        database=args.database,
+        items_count=counts['items'],
+        locations_count=counts['locations'],
+        stock_count=counts['stock'],
+        movements_count=counts['movements'],
+        # vessel_schema.sql ya inserta los vocabularios por defecto (mismos slugs que genera el faker)
+        clean_tables=True,
+        loader=args.loader,
+        connections=args.connections
+    )
+    return counts
+
+
+def bench_scale(args, creates, queries):
+    """Mide todas las queries sobre la escala ya sembrada"""
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database)
+    cursor = conn.cursor()
+    try:
+        # connect_db deja la sesión preparada para carga: restaurar para medir
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.execute("SET UNIQUE_CHECKS = 1")
+        cursor.execute("SET AUTOCOMMIT = 1")
+        for statement in creates:
+            cursor.execute(statement)
+        for table in SIZE_TABLES:
+            cursor.execute(f"ANALYZE TABLE `{table}`")
+            cursor.fetchall()
+        
+        mariadb = is_mariadb(cursor)
+        results = {}
+        for name, query in queries.items():
+            latencies, rows = time_query(cursor, query, args.runs, args.warmup)
+            results[name] = {
+                'rows': rows,
+                'latency_ms': latency_stats(latencies),
+                'explain': explain_analyze(cursor, query, mariadb) if args.explain else None,
+            }
+            stats = results[name]['latency_ms']
+            print(f"   {name:<26} p50 {stats['p50']:>9.2f} ms  p95 {stats['p95']:>9.2f} ms  "
+                  f"p99 {stats['p99']:>9.2f} ms  ({rows:,} filas)")
+        
+        # El rollup solo sirve de reemplazo si da los mismos totales que la vista
+        if 'rollup_inventory_by_category' in results:
+            mismatches = category_rollup_mismatches(cursor)
+            results['rollup_inventory_by_category']['view_mismatches'] = mismatches
+            if mismatches:
+                print(f"   ❌ rollup_inventory_by_category difiere de vw_inventory_by_category en {len(mismatches)} "
+                      f"categorías: {', '.join(mismatches[:5])}")
+            else:
+                print("   ✓ rollup_inventory_by_category coincide con vw_inventory_by_category")
+        return results, table_sizes(cursor, args.database)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def run_benchmark(args):
+    creates, queries = load_queries(args.views.split(',') if args.views else None, args.rollups, args.now)
+    text_pool = TextPool.load(args.seed)
+    report = {
+        'generated': datetime.now().isoformat(sep=' ', timespec='seconds'),
+        'seed': args.seed,
+        # 'Ahora' de los datos y CURDATE() de las vistas
+        'now': args.now.isoformat(sep=' '),
+        'distributions': args.distributions.profile,
+        'runs': args.runs,
+        'queries': queries,
+        'scales': [],
+    }
+    
+    for stock_count in args.scales:
+        print(f"\n📏 Escala: {stock_count:,} stock items")
+        started = time.perf_counter()
+        counts = seed_scale(args, stock_count, text_pool)
+        seed_seconds = time.perf_counter() - started
+        
+        print(f"\n⏱  Ejecutando {len(queries)} queries × {args.runs}...")
+        results, sizes = bench_scale(args, creates, queries)
+        report['scales'].append({
+            'stock': stock_count,
+            'counts': counts,
+            'seed_s': round(seed_seconds, 2),
+            'table_sizes': sizes,
+            'queries': results,
+        })
+    return report
+
+# =====================================================
+# REPORTE
+# =====================================================
+
+def compare_reports(report, baseline):
+    """Diferencia de p50 por query y escala contra el baseline (solo escalas presentes en ambos)"""
+    previous = {
+        (scale['stock'], name): result['latency_ms']['p50']
+        for scale in baseline['scales'] for name, result in scale['queries'].items()
+    }
+    comparison = []
+    for scale in report['scales']:
+        for name, result in scale['queries'].items():
+            before = previous.get((scale['stock'], name))
+            if not before:
+                continue
+            after = result['latency_ms']['p50']
+            change = (after - before) / before
+            comparison.append({
+                'stock': scale['stock'],
+                'query': name,
+                'baseline_p50': before,
+                'p50': after,
+                'change': round(change, 4),
+                'regression': change > REGRESSION_THRESHOLD,
+            })
+    return comparison
+
+
+def markdown_report(report):
+    scales = report['scales']
+    lines = [
+        "# Benchmark vistas Power BI",
+        "",
+        f"Generado: {report['generated']} · semilla {report['seed']} · ahora {report['now']} · "
+        f"{report['runs']} ejecuciones por query",
+        "",
+        "## Latencia p50 / p95 (ms)",
+        "",
+        "| Query | " + " | ".join(f"{s['stock']:,} stock" for s in scales) + " |",
+        "|---|" + "---|" * len(scales),
+    ]
+    for name in report['queries']:
+        cells = []
+        for scale in scales:
+            stats = scale['queries'][name]['latency_ms']
+            cells.append(f"{stats['p50']:.2f} / {stats['p95']:.2f}")
+        lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    
+    if len(scales) > 1:
+        lines += [
+            "",
+            "## Crecimiento de p50 entre escalas",
+            "",
+            "Cuánto crece la latencia respecto al crecimiento de los datos (1.0 = lineal).",
+            "",
+            "| Query | " + " | ".join(f"{a['stock']:,} → {b['stock']:,}" for a, b in zip(scales, scales[1:])) + " |",
+            "|---|" + "---|" * (len(scales) - 1),
+        ]
+        for name in report['queries']:
+            cells = []
+            for a, b in zip(scales, scales[1:]):
+                before, after = a['queries'][name]['latency_ms']['p50'], b['queries'][name]['latency_ms']['p50']
+                factor = (after / before) / (b['stock'] / a['stock']) if before else 0
+                cells.append(f"×{after / before:.1f} ({factor:.2f})" if before else "-")
+            lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    
+    lines += ["", "## Tamaño de tablas (datos + índices, MB)", "",
+              "| Tabla | " + " | ".join(f"{s['stock']:,} stock" for s in scales) + " |",
+              "|---|" + "---|" * len(scales)]
+    tables = sorted({table for scale in scales for table in scale['table_sizes']})
+    for table in tables:
+        cells = []
+        for scale in scales:
+            size = scale['table_sizes'].get(table)
+            cells.append(f"{size['data_mb']:.1f} + {size['index_mb']:.1f}" if size else "-")
+        lines.append(f"| {table} | " + " | ".join(cells) + " |")
+    
+    if report.get('comparison'):
+        lines += ["", "## Comparación con baseline (p50)", "",
+                  "| Escala | Query | Baseline | Actual | Cambio |", "|---|---|---|---|---|"]
+        for row in report['comparison']:
+            flag = " ⚠ regresión" if row['regression'] else ""
+            lines.append(f"| {row['stock']:,} | {row['query']} | {row['baseline_p50']:.2f} | {row['p50']:.2f} | "
+                         f"{row['change'] * 100:+.1f}%{flag} |")
+    
+    explains = [(scale['stock'], name, result['explain'])
+                for scale in scales for name, result in scale['queries'].items() if result['explain']]
+    if explains:
+        lines += ["", "## EXPLAIN ANALYZE", ""]
+        for stock, name, explain in explains:
+            lines += [f"### {name} ({stock:,} stock)", "", "```", explain, "```", ""]
+    
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(report, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, 'report.json')
+    md_path = os.path.join(output_dir, 'report.md')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_report(report))
+    print(f"\n✅ Reporte: {md_path} (datos en {json_path})")
+
+# =====================================================
+# MAIN
+# =====================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - Benchmark de vistas Power BI')
+    parser.add_argument('--scales', type=lambda v: [int(x) for x in v.split(',')], default=[10000, 100000, 1000000],
+                        help='Filas de stock_items por escala, separadas por coma')
+    parser.add_argument('--runs', type=int, default=10, help='Ejecuciones medidas por query')
+    parser.add_argument('--warmup', type=int, default=1, help='Ejecuciones previas no medidas')
+    parser.add_argument('--views', type=str, default=None,
+                        help=f"Vistas a medir separadas por coma (default: {','.join(BENCH_VIEWS)})")
+    parser.add_argument('--rollups', action='store_true',
+                        help='Sembrar también stock_current/rollup_* y medir las queries sobre rollups junto a las vistas')
+    parser.add_argument('--no-explain', dest='explain', action='store_false', help='No capturar EXPLAIN ANALYZE')
+    parser.add_argument('--distributions', type=str, default=None, metavar='FILE',
+                        help='Perfil de distribuciones de la siembra (ver faker_data.py --distributions)')
+    parser.add_argument('--locations', type=int, default=50, help='Ubicaciones por escala')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla de los datos (igual en todas las corridas)')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=datetime(2025, 1, 1),
+                        help="'Ahora' fijo de los datos generados; las vistas lo usan como CURDATE()")
+    parser.add_argument('--workers', type=int, default=1, help='Procesos de generación en paralelo')
+    parser.add_argument('--connections', type=int, default=1, help='Conexiones de carga en paralelo')
+    parser.add_argument('--loader', choices=['executemany', 'infile', 'infile-pipe'], default='executemany',
+                        help='Método de carga de la siembra')
+    parser.add_argument('--baseline', type=str, default=None, metavar='REPORT',
+                        help='report.json de una corrida anterior para comparar')
+    parser.add_argument('--output', type=str, default='bench_results', help='Directorio del reporte')
+    
+    # DB connection args
+    parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3307')), help='MySQL port')
+    parser.add_argument('--user', type=str, default=os.getenv('DB_USER', 'root'), help='MySQL user')
+    parser.add_argument('--password', type=str, default=os.getenv('DB_PASSWORD', ''), help='MySQL password')
+    parser.add_argument('--database', type=str, default=os.getenv('DB_BENCH_DATABASE', 'vessel_bench'),
+                        help='BD dedicada al benchmark (se recrean sus tablas)')
+    
+    args = parser.parse_args()
+    
+    if not HAS_MYSQL:
+        print("❌ Error: mysql-connector-python no está instalado")
+        print("   Ejecuta: pip install mysql-connector-python")
+        exit(1)
+    
+    try:
+        args.distributions = Distributions.load(args.distributions) if args.distributions else Distributions()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en el perfil de distribuciones: {e}")
+        exit(1)
+    
+    set_run_clock(args.now)
+    report = run_benchmark(args)
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['comparison'] = compare_reports(report, json.load(f))
+        regressions = [row for row in report['comparison'] if row['regression']]
+        if regressions:
+            print(f"\n⚠ {len(regressions)} queries más lentas que el baseline (>{REGRESSION_THRESHOLD:.0%} en p50)")
+    
+    write_report(report, args.output)
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - Simulador de contención de reservas
+Carga de reserva/liberación concurrente sobre stock_items ya sembrados, con
+SKUs calientes (Zipf), para medir cómo serializan los row locks de InnoDB y
+comparar estrategias:
+
+    for_update  SELECT ... FOR UPDATE + UPDATE (pesimista, lo que hace la app hoy)
+    optimistic  SELECT sin lock + UPDATE condicionado al reserved_quantity leído
+                (hace de versión); si otro lo cambió antes se reintenta
+    atomic      Un solo UPDATE con la condición de disponible en el WHERE
+    sharded     Contador repartido en N filas por stock item (tabla auxiliar
+                stock_reservation_shards), con FOR UPDATE SKIP LOCKED
+
+Cada orden reserva o libera de 1 a --lines stock items en una transacción; con
+--lock-order cart las filas se bloquean en el orden del carrito (hay deadlocks),
+con sorted por ID (sin ciclos).
+
+Mide throughput, latencia por orden, espera de lock (tiempo de la sentencia que
+bloquea), deadlocks, lock wait timeouts, conflictos optimistas y reintentos,
+más los contadores Innodb_row_lock_* del servidor. Al terminar cada estrategia
+verifica 0 <= reserved_quantity <= quantity y restaura los valores originales.
+
+Uso:
+    python faker_contention.py --workers 16 --duration 30
+    python faker_contention.py --strategies for_update,atomic,sharded --skew 1.2 --rows 200
+    python faker_contention.py --lines 3 --lock-order sorted  # Sin deadlocks por orden de locks
+    python faker_contention.py --skew 0 --output contention.json  # Uniforme (sin SKUs calientes)
+
+Requisitos:
+    pip install faker numpy mysql-connector-python
+    BD sembrada con faker_data.py
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from faker_bench import latency_stats
+from faker_data import HAS_MYSQL, WeightedSampler, connect_db, zipf_weights
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+STRATEGIES = ['for_update', 'optimistic', 'atomic', 'sharded']
+
+# Errores de MySQL que abortan la transacción y se reintentan
+LOCK_ERRORS = {1205: 'lock_wait_timeouts', 1213: 'deadlocks'}
+
+# Órdenes que sortea cada worker por tanda (pesos ya resueltos, sin Python por orden)
+ORDER_BATCH = 1000
+
+SHARDS_TABLE = 'stock_reservation_shards'
+SHARDS_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS `{SHARDS_TABLE}` (
+    `stock_item_id` CHAR(36) NOT NULL,
+    `shard` SMALLINT NOT NULL,
+    `capacity` DECIMAL(15,4) NOT NULL DEFAULT 0,
+    `reserved` DECIMAL(15,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (`stock_item_id`, `shard`)
+) ENGINE=InnoDB
+"""
+
+INNODB_COUNTERS = ['Innodb_row_lock_waits', 'Innodb_row_lock_time', 'Innodb_row_lock_current_waits', 'Innodb_deadlocks']
+
+
+class Conflict(Exception):
+    """Otra transacción cambió la fila entre la lectura y el UPDATE (estrategia optimistic)"""
+
+
+class LockTimer:
+    """Acumula el tiempo de las sentencias que pueden esperar un lock, también si terminan en error"""
+    
+    def __init__(self):
+        self.seconds = 0.0
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+    
+    def __exit__(self, *exc):
+        self.seconds += time.perf_counter() - self.started
+
+# =====================================================
+# ESTRATEGIAS
+# =====================================================
+# Cada una aplica las líneas de una orden dentro de la transacción abierta,
+# midiendo con `timer` las sentencias que bloquean. Retorna False si no hay
+# disponible (o reservado que liberar): la orden se rechaza con rollback.
+
+def reserve_for_update(cursor, lines, sign, timer):
+    for stock_id, quantity in lines:
+        with timer:
+            cursor.execute("SELECT quantity, reserved_quantity FROM stock_items WHERE id = %s FOR UPDATE", (stock_id,))
+            total, reserved = cursor.fetchone()
+        if (sign > 0 and total - reserved < quantity) or (sign < 0 and reserved < quantity):
+            return False
+        cursor.execute("UPDATE stock_items SET reserved_quantity = reserved_quantity + %s WHERE id = %s",
+                       (sign * quantity, stock_id))
+    return True
+
+
+def reserve_optimistic(cursor, lines, sign, timer):
+    for stock_id, quantity in lines:
+        cursor.execute("SELECT quantity, reserved_quantity FROM stock_items WHERE id = %s", (stock_id,))
+        total, reserved = cursor.fetchone()
+        if (sign > 0 and total - reserved < quantity) or (sign < 0 and reserved < quantity):
+            return False
+        with timer:
+            cursor.execute("UPDATE stock_items SET reserved_quantity = %s WHERE id = %s AND reserved_quantity = %s",
+                           (reserved + sign * quantity, stock_id, reserved))
+        if cursor.rowcount == 0:
+            raise Conflict(stock_id)
+    return True
+
+
+def reserve_atomic(cursor, lines, sign, timer):
+    for stock_id, quantity in lines:
+        with timer:
+            if sign > 0:
+                cursor.execute("UPDATE stock_items SET reserved_quantity = reserved_quantity + %s "
+                               "WHERE id = %s AND quantity - reserved_quantity >= %s", (quantity, stock_id, quantity))
+            else:
+                cursor.execute("UPDATE stock_items SET reserved_quantity = reserved_quantity - %s "
+                               "WHERE id = %s AND reserved_quantity >= %s", (quantity, stock_id, quantity))
+        if cursor.rowcount == 0:
+            return False
+    return True
+
+
+def reserve_sharded(cursor, lines, sign, timer, shards=1):
+    """Toma un shard libre que alcance (SKIP LOCKED); si todos están tomados, espera por uno.
+    
+    Los candidatos se leen sin lock y se bloquean de a uno por PK desde uno
+    al azar: una lectura con lock sobre todos (ORDER BY RAND()) los tomaría todos.
+    """
+    condition = "`capacity` - `reserved` >= %s" if sign > 0 else "`reserved` >= %s"
+    lock = f"SELECT `shard` FROM `{SHARDS_TABLE}` WHERE `stock_item_id` = %s AND `shard` = %s AND {condition} FOR UPDATE"
+    for stock_id, quantity in lines:
+        cursor.execute(f"SELECT `shard` FROM `{SHARDS_TABLE}` WHERE `stock_item_id` = %s AND {condition}",
+                       (stock_id, quantity))
+        candidates = sorted(row[0] for row in cursor.fetchall())
+        start = random.randrange(shards)
+        candidates = [shard for shard in candidates if shard >= start] + [shard for shard in candidates if shard < start]
+        shard = None
+        with timer:
+            for skip in (' SKIP LOCKED', ''):
+                for candidate in candidates:
+                    cursor.execute(f"{lock}{skip}", (stock_id, candidate, quantity))
+                    if cursor.fetchone():
+                        shard = candidate
+                        break
+                if shard is not None:
+                    break
+        if shard is None:
+            return False
+        cursor.execute(f"UPDATE `{SHARDS_TABLE}` SET `reserved` = `reserved` + %s "
+                       f"WHERE `stock_item_id` = %s AND `shard` = %s", (sign * quantity, stock_id, shard))
+    return True
+
+
+RESERVE = {
+    'for_update': reserve_for_update,
+    'optimistic': reserve_optimistic,
+    'atomic': reserve_atomic,
+    'sharded': reserve_sharded,
+}
+
+# =====================================================
+# WORKLOAD
+# =====================================================
+
+class StrategyStats:
+    """Contadores y latencias de una estrategia, compartidos por los workers"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency_ms, self.lock_wait_ms = [], []
+        self.counts = {'committed': 0, 'rejected': 0, 'failed': 0, 'retries': 0, 'conflicts': 0,
+                       'deadlocks': 0, 'lock_wait_timeouts': 0}
+        self.crashes = []
+        self.aborted = threading.Event()
+    
+    def add(self, outcome, latency_ms, lock_wait_ms, errors):
+        with self.lock:
+            self.counts[outcome] += 1
+            self.latency_ms.append(latency_ms)
+            self.lock_wait_ms.append(lock_wait_ms)
+            for kind, count in errors.items():
+                self.counts[kind] += count
+                self.counts['retries'] += count
+    
+    def crash(self, error):
+        """Un worker murió con un error que no es de locks: la corrida de la estrategia no vale"""
+        with self.lock:
+            self.crashes.append(f"{type(error).__name__}: {error}")
+        self.aborted.set()
+
+
+def order_batches(rng, sampler, ids, args):
+    """Órdenes (signo, [(id, cantidad), ...]) en tandas de ORDER_BATCH"""
+    while True:
+        picks = sampler.sample(rng, ORDER_BATCH * args.lines).tolist()
+        quantities = rng.integers(1, args.max_quantity + 1, ORDER_BATCH * args.lines).tolist()
+        sizes = rng.integers(1, args.lines + 1, ORDER_BATCH).tolist()
+        signs = np.where(rng.random(ORDER_BATCH) < args.reserve_ratio, 1, -1).tolist()
+        for i in range(ORDER_BATCH):
+            lines = {}
+            for j in range(i * args.lines, i * args.lines + sizes[i]):
+                lines.setdefault(ids[picks[j]], quantities[j])
+            lines = list(lines.items())
+            if args.lock_order == 'sorted':
+                lines.sort()
+            yield signs[i], lines
+
+
+def worker(conn, strategy, stats, orders, deadline, args):
+    reserve = RESERVE[strategy]
+    if strategy == 'sharded':
+        reserve = functools.partial(reserve, shards=args.shards)
+    cursor = conn.cursor()
+    try:
+        while time.perf_counter() < deadline and not stats.aborted.is_set():
+            sign, lines = next(orders)
+            started = time.perf_counter()
+            timer = LockTimer()
+            errors = {}
+            outcome = 'failed'
+            for attempt in range(args.max_retries + 1):
+                try:
+                    if reserve(cursor, lines, sign, timer):
+                        conn.commit()
+                        outcome = 'committed'
+                    else:
+                        conn.rollback()
+                        outcome = 'rejected'
+                    break
+                except Conflict:
+                    conn.rollback()
+                    errors['conflicts'] = errors.get('conflicts', 0) + 1
+                except Exception as e:
+                    kind = LOCK_ERRORS.get(getattr(e, 'errno', None))
+                    if not kind:
+                        raise
+                    conn.rollback()
+                    errors[kind] = errors.get(kind, 0) + 1
+            stats.add(outcome, (time.perf_counter() - started) * 1000, timer.seconds * 1000, errors)
+    except Exception as e:
+        conn.rollback()
+        stats.crash(e)
+    finally:
+        cursor.close()
+
+# =====================================================
+# BD
+# =====================================================
+
+def contention_connection(args):
+    """Sesión de aplicación: connect_db la deja preparada para carga masiva"""
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database)
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.execute("SET UNIQUE_CHECKS = 1")
+    cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (args.lock_wait_timeout,))
+    cursor.close()
+    return conn
+
+
+def load_rows(cursor, count):
+    """Los `count` stock items con existencia (id, quantity, reserved_quantity), en orden de PK"""
+    cursor.execute("SELECT id, quantity, reserved_quantity FROM stock_items "
+                   "WHERE quantity > 0 AND deleted_at IS NULL ORDER BY id LIMIT %s", (count,))
+    return cursor.fetchall()
+
+
+def innodb_counters(cursor):
+    values = {}
+    for name in INNODB_COUNTERS:
+        cursor.execute("SHOW GLOBAL STATUS LIKE %s", (name,))
+        row = cursor.fetchone()
+        if row:
+            values[name] = int(row[1])
+    return values
+
+
+def prepare_shards(conn, rows, shards):
+    """Reparte quantity y reserved_quantity de cada stock item en `shards` filas"""
+    cursor = conn.cursor()
+    cursor.execute(SHARDS_SCHEMA)
+    cursor.execute(f"TRUNCATE TABLE `{SHARDS_TABLE}`")
+    values = []
+    for stock_id, quantity, reserved in rows:
+        # Decimal: la parte entera se reparte de a 1 y la fracción queda en el último shard que recibe resto
+        base = quantity // shards
+        extra = quantity - base * shards
+        remaining = reserved
+        for shard in range(shards):
+            bump = min(extra, 1)
+            extra -= bump
+            capacity = base + bump
+            taken = min(capacity, remaining)
+            remaining -= taken
+            values.append((stock_id, shard, capacity, taken))
+    cursor.executemany(f"INSERT INTO `{SHARDS_TABLE}` (`stock_item_id`, `shard`, `capacity`, `reserved`) "
+                       f"VALUES (%s, %s, %s, %s)", values)
+    conn.commit()
+    cursor.close()
+
+
+def check_invariants(cursor, strategy, ids):
+    """Filas que quedaron fuera de 0 <= reservado <= existencia"""
+    if strategy == 'sharded':
+        cursor.execute(f"SELECT COUNT(*) FROM `{SHARDS_TABLE}` WHERE `reserved` < 0 OR `reserved` > `capacity`")
+        return cursor.fetchone()[0]
+    broken = 0
+    for start in range(0, len(ids), 1000):
+        batch = ids[start:start + 1000]
+        cursor.execute(f"SELECT COUNT(*) FROM stock_items WHERE id IN ({', '.join(['%s'] * len(batch))}) "
+                       f"AND (reserved_quantity < 0 OR reserved_quantity > quantity)", batch)
+        broken += cursor.fetchone()[0]
+    return broken
+
+
+def restore(conn, rows):
+    cursor = conn.cursor()
+    cursor.executemany("UPDATE stock_items SET reserved_quantity = %s WHERE id = %s",
+                       [(reserved, stock_id) for stock_id, _, reserved in rows])
+    conn.commit()
+    cursor.close()
+
+# =====================================================
+# CORRIDA
+# =====================================================
+
+def run_strategy(strategy, rows, sampler, args):
+    ids = [row[0] for row in rows]
+    control = contention_connection(args)
+    connections = [contention_connection(args) for _ in range(args.workers)]
+    try:
+        if strategy == 'sharded':
+            prepare_shards(control, rows, args.shards)
+        cursor = control.cursor()
+        before = innodb_counters(cursor)
+        control.commit()
+        
+        stats = StrategyStats()
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=worker, args=(
+                conn, strategy, stats, order_batches(np.random.default_rng([args.seed, index]), sampler, ids, args),
+                deadline, args))
+            for index, conn in enumerate(connections)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        
+        after = innodb_counters(cursor)
+        broken = check_invariants(cursor, strategy, ids)
+        control.commit()
+        cursor.close()
+    finally:
+        for conn in connections:
+            conn.close()
+        try:
+            restore(control, rows)
+            if strategy == 'sharded' and not args.keep_shards:
+                cursor = control.cursor()
+                cursor.execute(f"DROP TABLE IF EXISTS `{SHARDS_TABLE}`")
+                cursor.close()
+        finally:
+            control.close()
+    
+    orders = sum(stats.counts[kind] for kind in ('committed', 'rejected', 'failed'))
+    return {
+        'strategy': strategy,
+        'elapsed_s': round(elapsed, 2),
+        'orders': orders,
+        'throughput': round(stats.counts['committed'] / elapsed, 1),
+        **stats.counts,
+        'latency_ms': latency_stats(stats.latency_ms) if stats.latency_ms else None,
+        'lock_wait_ms': latency_stats(stats.lock_wait_ms) if stats.lock_wait_ms else None,
+        'server': {name: after[name] - before[name] for name in after if name in before and name != 'Innodb_row_lock_current_waits'},
+        'invariant_violations': broken,
+        'worker_errors': stats.crashes,
+    }
+
+
+def print_results(results):
+    print(f"\n{'estrategia':<12} {'commits/s':>10} {'commits':>9} {'rechaz.':>8} {'fallidas':>8} {'reintentos':>10} "
+          f"{'deadlocks':>9} {'timeouts':>8} {'conflictos':>10} {'p50 ms':>8} {'p99 ms':>8} {'lock p99':>9}")
+    for result in results:
+        latency = result['latency_ms'] or {'p50': 0, 'p99': 0}
+        wait = result['lock_wait_ms'] or {'p99': 0}
+        print(f"{result['strategy']:<12} {result['throughput']:>10,.1f} {result['committed']:>9,} {result['rejected']:>8,} "
+              f"{result['failed']:>8,} {result['retries']:>10,} {result['deadlocks']:>9,} "
+              f"{result['lock_wait_timeouts']:>8,} {result['conflicts']:>10,} {latency['p50']:>8.1f} "
+              f"{latency['p99']:>8.1f} {wait['p99']:>9.1f}")
+    for result in results:
+        server = ', '.join(f"{name.replace('Innodb_', '')} {value:,}" for name, value in result['server'].items())
+        print(f"   {result['strategy']:<10} servidor: {server or 'sin contadores'}")
+        if result['worker_errors']:
+            print(f"   ❌ {result['strategy']}: {len(result['worker_errors'])} workers abortaron, resultados inválidos "
+                  f"({result['worker_errors'][0]})")
+        if result['invariant_violations']:
+            print(f"   ⚠ {result['strategy']}: {result['invariant_violations']} filas con reservado fuera de rango")
+
+# =====================================================
+# MAIN
+# =====================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - Simulador de contención de reservas')
+    parser.add_argument('--strategies', type=str, default=','.join(STRATEGIES),
+                        help=f"Estrategias a comparar separadas por coma ({', '.join(STRATEGIES)})")
+    parser.add_argument('--workers', type=int, default=8, help='Workers concurrentes (una conexión cada uno)')
+    parser.add_argument('--duration', type=float, default=20, help='Segundos por estrategia')
+    parser.add_argument('--rows', type=int, default=1000, help='Stock items sobre los que se reserva')
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help='Exponente Zipf de la popularidad de los stock items (0 = uniforme)')
+    parser.add_argument('--lines', type=int, default=1, help='Máximo de stock items por orden (transacción)')
+    parser.add_argument('--lock-order', choices=['cart', 'sorted'], default='cart',
+                        help='Orden de bloqueo de las líneas: el del carrito o por ID')
+    parser.add_argument('--max-quantity', type=int, default=5, help='Cantidad máxima por línea')
+    parser.add_argument('--reserve-ratio', type=float, default=0.5, help='Fracción de órdenes que reservan (el resto libera)')
+    parser.add_argument('--shards', type=int, default=8, help='Filas por stock item con la estrategia sharded')
+    parser.add_argument('--keep-shards', action='store_true', help=f'No borrar {SHARDS_TABLE} al terminar')
+    parser.add_argument('--max-retries', type=int, default=5, help='Reintentos por deadlock, timeout o conflicto')
+    parser.add_argument('--lock-wait-timeout', type=int, default=5, help='innodb_lock_wait_timeout de la sesión (s)')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de las órdenes')
+    parser.add_argument('--output', type=str, default=None, metavar='FILE', help='Guardar el reporte en JSON')
+    
+    # DB connection args
+    parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3307')), help='MySQL port')
+    parser.add_argument('--user', type=str, default=os.getenv('DB_USER', 'root'), help='MySQL user')
+    parser.add_argument('--password', type=str, default=os.getenv('DB_PASSWORD', ''), help='MySQL password')
+    parser.add_argument('--database', type=str, default=os.getenv('DB_DATABASE', 'vessel_test'), help='MySQL database')
+    
+    args = parser.parse_args()
+    
+    if not HAS_MYSQL:
+        print("❌ Error: mysql-connector-python no está instalado")
+        print("   Ejecuta: pip install mysql-connector-python")
+        exit(1)
+    
+    strategies = [name.strip() for name in args.strategies.split(',')]
+    unknown = [name for name in strategies if name not in RESERVE]
+    if unknown:
+        parser.error(f"Estrategias desconocidas: {', '.join(unknown)} (opciones: {', '.join(STRATEGIES)})")
+    if args.lines < 1 or args.max_quantity < 1 or args.shards < 1:
+        parser.error("--lines, --max-quantity y --shards deben ser >= 1")
+    
+    conn = contention_connection(args)
+    try:
+        cursor = conn.cursor()
+        rows = load_rows(cursor, args.rows)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    if not rows:
+        print("❌ Error: no hay stock_items con existencia. Sembrar primero con faker_data.py")
+        exit(1)
+    
+    rng = np.random.default_rng(args.seed)
+    weights = zipf_weights(rng, len(rows), args.skew) if args.skew else np.ones(len(rows))
+    sampler = WeightedSampler(weights)
+    hottest = np.sort(weights)[::-1]
+    top = max(1, len(rows) // 100)
+    print(f"🔥 {len(rows):,} stock items, skew {args.skew}: el 1% más caliente recibe "
+          f"{hottest[:top].sum() / hottest.sum():.0%} de las líneas")
+    print(f"   {args.workers} workers × {args.duration:.0f}s por estrategia, hasta {args.lines} líneas por orden "
+          f"(locks en orden {'de ID' if args.lock_order == 'sorted' else 'del carrito'})")
+    
+    results = []
+    for strategy in strategies:
+        print(f"\n⏱ {strategy}...")
+        results.append(run_strategy(strategy, rows, sampler, args))
+    print_results(results)
+    
+    if args.output:
+        report = {
+            'generated': datetime.now().isoformat(sep=' ', timespec='seconds'),
+            'database': args.database,
+            'config': {key: getattr(args, key) for key in ('workers', 'duration', 'rows', 'skew', 'lines', 'lock_order',
+                                                           'max_quantity', 'reserve_ratio', 'shards', 'max_retries',
+                                                           'lock_wait_timeout', 'seed')},
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Reporte guardado en {args.output}")
+    
+    if any(result['worker_errors'] for result in results):
+        exit(1)
@@ -5,21 +5,64 @@ Genera datos de prueba y los inserta directamente en la base de datos
 
 Uso:
     python faker_data.py --items 1000 --locations 50 --stock 5000
-    python faker_data.py --items 100000 --direct  # Inserta directo en BD
+    python faker_data.py --items 100000  # Inserta directo en BD (--output direct, por defecto)
     python faker_data.py --output sql  # Solo genera archivo SQL
+    python faker_data.py --output sql --max-allowed-packet 16M --transaction-size 50  # Dump rápido de reproducir con mysql
+    python faker_data.py --output sql --compress zstd --split-size 64M --file dump/  # Partes comprimidas + manifest.json
+    python faker_data.py --verify-manifest dump/  # Verifica el sha256 de cada parte
+    python faker_data.py --output ndjson --compress gzip --file export/  # Un NDJSON por tabla, en streaming
+    python faker_data.py --output parquet --compress zstd --items 20000 --stock 150000  # Parquet para Power BI / pandas
+    python faker_data.py --items 100000 --workers 8 --seed 42  # Generación paralela reproducible
+    python faker_data.py --seed 42 --now '2025-01-01 00:00:00'  # Salida idéntica entre corridas
+    python faker_data.py --items 20000 --stock 150000 --loader infile  # Carga con LOAD DATA LOCAL INFILE
+    python faker_data.py --items 20000 --stock 150000 --connections 4  # Tablas independientes en paralelo
+    python faker_data.py --items 100000 --text-pool-size 5000 --text-combine  # Corpus de textos mayor
+    python faker_data.py --id-strategy uuid7  # PKs ordenadas en el tiempo (menos page splits en InnoDB)
+    python faker_data.py --movements 500000 --distributions retail  # SKUs calientes, horas pico, Black Friday
+    python faker_data.py --scenario minimarket  # Preset de scenarios/ (minimarket, large-distributor, 10x-stress)
+    python faker_data.py --scenario large-distributor --items 20000  # Los conteos de la CLI pisan al escenario
+    python faker_data.py --workspaces 2000 --items 200000 --stock 600000 --workspace-layout interleaved  # Multi-tenant
+    python faker_data.py --items 20000 --stock 150000 --rollups  # + stock_current y rollup_* (aplicar antes rollups_schema.sql)
+    python faker_data.py --items 5000000 --checkpoint carga.json  # Commit por chunk, reanudable
+    python faker_data.py --resume --checkpoint carga.json  # Continúa desde el último chunk commiteado
+    python faker_data.py --movements 2000000 --partition-movements --clean  # stock_movements con RANGE por mes
+    python faker_data.py --output sql --metrics --metrics-json metrics.json  # Tiempos por fase, filas/s, pico RSS
+    python faker_data.py --output sql --profile perfil.folded --profile-format collapsed  # Flamegraph
+    python faker_data.py --compare-id-strategies --items 20000 --stock 150000 --movements 200000  # Compara filas/s por estrategia
 
 Requisitos:
-    pip install faker mysql-connector-python
+    pip install faker numpy mysql-connector-python
+    pip install zstandard  # Opcional: --compress zstd
+    pip install pyarrow  # Opcional: --output parquet/arrow
+    pip install pyyaml  # Opcional: escenarios/perfiles en YAML
 
 Configuración BD (variables de entorno o argumentos):
     --host localhost --port 3306 --user root --password secret --database vessel_test
 """
 
 import argparse
+import bisect
+import contextlib
+import cProfile
+import functools
+import gzip
+import hashlib
+import itertools
 import json
+import math
+import multiprocessing
+import queue
 import random
+import string
+import sys
+import tempfile
+import threading
+import time
 import uuid
 import os
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 
 try:
@@ -28,6 +71,35 @@ try:
 except ImportError:
     HAS_MYSQL = False
 
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    # Windows: sin getrusage no se informa el pico de RSS
+    HAS_RESOURCE = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    # Sin PyYAML los escenarios y perfiles se escriben en JSON
+    HAS_YAML = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+import numpy as np
 from faker import Faker
 
 fake = Faker(['es_ES', 'en_US'])
@@ -38,9 +110,11 @@ fake = Faker(['es_ES', 'en_US'])
 
 LOCATION_TYPES = ['warehouse', 'store', 'distribution_center', 'office']
 STORAGE_UNIT_TYPES = ['storage_unit']
-ITEM_STATUS = ['active', 'active', 'active', 'draft', 'archived']  # Weighted
+ITEM_STATUS = ['active', 'draft', 'archived']
+ITEM_STATUS_WEIGHTS = [3, 1, 1]
 IDENTIFIER_TYPES = ['sku', 'ean', 'upc', 'gtin', 'mpn', 'supplier_code']
 MOVEMENT_TYPES = ['in', 'out', 'transfer', 'adjustment']
+MOVEMENT_TYPE_WEIGHTS = [35, 40, 15, 10]
 UOM_CODES = ['UN', 'KG', 'GR', 'LT', 'ML', 'MT', 'CM', 'CJ', 'PQ', 'BL', 'BT', 'RL', 'PZ', 'PR', 'JG']
 
 # Categorías de productos realistas
@@ -62,18 +136,75 @@ BRANDS = [
 COLORS = ['Rojo', 'Azul', 'Verde', 'Negro', 'Blanco', 'Gris', 'Amarillo', 'Naranja', 'Rosa', 'Morado']
 SIZES = ['XS', 'S', 'M', 'L', 'XL', 'XXL', 'Único', '32', '34', '36', '38', '40', '42']
 
+# Filas por chunk en los generadores streaming (iter_*)
+CHUNK_SIZE = 1000
+
+# Estrategias de PK para las tablas grandes (ver VesselFaker._ids)
+ID_STRATEGIES = ['uuid4', 'uuid7', 'sequential']
+
+# Corpus de textos pregenerado con Faker (ver TextPool)
+TEXT_POOL_LOCALES = ['es_ES', 'en_US']
+TEXT_POOL_SIZE = 2000  # frases por locale; palabras x2, párrafos /2
+TEXT_CACHE_DIR = os.getenv('VESSEL_FAKER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'vessel_faker'))
+
+# Padres de cada tabla (FK o pool de IDs necesario para generarla); el
+# scheduler de carga solo arranca una tabla cuando sus padres están cargados.
+# stock_items y stock_movements no tienen FKs: sus SKUs y saldos se resuelven
+# en memoria (VesselFaker.plan_stock) a partir de los items y las ubicaciones
+TABLE_DEPENDENCIES = {
+    'taxonomy_vocabularies': [],
+    'catalog_terms': ['taxonomy_vocabularies'],
+    'locations_locations': [],
+    'catalog_items': [],
+    'catalog_item_identifiers': ['catalog_items'],
+    'catalog_item_terms': ['catalog_items', 'catalog_terms'],
+    'stock_items': ['catalog_items', 'locations_locations'],
+    'stock_movements': ['catalog_items', 'locations_locations'],
+    # Agregados de --rollups (ver StockRollups)
+    'stock_current': ['stock_items'],
+    'rollup_stock_by_location': ['stock_items'],
+    'rollup_inventory_by_category': ['catalog_item_terms', 'stock_items'],
+    'rollup_movements_daily': ['stock_movements'],
+    'rollup_kpi_snapshot': ['catalog_items', 'stock_items', 'stock_movements'],
+}
+
+# Tablas de rollups_schema.sql que llena --rollups
+ROLLUP_TABLES = ['rollup_stock_by_location', 'rollup_inventory_by_category', 'rollup_movements_daily', 'rollup_kpi_snapshot']
+# Categoría de vw_inventory_by_category para los items sin términos
+UNCATEGORIZED = 'Sin categoría'
+
+# max_allowed_packet por defecto del dump SQL y buffer de escritura del archivo
+DEFAULT_MAX_PACKET = 4 * 1024 * 1024
+SQL_WRITE_BUFFER = 1024 * 1024
+
+# Compresión de los dumps (ver OutputFile) y extensión de cada formato
+COMPRESSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Filas por row group / record batch en los exports columnares (Parquet, Arrow IPC)
+ARROW_BATCH_ROWS = 64 * 1024
+
+# Filas esperadas a partir de las cuales una tabla se reparte entre varias conexiones
+SPLIT_THRESHOLD = 50000
+
+# Presets de --scenario y --distributions (junto a este script)
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios')
+DISTRIBUTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distributions')
+
 # =====================================================
 # GENERADORES
 # =====================================================
 
 def generate_uuid():
-    return str(uuid.uuid4())
+    # UUID v4 desde `random` (no os.urandom) para que una semilla reproduzca los IDs
+    return str(uuid.UUID(int=random.getrandbits(128), version=4))
 
 def generate_slug(name):
     return name.lower().replace(' ', '-').replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u').replace('ñ', 'n')
 
+SKU_PREFIXES = ['SKU', 'PRD', 'ART', 'ITM', '']
+
 def generate_sku():
-    prefix = random.choice(['SKU', 'PRD', 'ART', 'ITM', ''])
+    prefix = random.choice(SKU_PREFIXES)
     number = fake.random_number(digits=random.randint(4, 8), fix_len=True)
     return f"{prefix}{number}"
 
@@ -83,28 +214,1206 @@ def generate_ean():
 def generate_upc():
     return fake.ean(length=12)
 
+# Reloj congelado de la corrida: todas las filas comparten el mismo "ahora"
+_run_now = datetime.now().replace(microsecond=0)
+_run_now_str = _run_now.strftime('%Y-%m-%d %H:%M:%S')
+
+def set_run_clock(moment):
+    """Fija el "ahora" de la corrida (se propaga a los workers del pool)"""
+    global _run_now, _run_now_str
+    _run_now = moment.replace(microsecond=0)
+    _run_now_str = _run_now.strftime('%Y-%m-%d %H:%M:%S')
+
+def run_clock():
+    return _run_now
+
 def now():
-    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return _run_now_str
 
 def random_date(start_days=-365, end_days=365):
     delta = timedelta(days=random.randint(start_days, end_days))
-    return (datetime.now() + delta).strftime('%Y-%m-%d')
+    return (_run_now + delta).strftime('%Y-%m-%d')
+
+def parse_size(value):
+    """Convierte '512K', '16M' o '1G' (o bytes) a bytes"""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    value = str(value).strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+def chunk_seed(seed, table, index):
+    """Semilla derivada y estable entre procesos para el chunk `index` de `table`"""
+    digest = hashlib.blake2b(f"{seed}:{table}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+def iter_batches(data, batch_size=1000):
+    """Normaliza `data` a lotes de filas: acepta una lista de filas o un iterable de chunks"""
+    if isinstance(data, list):
+        for i in range(0, len(data), batch_size):
+            yield data[i:i + batch_size]
+        return
+    
+    for chunk in data:
+        for i in range(0, len(chunk), batch_size):
+            yield chunk[i:i + batch_size]
+
+# =====================================================
+# COLUMN GENERATORS (NumPy, un chunk completo por llamada)
+# =====================================================
+
+def choice_column(rng, values, size, weights=None):
+    """Columna categórica de `size` valores tomados de `values`, opcionalmente ponderados"""
+    p = None
+    if weights is not None:
+        p = np.asarray(weights, dtype=float)
+        p = p / p.sum()
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p)]
+
+def fk_column(rng, pool, size):
+    """Columna de FKs uniformes sobre un pool de IDs (lista)"""
+    return [pool[i] for i in rng.integers(0, len(pool), size).tolist()]
+
+def mask_column(rng, size, p):
+    """Máscara booleana con probabilidad `p` de True por fila"""
+    return rng.random(size) < p
+
+def number_column(rng, size, digits):
+    """Enteros de exactamente `digits` dígitos (digits puede ser un array)"""
+    digits = np.asarray(digits)
+    return rng.integers(10 ** (digits - 1), 10 ** digits, size)
+
+def nullable(mask, values):
+    """Lista con `values` donde `mask` es True y None en el resto"""
+    return [v if m else None for v, m in zip(values, mask.tolist())]
+
+def sku_column(rng, size):
+    """Versión vectorizada de generate_sku()"""
+    prefixes = choice_column(rng, SKU_PREFIXES, size)
+    numbers = number_column(rng, size, rng.integers(4, 9, size))
+    return [f"{prefix}{number}" for prefix, number in zip(prefixes, numbers.tolist())]
+
+def unique_sku(sku, seen):
+    """`sku`, o `sku-1`, `sku-2`... si ya salió antes; lo registra en `seen`"""
+    unique = sku
+    suffix = 1
+    while unique in seen:
+        unique = f"{sku}-{suffix}"
+        suffix += 1
+    seen.add(unique)
+    return unique
+
+def ean13_column(rng, size):
+    """EAN-13 válidos (12 dígitos aleatorios + dígito verificador)"""
+    digits = rng.integers(0, 10, (size, 12))
+    weighted = digits[:, 0::2].sum(axis=1) + 3 * digits[:, 1::2].sum(axis=1)
+    check = (10 - weighted % 10) % 10
+    codes = np.concatenate([digits, check[:, None]], axis=1) + ord('0')
+    return [code.decode() for code in codes.astype(np.uint8).view('S13').ravel()]
+
+def date_column(rng, size, start_days=-365, end_days=365):
+    """Versión vectorizada de random_date()"""
+    days = rng.integers(start_days, end_days + 1, size)
+    dates = np.datetime64(_run_now.date(), 'D') + days
+    return np.datetime_as_string(dates, unit='D').tolist()
+
+def datetime_column(rng, size, start_days=-365, end_days=0):
+    """Fecha de random_date() + hora aleatoria, como 'YYYY-MM-DD HH:MM:SS'"""
+    days = rng.integers(start_days, end_days + 1, size)
+    seconds = rng.integers(0, 86400, size)
+    return datetime_strings(np.datetime64(_run_now.date(), 's') + days * 86400 + seconds)
+
+def pair_permutation(rng, space):
+    """Sortea (a, b) para la permutación afín k -> (a·k + b) mod space"""
+    while True:
+        multiplier = int(rng.integers(1, max(space, 2)))
+        if math.gcd(multiplier, space) == 1:
+            return multiplier, int(rng.integers(0, space))
+
+def permuted_range(start, size, multiplier, offset, space):
+    """Imagen de [start, start + size) por la permutación afín, como array int64"""
+    if space < 3 * 10 ** 9:
+        # a·k < space² cabe en int64
+        return (np.arange(start, start + size, dtype=np.int64) * multiplier + offset) % space
+    return np.array([(multiplier * k + offset) % space for k in range(start, start + size)], dtype=np.int64)
+
+def datetime_strings(stamps):
+    """Formatea un array datetime64 como 'YYYY-MM-DD HH:MM:SS'"""
+    return [stamp.replace('T', ' ') for stamp in np.datetime_as_string(stamps, unit='s').tolist()]
+
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+# Posiciones de los 32 dígitos hex dentro de 'xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx'
+_UUID_HEX_POSITIONS = [i for i in range(36) if i not in (8, 13, 18, 23)]
+
+def uuid_column(rng, size, version=4, sequence=0):
+    """UUIDs v4 o v7 en bloque a partir de un único buffer del rng, como CHAR(36).
+    
+    v7: timestamp en ms del reloj de la corrida y un contador de 42 bits
+    (rand_a + inicio de rand_b) que arranca en `sequence`, así los IDs salen
+    ordenados entre sí y entre chunks si cada chunk usa un `sequence` mayor.
+    """
+    raw = np.frombuffer(rng.bytes(16 * size), dtype=np.uint8).reshape(size, 16).copy()
+    
+    if version == 7:
+        ms = int(_run_now.timestamp() * 1000)
+        raw[:, 0:6] = np.frombuffer(ms.to_bytes(6, 'big'), dtype=np.uint8)
+        counter = sequence + np.arange(size, dtype=np.uint64)
+        rand_a = counter >> np.uint64(30)
+        rand_b = counter & np.uint64(0x3FFFFFFF)
+        raw[:, 6] = (rand_a >> np.uint64(8)).astype(np.uint8)
+        raw[:, 7] = (rand_a & np.uint64(0xFF)).astype(np.uint8)
+        raw[:, 8] = (rand_b >> np.uint64(24)).astype(np.uint8)
+        raw[:, 9] = ((rand_b >> np.uint64(16)) & np.uint64(0xFF)).astype(np.uint8)
+        raw[:, 10] = ((rand_b >> np.uint64(8)) & np.uint64(0xFF)).astype(np.uint8)
+        raw[:, 11] = (rand_b & np.uint64(0xFF)).astype(np.uint8)
+    
+    raw[:, 6] = (raw[:, 6] & 0x0F) | (version << 4)
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    
+    nibbles = np.empty((size, 32), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    chars = np.full((size, 36), ord('-'), dtype=np.uint8)
+    chars[:, _UUID_HEX_POSITIONS] = _HEX_DIGITS[nibbles]
+    return chars.view('S36').ravel().astype('U36').tolist()
+
+def sequential_id_column(table, size, sequence=0):
+    """IDs secuenciales con forma de UUID v8 (CHAR(36)): prefijo por tabla + contador"""
+    tag = chunk_seed(0, table, 0) >> 32
+    return [f"{tag:08x}-0000-8000-8000-{n:012x}" for n in range(sequence, sequence + size)]
+
+def rows_from_columns(columns):
+    """Construye las filas (dicts) de un chunk a partir de sus columnas"""
+    names = list(columns)
+    values = [col.tolist() if isinstance(col, np.ndarray) else col for col in columns.values()]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+# =====================================================
+# DISTRIBUCIONES (perfiles de carga con --distributions)
+# =====================================================
+
+def zipf_weights(rng, size, exponent):
+    """Pesos Zipf 1/rank^s para `size` elementos; el ranking se baraja con `rng`"""
+    ranks = rng.permutation(size).astype(float) + 1
+    return ranks ** -float(exponent)
+
+def pareto_column(rng, size, low, high, shape, scale):
+    """Enteros con cola pesada (Pareto II): muchos valores chicos y pocos grandes, recortados a [low, high]"""
+    values = low + np.floor(scale * rng.pareto(shape, size))
+    return np.minimum(values, high).astype(np.int64)
+
+class WeightedSampler:
+    """Índices con pesos arbitrarios: CDF acumulada + searchsorted, vectorizado y O(log n) por muestra"""
+    
+    def __init__(self, weights):
+        self.cdf = np.cumsum(np.asarray(weights, dtype=float))
+        if not len(self.cdf) or self.cdf[-1] <= 0:
+            raise ValueError("Los pesos deben sumar más que 0")
+    
+    def sample(self, rng, size):
+        picks = np.searchsorted(self.cdf, rng.random(size) * self.cdf[-1], side='right')
+        return np.minimum(picks, len(self.cdf) - 1)
+
+class TimeProfile:
+    """Intensidad por hora de una ventana de tiempo: diurna × semanal × estacional × ráfagas.
+    
+    Se muestrea por CDF inversa sobre la grilla de horas (uniforme dentro de cada
+    hora). Cada chunk pide un tramo [q0, q1) de cuantiles y recibe timestamps
+    ordenados, así chunks consecutivos siguen en orden temporal.
+    """
+    
+    def __init__(self, start, days, diurnal=None, weekly=None, seasonal=None, bursts=()):
+        self.start = np.datetime64(start, 's')
+        hours = days * 24
+        stamps = self.start + np.arange(hours) * 3600
+        by_hour = stamps.astype('datetime64[h]').astype(np.int64)
+        intensity = np.ones(hours)
+        if diurnal is not None:
+            intensity *= np.asarray(diurnal, dtype=float)[by_hour % 24]
+        if weekly is not None:
+            # 1970-01-01 fue jueves: +3 deja lunes = 0
+            intensity *= np.asarray(weekly, dtype=float)[(by_hour // 24 + 3) % 7]
+        if seasonal is not None:
+            intensity *= np.asarray(seasonal, dtype=float)[stamps.astype('datetime64[M]').astype(np.int64) % 12]
+        for burst_start, burst_days, factor in bursts:
+            burst_start = np.datetime64(burst_start, 's')
+            intensity[(stamps >= burst_start) & (stamps < burst_start + int(burst_days * 86400))] *= factor
+        
+        cdf = np.concatenate([[0.0], np.cumsum(intensity)])
+        if cdf[-1] <= 0:
+            raise ValueError("La intensidad de created_at es 0 en toda la ventana")
+        self.cdf = cdf / cdf[-1]
+        self.edges = np.arange(hours + 1, dtype=float) * 3600
+    
+    def sample(self, rng, q0, q1, size):
+        """`size` timestamps ordenados (datetime64[s]) del tramo de cuantiles [q0, q1)"""
+        quantiles = np.sort(rng.uniform(q0, q1, size))
+        offsets = np.interp(quantiles, self.cdf, self.edges).astype(np.int64)
+        return self.start + np.minimum(offsets, int(self.edges[-1]) - 1)
+
+class Distributions:
+    """Perfil de distribuciones por tabla y campo, leído de un JSON (--distributions).
+    
+    Ejemplo (ver distributions/retail.json; un escenario puede embeberlo):
+        {"stock_movements": {"items": {"zipf": 1.1}, "locations": {"zipf": 0.8},
+                             "quantity": {"pareto": 1.5, "scale": 15},
+                             "created_at": {"diurnal": [...24], "weekly": [...7], "seasonal": [...12],
+                                            "bursts": [{"date": "2025-11-28", "days": 3, "factor": 6}]}}}
+    
+    Los campos sin entrada quedan uniformes y consumen exactamente los mismos
+    números aleatorios que sin perfil: la salida solo cambia donde se pide.
+    """
+    
+    FIELDS = {
+        'stock_items': {'quantity': 'quantity'},
+        'stock_movements': {'items': 'popularity', 'locations': 'popularity',
+                            'quantity': 'quantity', 'created_at': 'timeline'},
+        'catalog_item_terms': {'categories': 'popularity', 'brands': 'popularity'},
+    }
+    
+    def __init__(self, profile=None):
+        self.profile = profile or {}
+        self._validate()
+    
+    @classmethod
+    def load(cls, name):
+        """Lee un perfil por ruta o por nombre de preset de distributions/ (JSON, o YAML con PyYAML)"""
+        path = find_spec(name, DISTRIBUTIONS_DIR)
+        if path is None:
+            raise ValueError(f"No existe el perfil de distribuciones {name}")
+        return cls(read_spec(path))
+    
+    def _validate(self):
+        for table, fields in self.profile.items():
+            if table == 'description':
+                continue
+            if table not in self.FIELDS:
+                raise ValueError(f"Tabla sin distribuciones configurables: {table} (opciones: {', '.join(self.FIELDS)})")
+            for field, spec in fields.items():
+                kind = self.FIELDS[table].get(field)
+                if kind is None:
+                    raise ValueError(f"Campo no configurable: {table}.{field} "
+                                     f"(opciones: {', '.join(self.FIELDS[table])})")
+                if not isinstance(spec, dict):
+                    raise ValueError(f"{table}.{field}: se esperaba un objeto, no {spec!r}")
+                if kind == 'popularity' and spec.get('zipf', 1) <= 0:
+                    raise ValueError(f"{table}.{field}: zipf debe ser > 0")
+                if kind == 'quantity' and spec.get('pareto', 1) <= 0:
+                    raise ValueError(f"{table}.{field}: pareto debe ser > 0")
+                if kind == 'timeline':
+                    for name, size in (('diurnal', 24), ('weekly', 7), ('seasonal', 12)):
+                        weights = spec.get(name)
+                        if weights is not None and (len(weights) != size or min(weights) < 0):
+                            raise ValueError(f"{table}.{field}.{name}: se esperan {size} pesos >= 0")
+                    for burst in spec.get('bursts', []):
+                        if ('date' in burst) == ('days_ago' in burst):
+                            raise ValueError(f"{table}.{field}.bursts: cada ráfaga necesita 'date' o 'days_ago'")
+    
+    def spec(self, table, field):
+        return self.profile.get(table, {}).get(field)
+    
+    def popularity(self, rng, table, field, size):
+        """Pesos Zipf para `size` elementos, o None si el campo es uniforme"""
+        spec = self.spec(table, field)
+        if spec is None or not size:
+            return None
+        return zipf_weights(rng, size, spec.get('zipf', 1.0))
+    
+    def integers(self, rng, table, field, low, high, size):
+        """Como rng.integers(low, high + 1, size), o con cola Pareto si el perfil lo pide"""
+        spec = self.spec(table, field)
+        if spec is None:
+            return rng.integers(low, high + 1, size)
+        return pareto_column(rng, size, low, spec.get('max', high), spec.get('pareto', 1.5), spec.get('scale', 1.0))
+    
+    def timeline(self, table, field, start, days):
+        """TimeProfile del campo sobre [start, start + days), o None si es uniforme"""
+        spec = self.spec(table, field)
+        if spec is None:
+            return None
+        end = start + timedelta(days=days)
+        bursts = [
+            (datetime.fromisoformat(burst['date']) if 'date' in burst else end - timedelta(days=burst['days_ago']),
+             burst.get('days', 1), burst.get('factor', 5))
+            for burst in spec.get('bursts', [])
+        ]
+        return TimeProfile(start, days, spec.get('diurnal'), spec.get('weekly'), spec.get('seasonal'), bursts)
+
+# =====================================================
+# ESCENARIOS (--scenario)
+# =====================================================
+
+# Forma del dataset sin escenario: las proporciones de siempre del script.
+# Un escenario solo declara lo que cambia respecto de esto.
+DEFAULT_SCENARIO = {
+    'catalog_terms': {'per_vocabulary': 25},
+    'locations_locations': {'rows': 50, 'types': {t: 1 for t in LOCATION_TYPES}, 'storage_units': [2, 5]},
+    'catalog_items': {'rows': 1000, 'status': dict(zip(ITEM_STATUS, ITEM_STATUS_WEIGHTS)),
+                      'null_rate': {'description': 0.3, 'notes': 0.7}},
+    'catalog_item_identifiers': {'ean': 0.7, 'supplier_code': 0.4},
+    'catalog_item_terms': {'second_category': 0.5, 'brand': 0.8},
+    'stock_items': {'rows': 3000, 'null_rate': {'lot_number': 0.5, 'expiration_date': 0.7}},
+    'stock_movements': {'rows': 5000, 'types': dict(zip(MOVEMENT_TYPES, MOVEMENT_TYPE_WEIGHTS)),
+                        'null_rate': {'movement_id': 0.5, 'reference': 0.4, 'user_id': 0.3}},
+}
+
+# Tablas con cantidad de filas configurable, en el orden en que se resuelven
+# (`rows: {per: tabla, ratio: x}` solo puede apuntar a una anterior) y el
+# argumento de la CLI al que corresponden
+SCENARIO_COUNTS = [('locations_locations', 'locations'), ('catalog_items', 'items'),
+                   ('stock_items', 'stock'), ('stock_movements', 'movements')]
+
+def read_spec(path):
+    """Lee un archivo de especificación JSON, o YAML si PyYAML está instalado"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if not HAS_YAML:
+                raise ValueError(f"{path}: PyYAML no está instalado (pip install pyyaml)")
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+def find_spec(name, directory):
+    """Ruta de `name`: ruta existente o preset <directory>/<name>.json|.yaml|.yml"""
+    if os.path.isfile(name):
+        return name
+    for extension in ('.json', '.yaml', '.yml'):
+        path = os.path.join(directory, name + extension)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def list_scenarios():
+    """Nombres de los presets de scenarios/"""
+    if not os.path.isdir(SCENARIOS_DIR):
+        return []
+    return sorted({os.path.splitext(name)[0] for name in os.listdir(SCENARIOS_DIR)
+                   if name.endswith(('.json', '.yaml', '.yml'))})
+
+def load_scenario(name):
+    """Lee un escenario por nombre de preset o ruta, con su perfil de distribuciones ya embebido"""
+    path = find_spec(name, SCENARIOS_DIR)
+    if path is None:
+        raise ValueError(f"No existe el escenario {name} (presets: {', '.join(list_scenarios()) or 'ninguno'})")
+    spec = read_spec(path)
+    spec.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    
+    # `distributions` puede ser un objeto, un preset de distributions/ o una ruta relativa al escenario
+    profile = spec.get('distributions')
+    if isinstance(profile, str):
+        relative = os.path.join(os.path.dirname(path), profile)
+        profile_path = relative if os.path.isfile(relative) else find_spec(profile, DISTRIBUTIONS_DIR)
+        if profile_path is None:
+            raise ValueError(f"{path}: no existe el perfil de distribuciones {profile}")
+        spec['distributions'] = read_spec(profile_path)
+    return spec
+
+class ScenarioPlan:
+    """Escenario compilado en un plan de generación.
+    
+    Resuelve una vez los conteos (incluidas las relaciones `per`/`ratio`), valida
+    las claves y deja listos los arrays y probabilidades que leen los chunks, así
+    la generación no toca dicts de configuración por fila ni normaliza pesos por
+    chunk. Sin escenario el plan reproduce exactamente el dataset de siempre.
+    """
+    
+    def __init__(self, spec=None, counts=None):
+        self.spec = spec or {}
+        self.name = self.spec.get('name', 'default')
+        tables = self._merge(self.spec.get('tables') or {})
+        self.counts = self._resolve_counts(tables, counts or {})
+        
+        self.per_vocabulary = int(tables['catalog_terms']['per_vocabulary'])
+        
+        locations = tables['locations_locations']
+        self.location_types, self.location_type_weights = self._weights(
+            'locations_locations.types', locations['types'], LOCATION_TYPES)
+        if len(set(self.location_type_weights)) == 1:
+            # Pesos iguales: random.choice, que consume el RNG como siempre
+            self.location_type_weights = None
+        low, high = locations['storage_units']
+        if not 0 <= low <= high:
+            raise ValueError("locations_locations.storage_units: se espera [mínimo, máximo] con 0 <= mínimo <= máximo")
+        self.storage_units = (int(low), int(high))
+        
+        self.item_status, self.item_status_weights = self._weights(
+            'catalog_items.status', tables['catalog_items']['status'], ITEM_STATUS)
+        movement_types, movement_weights = self._weights(
+            'stock_movements.types', tables['stock_movements']['types'], MOVEMENT_TYPES, keep_zeros=True)
+        self.movement_p = np.asarray(movement_weights) / sum(movement_weights)
+        
+        # Probabilidad de que la columna tenga valor (1 - null_rate)
+        self.present = {}
+        for table in ('catalog_items', 'stock_items', 'stock_movements'):
+            for column, rate in tables[table]['null_rate'].items():
+                self.present[(table, column)] = round(1 - self._rate(f"{table}.null_rate.{column}", rate), 12)
+        
+        identifiers, item_terms = tables['catalog_item_identifiers'], tables['catalog_item_terms']
+        self.ean_rate = self._rate('catalog_item_identifiers.ean', identifiers['ean'])
+        self.supplier_code_rate = self._rate('catalog_item_identifiers.supplier_code', identifiers['supplier_code'])
+        self.second_category_rate = self._rate('catalog_item_terms.second_category', item_terms['second_category'])
+        self.brand_rate = self._rate('catalog_item_terms.brand', item_terms['brand'])
+        
+        self.distributions = Distributions(self.spec.get('distributions'))
+    
+    @staticmethod
+    def _merge(tables):
+        """Aplica las tablas del escenario sobre DEFAULT_SCENARIO validando tablas y claves"""
+        merged = {table: dict(values) for table, values in DEFAULT_SCENARIO.items()}
+        for table, values in tables.items():
+            if table not in merged:
+                raise ValueError(f"Tabla no configurable en el escenario: {table} (opciones: {', '.join(merged)})")
+            for key, value in values.items():
+                if key not in merged[table]:
+                    raise ValueError(f"Clave no configurable: {table}.{key} (opciones: {', '.join(merged[table])})")
+                if key == 'null_rate':
+                    unknown = set(value) - set(merged[table][key])
+                    if unknown:
+                        raise ValueError(f"{table}.null_rate: columnas no configurables {', '.join(sorted(unknown))} "
+                                         f"(opciones: {', '.join(merged[table][key])})")
+                    value = {**merged[table][key], **value}
+                merged[table][key] = value
+        return merged
+    
+    @staticmethod
+    def _resolve_counts(tables, overrides):
+        """Filas por tabla: valor de la CLI, entero del escenario o `{per, ratio}` sobre una tabla anterior"""
+        counts = {}
+        for table, arg in SCENARIO_COUNTS:
+            rows = overrides.get(arg)
+            if rows is None:
+                rows = tables[table]['rows']
+            if isinstance(rows, dict):
+                base = dict(SCENARIO_COUNTS).get(rows.get('per'))
+                if base not in counts:
+                    raise ValueError(f"{table}.rows: 'per' debe ser una tabla anterior "
+                                     f"({', '.join(t for t, a in SCENARIO_COUNTS if a in counts) or 'ninguna'})")
+                rows = counts[base] * rows.get('ratio', 1)
+            counts[arg] = int(round(rows))
+            if counts[arg] < 0:
+                raise ValueError(f"{table}.rows debe ser >= 0")
+        return counts
+    
+    @staticmethod
+    def _weights(name, weights, allowed, keep_zeros=False):
+        """(valores, pesos) en el orden de `allowed`, validando nombres y pesos"""
+        unknown = set(weights) - set(allowed)
+        if unknown:
+            raise ValueError(f"{name}: valores no válidos {', '.join(sorted(unknown))} (opciones: {', '.join(allowed)})")
+        pairs = [(value, weights.get(value, 0)) for value in allowed if keep_zeros or weights.get(value, 0)]
+        if any(weight < 0 for _, weight in pairs) or sum(weight for _, weight in pairs) <= 0:
+            raise ValueError(f"{name}: los pesos deben ser >= 0 y sumar más que 0")
+        return [value for value, _ in pairs], [weight for _, weight in pairs]
+    
+    @staticmethod
+    def _rate(name, rate):
+        if not 0 <= rate <= 1:
+            raise ValueError(f"{name}: se espera una proporción entre 0 y 1, no {rate}")
+        return rate
+    
+    def present_mask(self, rng, table, column, size):
+        """Máscara de filas con valor en `column` según su null_rate"""
+        return mask_column(rng, size, self.present[(table, column)])
+    
+    def location_type(self):
+        if self.location_type_weights is None:
+            return random.choice(self.location_types)
+        return random.choices(self.location_types, self.location_type_weights)[0]
+    
+    def describe(self):
+        """Resumen de una línea para los logs"""
+        counts = ', '.join(f"{arg} {self.counts[arg]:,}" for _, arg in SCENARIO_COUNTS)
+        return f"{self.name} ({counts})"
+
+# =====================================================
+# TEXT POOLS
+# =====================================================
+
+class TextPool:
+    """Corpus de textos generado una vez con Faker por locale y cacheado en disco.
+    
+    Las filas toman sus textos por índice con el rng del chunk, sin llamar a
+    Faker. Con combine=True los párrafos se arman con frases del pool para
+    que la salida siga siendo variada.
+    """
+    KINDS = ('words', 'sentences', 'paragraphs', 'cities', 'streets', 'companies')
+    
+    def __init__(self, texts, combine=False):
+        self.texts = texts
+        self.combine = combine
+    
+    @classmethod
+    def load(cls, seed, locales=TEXT_POOL_LOCALES, size=TEXT_POOL_SIZE, cache_dir=TEXT_CACHE_DIR, combine=False):
+        """Carga (o genera y cachea) el corpus de cada locale y los combina"""
+        texts = {kind: [] for kind in cls.KINDS}
+        for locale in locales:
+            locale_texts = cls._load_locale(seed, locale, size, cache_dir)
+            for kind in cls.KINDS:
+                texts[kind].extend(locale_texts[kind])
+        return cls(texts, combine)
+    
+    @staticmethod
+    def _load_locale(seed, locale, size, cache_dir):
+        path = os.path.join(cache_dir, f"text_pool_{locale}_{seed}_{size}.json") if cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        
+        locale_fake = Faker(locale)
+        locale_fake.seed_instance(chunk_seed(seed, f'text_pool:{locale}', 0))
+        texts = {
+            'words': [locale_fake.word() for _ in range(size * 2)],
+            'sentences': [locale_fake.sentence() for _ in range(size)],
+            'paragraphs': [locale_fake.paragraph(nb_sentences=3) for _ in range(max(size // 2, 1))],
+            'cities': [locale_fake.city() for _ in range(max(size // 10, 1))],
+            'streets': [locale_fake.street_name() for _ in range(max(size // 10, 1))],
+            'companies': [locale_fake.company() for _ in range(max(size // 10, 1))],
+        }
+        
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(texts, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        return texts
+    
+    def sample(self, kind, rng, size):
+        """`size` textos de `kind` elegidos con reemplazo"""
+        values = self.texts[kind]
+        return [values[i] for i in rng.integers(0, len(values), size).tolist()]
+    
+    def one(self, kind, rng):
+        values = self.texts[kind]
+        return values[int(rng.integers(0, len(values)))]
+    
+    def paragraphs(self, rng, size, nb_sentences=3):
+        if not self.combine:
+            return self.sample('paragraphs', rng, size)
+        parts = self.sample('sentences', rng, size * nb_sentences)
+        return [' '.join(parts[i:i + nb_sentences]) for i in range(0, len(parts), nb_sentences)]
+
+# =====================================================
+# STOCK LEDGER (kardex)
+# =====================================================
+
+class StockLedger:
+    """Kardex simulado sobre los stock_items generados.
+    
+    Guarda por cada par (sku, location) su saldo final en arrays compactos y
+    reproduce eventos in/out/transfer/adjustment en orden temporal:
+    balance_after es el saldo real tras cada evento (el de origen en out y
+    transfer) y al terminar cada par coincide con stock_items.quantity.
+    Una transferencia es una sola fila: el saldo del destino tras recibirla
+    va en balance_after_to (meta.balance_after_to de stock_movements).
+    
+    Cada par parte de un saldo de apertura (stock anterior a la ventana
+    simulada) y su último evento lo concilia con el saldo final. Los pares
+    sin eventos abren directamente con su saldo final. Ningún evento deja el
+    saldo igual: así cada evento es una fila y salen exactamente `count`.
+    """
+    
+    def __init__(self):
+        self.skus = []
+        self.locations = array('q')
+        self.quantities = array('q')
+        # (sku, location) -> par, se arma al primer revert()
+        self.index = None
+    
+    def __len__(self):
+        return len(self.skus)
+    
+    def add(self, sku, location_index, quantity):
+        self.skus.append(sku)
+        self.locations.append(location_index)
+        self.quantities.append(int(quantity))
+    
+    def prepare(self, rng, count, weights=None, live=False):
+        """Sortea el par de cada uno de los `count` eventos y fija los saldos de apertura.
+        
+        `weights` (uno por par) concentra los eventos en pares calientes; sin
+        pesos el par de cada evento es uniforme. Con `live` los eventos son
+        nuevos: parten del saldo actual (quantities) y no se concilian.
+        """
+        pairs = len(self.skus)
+        self.live = live
+        if weights is None:
+            self.keys = rng.integers(0, pairs, count).astype(np.int32)
+        else:
+            self.keys = WeightedSampler(weights).sample(rng, count).astype(np.int32)
+        
+        # Índices del último y del penúltimo evento de cada par (-1 si no los tiene)
+        last = np.full(pairs, -1, dtype=np.int64)
+        penult = np.full(pairs, -1, dtype=np.int64)
+        if not live and count:
+            order = np.argsort(self.keys, kind='stable')
+            sorted_keys = self.keys[order]
+            ends = np.flatnonzero(np.append(sorted_keys[1:] != sorted_keys[:-1], True))
+            last[sorted_keys[ends]] = order[ends]
+            previous = ends[(ends > 0) & (sorted_keys[ends - 1] == sorted_keys[ends])]
+            penult[sorted_keys[previous]] = order[previous - 1]
+        self.last = array('q', last.tobytes())
+        self.penult = array('q', penult.tobytes())
+        
+        final = np.frombuffer(self.quantities, dtype=np.int64)
+        opening = final if live else np.where(last >= 0, rng.integers(0, 1001, pairs), final)
+        # Un par con un solo evento no debe abrir con su saldo final: la conciliación sería de 0
+        opening = np.where((last >= 0) & (penult < 0) & (opening == final), opening + 1, opening)
+        self.balance = array('q', opening.astype(np.int64).tobytes())
+        
+        # Pares con el mismo sku en otras ubicaciones (destinos de transferencias)
+        by_sku = {}
+        for pair, sku in enumerate(self.skus):
+            by_sku.setdefault(sku, []).append(pair)
+        self.siblings = {sku: group for sku, group in by_sku.items() if len(group) > 1}
+    
+    def step(self, rng, start, size, movement_p, distributions):
+        """Procesa los eventos [start, start + size) y retorna sus columnas.
+        
+        `movement_p` son las probabilidades de MOVEMENT_TYPES (ScenarioPlan.movement_p).
+        Para que la conciliación nunca sea de 0, un par solo recibe transferencias
+        antes de su penúltimo evento y ese evento no puede dejarlo en el saldo final.
+        """
+        keys = self.keys[start:start + size].tolist()
+        kinds = rng.choice(len(MOVEMENT_TYPES), size=size, p=movement_p).tolist()
+        drawn = distributions.integers(rng, 'stock_movements', 'quantity', 1, 500, size).tolist()
+        adjustments = rng.integers(-20, 21, size).tolist()
+        picks = rng.random(size).tolist()
+        
+        balance, last, penult = self.balance, self.last, self.penult
+        quantities, locations = self.quantities, self.locations
+        columns = {name: [] for name in ('sku', 'location_from', 'location_to', 'quantity', 'balance_after',
+                                         'balance_after_to', 'movement_type')}
+        
+        for i, pair in enumerate(keys):
+            event = start + i
+            current = balance[pair]
+            location = locations[pair]
+            origin, destination, after, target_after = None, None, None, None
+            
+            if last[pair] == event:
+                # Último evento del par: conciliar con el saldo final de stock_items
+                delta = quantities[pair] - current
+                kind = 'in' if delta > 0 else 'out'
+                quantity = abs(delta)
+            else:
+                kind = MOVEMENT_TYPES[kinds[i]]
+                quantity = drawn[i]
+                target = None
+                if kind == 'transfer':
+                    group = self.siblings.get(self.skus[pair])
+                    target = group[int(picks[i] * len(group))] if group else pair
+                    # El destino debe tener al menos dos eventos posteriores para poder conciliarse
+                    if target == pair or (not self.live and penult[target] <= event) or current == 0:
+                        kind, target = 'out', None
+                    else:
+                        quantity = min(quantity, current)
+                if kind == 'out':
+                    if current == 0:
+                        kind = 'in'
+                    else:
+                        quantity = min(quantity, current)
+                if kind == 'adjustment':
+                    # Signo negativo = merma; nunca 0
+                    quantity = max(adjustments[i], -current) or abs(adjustments[i]) or 1
+                delta = quantity if kind in ('in', 'adjustment') else -quantity
+                if penult[pair] == event and current + delta == quantities[pair]:
+                    # El último evento conciliaría en 0: este pasa a ser un ingreso
+                    kind, target = 'in', None
+                    quantity = drawn[i] + (current + drawn[i] == quantities[pair])
+                    delta = quantity
+                if target is not None:
+                    balance[target] += quantity
+                    destination = locations[target]
+                    target_after = balance[target]
+            
+            after = current + delta
+            balance[pair] = after
+            if kind in ('out', 'transfer'):
+                origin = location
+            else:
+                # Los ajustes (cantidad con signo) se registran en location_to
+                destination = location
+            
+            columns['sku'].append(self.skus[pair])
+            columns['location_from'].append(origin)
+            columns['location_to'].append(destination)
+            columns['quantity'].append(quantity)
+            columns['balance_after'].append(after)
+            columns['balance_after_to'].append(target_after)
+            columns['movement_type'].append(kind)
+        
+        return columns
+    
+    def revert(self, sku, location_from, location_to, quantity):
+        """Deshace en los saldos un evento de step() que no llegó a aplicarse (ubicaciones por índice)"""
+        if self.index is None:
+            self.index = {(sku, location): pair for pair, (sku, location) in enumerate(zip(self.skus, self.locations))}
+        if location_from is not None:
+            self.balance[self.index[(sku, location_from)]] += quantity
+        if location_to is not None:
+            self.balance[self.index[(sku, location_to)]] -= quantity
+
+# =====================================================
+# ROLLUPS (agregados para dashboards)
+# =====================================================
+
+class StockRollups:
+    """Agregados de stock_current / rollup_* acumulados chunk a chunk mientras se genera.
+    
+    Cada iter_* del faker le pasa sus chunks antes de entregarlos, así los
+    totales salen sin una segunda pasada sobre los datos. Solo se guardan
+    acumuladores por ubicación, por item y por día, no las filas.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.locations = []
+        self.term_names = {}
+        self.reset('catalog_items')
+        self.reset('catalog_item_terms')
+        self.reset('stock_items')
+        self.reset('stock_movements')
+    
+    def reset(self, table):
+        """Descarta lo acumulado de `table` (se está generando de nuevo)"""
+        if table == 'catalog_items':
+            self.items, self.active_items = 0, 0
+        elif table == 'catalog_item_terms':
+            self.item_terms = {}
+        elif table == 'stock_items':
+            # registros, cantidad, reservado
+            self.location_stock = {}
+            self.item_stock = {}
+            self.out_of_stock, self.low_stock = 0, 0
+        elif table == 'stock_movements':
+            self.daily = {}
+            self.movements = 0
+    
+    def add_locations(self, rows):
+        self.locations = [(row['id'], row['name'], row['type'], row['parent_id']) for row in rows]
+    
+    def add_terms(self, rows):
+        self.term_names = {row['id']: row['name'] for row in rows}
+    
+    def add_items(self, chunk):
+        with self.lock:
+            self.items += len(chunk)
+            self.active_items += sum(1 for row in chunk if row['status'] == 'active')
+    
+    def add_item_terms(self, chunk):
+        with self.lock:
+            for row in chunk:
+                self.item_terms.setdefault(row['item_id'], []).append(row['term_id'])
+    
+    def add_stock(self, chunk):
+        with self.lock:
+            for row in chunk:
+                quantity, reserved = int(row['quantity']), int(row['reserved_quantity'])
+                for key, totals in ((row['location_id'], self.location_stock), (row['catalog_item_id'], self.item_stock)):
+                    acc = totals.get(key)
+                    if acc is None:
+                        totals[key] = [1, quantity, reserved]
+                    else:
+                        acc[0] += 1
+                        acc[1] += quantity
+                        acc[2] += reserved
+                if quantity == 0:
+                    self.out_of_stock += 1
+                elif quantity < 10:
+                    self.low_stock += 1
+    
+    def add_movements(self, chunk):
+        with self.lock:
+            self.movements += len(chunk)
+            for row in chunk:
+                key = (row['created_at'][:10], row['movement_type'])
+                acc = self.daily.get(key)
+                if acc is None:
+                    self.daily[key] = [1, row['quantity']]
+                else:
+                    acc[0] += 1
+                    acc[1] += row['quantity']
+    
+    def location_rows(self, workspace_id):
+        names = {location_id: name for location_id, name, _, _ in self.locations}
+        moment = now()
+        rows = []
+        for location_id, name, location_type, parent_id in self.locations:
+            records, quantity, reserved = self.location_stock.get(location_id, (0, 0, 0))
+            rows.append({
+                'location_id': location_id,
+                'location_name': name,
+                'location_type': location_type,
+                'parent_location': names.get(parent_id),
+                'total_skus': records,
+                'total_quantity': quantity,
+                'total_reserved': reserved,
+                'available_quantity': quantity - reserved,
+                'workspace_id': workspace_id,
+                'updated_at': moment,
+            })
+        return rows
+    
+    def category_rows(self, workspace_id):
+        """Las filas de vw_inventory_by_category.
+        
+        Como los LEFT JOIN de la vista: una fila por nombre de término (de
+        cualquier vocabulario) con items, y UNCATEGORIZED para los items sin
+        términos. Un nombre repetido en un item repite sus filas de stock en
+        el JOIN, así que suma la cantidad y el reservado una vez por término.
+        """
+        # [items, registros, cantidad, reservado, filas de stock en el JOIN] por nombre
+        totals = {}
+        
+        def add(name, records, quantity, reserved, joins=1):
+            acc = totals.setdefault(name, [0, 0, 0, 0, 0])
+            acc[0] += 1
+            acc[1] += records
+            acc[2] += quantity * joins
+            acc[3] += reserved * joins
+            acc[4] += records * joins
+        
+        for item_id, term_ids in self.item_terms.items():
+            records, quantity, reserved = self.item_stock.get(item_id, (0, 0, 0))
+            names = [self.term_names[term_id] for term_id in term_ids]
+            for name in set(names):
+                add(name, records, quantity, reserved, names.count(name))
+        if self.items > len(self.item_terms):
+            for item_id, (records, quantity, reserved) in self.item_stock.items():
+                if item_id not in self.item_terms:
+                    add(UNCATEGORIZED, records, quantity, reserved)
+            # Los items sin términos y sin stock solo suman al conteo
+            totals.setdefault(UNCATEGORIZED, [0, 0, 0, 0, 0])[0] = self.items - len(self.item_terms)
+        
+        moment = now()
+        return [{
+            'category': name,
+            'total_items': items,
+            'total_stock_records': records,
+            'total_quantity': quantity,
+            'reserved': reserved,
+            'avg_quantity_per_location': round(quantity / joins, 4) if joins else None,
+            'workspace_id': workspace_id,
+            'updated_at': moment,
+        } for name, (items, records, quantity, reserved, joins) in totals.items()]
+    
+    def daily_rows(self, workspace_id):
+        moment = now()
+        return [{
+            'day': day,
+            'movement_type': movement_type,
+            'movements': count,
+            'total_quantity': quantity,
+            'workspace_id': workspace_id,
+            'updated_at': moment,
+        } for (day, movement_type), (count, quantity) in sorted(self.daily.items())]
+    
+    def kpi_rows(self, workspace_id):
+        stock = [sum(acc[i] for acc in self.location_stock.values()) for i in range(3)]
+        return [{
+            'snapshot_at': now(),
+            'total_items': self.items,
+            'active_items': self.active_items,
+            'total_locations': len(self.locations),
+            'warehouses': sum(1 for location in self.locations if location[2] == 'warehouse'),
+            'stock_records': stock[0],
+            'total_stock_quantity': stock[1],
+            'total_reserved': stock[2],
+            'out_of_stock': self.out_of_stock,
+            'low_stock': self.low_stock,
+            'total_movements': self.movements,
+            'workspace_id': workspace_id,
+        }]
+
+# =====================================================
+# MÉTRICAS Y PROFILING
+# =====================================================
+
+class Metrics:
+    """Tiempos, filas y bytes por fase (tabla) de una corrida.
+    
+    El tiempo de cada fase se reparte en generate (producir los chunks),
+    serialize (armar SQL/TSV/NDJSON/Arrow) y db (round-trip con MySQL). Con
+    varios writers en paralelo las tres se solapan: son tiempos acumulados,
+    mientras que `wall` va del primer al último evento de la fase.
+    """
+    
+    KINDS = ('generate', 'serialize', 'db')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.started = time.perf_counter()
+    
+    def _phase(self, name):
+        return self.phases.setdefault(name, {'rows': 0, 'bytes': 0, 'generate': 0.0, 'serialize': 0.0, 'db': 0.0,
+                                             'first': None, 'last': None})
+    
+    def add(self, name, kind, seconds, rows=0, nbytes=0):
+        """Registra `seconds` de tipo `kind` terminados ahora"""
+        end = time.perf_counter()
+        with self.lock:
+            phase = self._phase(name)
+            phase[kind] += seconds
+            phase['rows'] += rows
+            phase['bytes'] += nbytes
+            start = end - seconds
+            phase['first'] = start if phase['first'] is None else min(phase['first'], start)
+            phase['last'] = end if phase['last'] is None else max(phase['last'], end)
+    
+    @contextlib.contextmanager
+    def timer(self, name, kind):
+        """Mide un bloque; el dict que entrega acepta 'rows' y 'bytes'"""
+        counts = {'rows': 0, 'bytes': 0}
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.add(name, kind, time.perf_counter() - started, counts['rows'], counts['bytes'])
+    
+    def track(self, name, chunks):
+        """Envuelve un generador de chunks midiendo solo el tiempo de generarlos"""
+        chunks = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            self.add(name, 'generate', time.perf_counter() - started, rows=len(chunk))
+            yield chunk
+    
+    @staticmethod
+    def peak_rss_mb():
+        """Pico de RSS del proceso y de los workers terminados, en MB"""
+        if not HAS_RESOURCE:
+            return None
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    
+    def summary(self, **meta):
+        """Resumen en un dict serializable a JSON (para comparar corridas en CI)"""
+        phases = {}
+        for name, phase in self.phases.items():
+            wall = (phase['last'] - phase['first']) if phase['first'] is not None else 0.0
+            phases[name] = {
+                'rows': phase['rows'],
+                'bytes': phase['bytes'],
+                'wall_s': round(wall, 4),
+                **{f"{kind}_s": round(phase[kind], 4) for kind in self.KINDS},
+                'rows_per_s': round(phase['rows'] / wall, 1) if wall > 0 else None,
+                'bytes_per_s': round(phase['bytes'] / wall, 1) if wall > 0 else None,
+            }
+        return {
+            **meta,
+            'wall_s': round(time.perf_counter() - self.started, 4),
+            'peak_rss_mb': self.peak_rss_mb(),
+            'phases': phases,
+        }
+    
+    def report(self):
+        summary = self.summary()
+        print("\n⏱  Métricas por fase (segundos acumulados: generación / serialización / BD)")
+        for name, phase in summary['phases'].items():
+            rate = f"{phase['rows_per_s']:,.0f} filas/s" if phase['rows_per_s'] else '-'
+            mb_rate = f", {phase['bytes_per_s'] / 1024 / 1024:.1f} MB/s" if phase['bytes'] and phase['bytes_per_s'] else ''
+            print(f"   {name:<26} {phase['rows']:>10,} filas  {phase['wall_s']:>7.2f}s  {rate}{mb_rate}  "
+                  f"({phase['generate_s']:.2f} / {phase['serialize_s']:.2f} / {phase['db_s']:.2f})")
+        rss = summary['peak_rss_mb']
+        print(f"   Total {summary['wall_s']:.2f}s" + (f", pico RSS {rss:,.1f} MB" if rss is not None else ''))
+
+
+metrics = Metrics()
+
+
+def timed_generation(table):
+    """Decorador: registra en `metrics` la generación de `table` (listas o generadores de chunks)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = method(*args, **kwargs)
+            if isinstance(result, list):
+                metrics.add(table, 'generate', time.perf_counter() - started, rows=len(result))
+                return result
+            return metrics.track(table, result)
+        return wrapper
+    return decorator
+
+
+class SamplingProfiler:
+    """Muestrea las pilas de todos los threads y las guarda como collapsed stacks.
+    
+    El formato ("a;b;c N" por línea) es el que esperan flamegraph.pl y
+    speedscope. A diferencia de cProfile incluye los threads de carga.
+    """
+    
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                key = ';'.join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+    
+    def start(self):
+        self.thread.start()
+    
+    def stop(self, path):
+        self.stop_event.set()
+        self.thread.join()
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def start_profile(fmt):
+    """Arranca cProfile ('pstats', solo el thread principal) o el muestreo ('collapsed')"""
+    profiler = SamplingProfiler() if fmt == 'collapsed' else cProfile.Profile()
+    profiler.enable() if fmt != 'collapsed' else profiler.start()
+    return profiler
+
+def stop_profile(profiler, path):
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop(path)
+    else:
+        profiler.disable()
+        profiler.dump_stats(path)
+    print(f"🔬 Perfil guardado en {path}")
 
 # =====================================================
 # DATA GENERATORS
 # =====================================================
 
 class VesselFaker:
-    def __init__(self, workspace_id=None):
+    def __init__(self, workspace_id=None, seed=None, workers=1, text_pool=None, id_strategy='uuid4', rollups=False,
+                 distributions=None, plan=None):
+        # Cada chunk se genera con su propia semilla derivada de `seed`, así la
+        # salida es idéntica con cualquier número de workers
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.workers = max(1, workers)
+        self.id_strategy = id_strategy
+        # Sin semilla explícita se reutiliza el corpus por defecto (semilla 0) de la cache
+        self.text = text_pool or TextPool.load(seed if seed is not None else 0)
+        self._seed_chunk('workspace', 0)
         self.workspace_id = workspace_id or generate_uuid()
         self.vocabularies = {}
         self.terms = {}
         self.locations = []
         self.items = []
-        self.stock_items = []
+        self.ledger = StockLedger()
+        # Pares y ledger de stock_items ya resueltos (ver plan_stock)
+        self.stock_plan = None
+        self.stock_lock = threading.Lock()
+        # Agregados para stock_current y rollup_* (solo con rollups=True)
+        self.rollups = StockRollups() if rollups else None
+        # Proporciones, tasas de nulos y conteos del escenario (ScenarioPlan)
+        self.plan = plan or ScenarioPlan()
+        # Zipf / Pareto / perfiles temporales por tabla: el del escenario salvo que se pase otro
+        self.distributions = distributions or self.plan.distributions
+        self._popularity = {}
+        # Número global de cada chunk por tabla cuando varios workspaces comparten
+        # la numeración (semillas e IDs, ver MultiWorkspaceFaker); vacío = 0, 1, 2...
+        self.chunk_numbers = {}
+    
+    def _seed_chunk(self, table, index):
+        s = chunk_seed(self.seed, table, index)
+        random.seed(s)
+        fake.seed_instance(s)
+        self.rng = np.random.default_rng(s)
+        self.chunk_table = table
+        self.chunk_index = index
+    
+    def _chunk_number(self, table, index):
+        numbers = self.chunk_numbers.get(table)
+        return index if numbers is None else numbers[index]
+    
+    def _ids(self, size):
+        """PKs para las filas del chunk actual, generadas en bloque según id_strategy.
+        
+        uuid7 y sequential son crecientes dentro del chunk y entre chunks (el
+        contador arranca en chunk_index << 20), así las filas llegan al loader
+        ya ordenadas por PK y se insertan al final del índice clustered.
+        """
+        sequence = self.chunk_index << 20
+        if self.id_strategy == 'uuid7':
+            return uuid_column(self.rng, size, version=7, sequence=sequence)
+        if self.id_strategy == 'sequential':
+            # Consumir los mismos bytes que un UUID: el resto de columnas no cambia entre estrategias
+            self.rng.bytes(16 * size)
+            return sequential_id_column(self.chunk_table, size, sequence)
+        return uuid_column(self.rng, size)
+    
+    def popularity(self, table, field, size):
+        """Pesos Zipf de `size` elementos para table.field, o None si es uniforme.
+        
+        El ranking sale de una semilla propia (no del RNG del chunk), así es el
+        mismo en todos los chunks y en todos los workers.
+        """
+        key = (table, field, size)
+        if key not in self._popularity:
+            rng = np.random.default_rng(chunk_seed(self.seed, f"{table}:{field}:popularity", 0))
+            self._popularity[key] = self.distributions.popularity(rng, table, field, size)
+        return self._popularity[key]
+    
+    def _worker_state(self):
+        return {
+            'workspace_id': self.workspace_id,
+            'seed': self.seed,
+            'id_strategy': self.id_strategy,
+            'run_now': run_clock(),
+            'text_pool': self.text,
+            'distributions': self.distributions,
+            'plan': self.plan,
+            'vocabularies': self.vocabularies,
+            'terms': self.terms,
+            'locations': self.locations,
+            'items': self.items,
+        }
+    
+    def _map_chunks(self, table, method, chunk_args):
+        """Ejecuta `method(*args)` por chunk, en orden, con semilla por chunk.
+        
+        Con workers > 1 reparte los chunks en un pool de procesos, manteniendo
+        como máximo 2 chunks en vuelo por worker para no acumular memoria.
+        """
+        if self.workers <= 1:
+            for index, args in enumerate(chunk_args):
+                # `random` y `fake` son globales: otra tabla puede estar generándose en otro thread
+                with _generation_lock:
+                    self._seed_chunk(table, self._chunk_number(table, index))
+                    chunk = getattr(self, method)(*args)
+                yield chunk
+            return
         
+        # spawn: el pool puede crearse desde threads del loader, donde fork no es seguro
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(self.workers, initializer=_init_worker, initargs=(self._worker_state(),)) as pool:
+            pending = deque()
+            for index, args in enumerate(chunk_args):
+                pending.append(pool.apply_async(_run_chunk, ((table, self._chunk_number(table, index), method, args),)))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+    
+    @timed_generation('taxonomy_vocabularies')
     def generate_vocabularies(self):
         """Genera vocabularios estándar"""
+        self._seed_chunk('taxonomy_vocabularies', 0)
         vocabs = [
             ('Categorías', 'categories', 'Categorías de productos'),
             ('Marcas', 'brands', 'Marcas de productos'),
@@ -129,8 +1438,11 @@ class VesselFaker:
             })
         return result
     
-    def generate_terms(self, count_per_vocab=20):
-        """Genera términos para cada vocabulario"""
+    @timed_generation('catalog_terms')
+    def generate_terms(self, count_per_vocab=None):
+        """Genera términos para cada vocabulario (categorías y marcas: per_vocabulary del escenario)"""
+        self._seed_chunk('catalog_terms', 0)
+        count_per_vocab = count_per_vocab or self.plan.per_vocabulary
         result = []
         
         # Categorías
@@ -193,31 +1505,38 @@ class VesselFaker:
                 'updated_at': now(),
             })
         
+        if self.rollups:
+            self.rollups.add_terms(result)
         return result
     
-    def generate_locations(self, count=50, storage_units_per_location=5):
-        """Genera ubicaciones con jerarquía"""
+    @timed_generation('locations_locations')
+    def generate_locations(self, count=None, storage_units_per_location=None):
+        """Genera ubicaciones con jerarquía (conteo, tipos y storage units según el escenario)"""
+        self._seed_chunk('locations_locations', 0)
+        count = self.plan.counts['locations'] if count is None else count
+        min_units, max_units = self.plan.storage_units
+        max_units = storage_units_per_location or max_units
         result = []
         
         # Generar ubicaciones principales (warehouses, stores, etc.)
         main_locations = []
         for i in range(count):
-            loc_type = random.choice(LOCATION_TYPES)
+            loc_type = self.plan.location_type()
             loc_id = generate_uuid()
             
             if loc_type == 'warehouse':
-                name = f"Bodega {fake.city()}"
+                name = f"Bodega {self.text.one('cities', self.rng)}"
             elif loc_type == 'store':
-                name = f"Tienda {fake.street_name()}"
+                name = f"Tienda {self.text.one('streets', self.rng)}"
             elif loc_type == 'distribution_center':
-                name = f"Centro Distribución {fake.city()}"
+                name = f"Centro Distribución {self.text.one('cities', self.rng)}"
             else:
-                name = f"Oficina {fake.company()}"
+                name = f"Oficina {self.text.one('companies', self.rng)}"
             
             location = {
                 'id': loc_id,
                 'name': name,
-                'description': fake.sentence(),
+                'description': self.text.one('sentences', self.rng),
                 'type': loc_type,
                 'address_id': None,
                 'parent_id': None,
@@ -233,13 +1552,13 @@ class VesselFaker:
         # Generar storage units dentro de warehouses
         warehouses = [l for l in result if l['type'] == 'warehouse']
         for warehouse in warehouses:
-            for j in range(random.randint(2, storage_units_per_location)):
+            for j in range(random.randint(min(min_units, max_units), max_units)):
                 unit_id = generate_uuid()
                 unit_type = random.choice(['Estante', 'Rack', 'Cajón', 'Zona', 'Pasillo', 'Bin'])
                 
                 storage_unit = {
                     'id': unit_id,
-                    'name': f"{unit_type} {fake.random_letter().upper()}{random.randint(1, 99)}",
+                    'name': f"{unit_type} {random.choice(string.ascii_uppercase)}{random.randint(1, 99)}",
                     'description': f'{unit_type} en {warehouse["name"]}',
                     'type': 'storage_unit',
                     'address_id': None,
@@ -252,270 +1571,1329 @@ class VesselFaker:
                 result.append(storage_unit)
                 self.locations.append(unit_id)
         
+        if self.rollups:
+            self.rollups.add_locations(result)
         return result
     
     def generate_items(self, count=1000):
         """Genera items del catálogo"""
-        result = []
+        return [row for chunk in self.iter_items(count) for row in chunk]
+    
+    @timed_generation('catalog_items')
+    def iter_items(self, count=1000, chunk_size=CHUNK_SIZE):
+        """Genera items del catálogo en chunks (solo los IDs quedan en memoria)"""
+        sizes = ((min(chunk_size, count - start),) for start in range(0, count, chunk_size))
+        if self.rollups:
+            self.rollups.reset('catalog_items')
+        for chunk in self._map_chunks('catalog_items', '_items_chunk', sizes):
+            self.items.extend(item['id'] for item in chunk)
+            if self.rollups:
+                self.rollups.add_items(chunk)
+            yield chunk
+    
+    def _items_chunk(self, size):
+        rng, plan = self.rng, self.plan
         
-        for i in range(count):
-            item_id = generate_uuid()
-            
-            # Nombre de producto realista
-            category = random.choice(PRODUCT_CATEGORIES)
-            adjective = fake.word()
-            product_type = fake.word()
-            name = f"{adjective.title()} {product_type.title()} - {category}"
-            
-            item = {
-                'id': item_id,
-                'name': name[:255],
-                'description': fake.paragraph(nb_sentences=3) if random.random() > 0.3 else None,
-                'uom_id': None,  # Se puede vincular después
-                'notes': fake.sentence() if random.random() > 0.7 else None,
-                'status': random.choice(ITEM_STATUS),
-                'workspace_id': self.workspace_id,
-                'created_at': now(),
-                'updated_at': now(),
-            }
-            
-            result.append(item)
-            self.items.append(item_id)
+        # Nombre de producto realista
+        categories = choice_column(rng, PRODUCT_CATEGORIES, size)
+        words = self.text.sample('words', rng, size * 2)
+        names = [
+            f"{adjective.title()} {product_type.title()} - {category}"[:255]
+            for adjective, product_type, category in zip(words[0::2], words[1::2], categories)
+        ]
         
-        return result
+        return rows_from_columns({
+            'id': self._ids(size),
+            'name': names,
+            'description': nullable(plan.present_mask(rng, 'catalog_items', 'description', size), self.text.paragraphs(rng, size)),
+            'uom_id': [None] * size,  # Se puede vincular después
+            'notes': nullable(plan.present_mask(rng, 'catalog_items', 'notes', size), self.text.sample('sentences', rng, size)),
+            'status': choice_column(rng, plan.item_status, size, plan.item_status_weights),
+            'workspace_id': [self.workspace_id] * size,
+            'created_at': [now()] * size,
+            'updated_at': [now()] * size,
+        })
     
     def generate_item_identifiers(self, items):
         """Genera identificadores (SKU, EAN, etc.) para items"""
-        result = []
+        item_ids = [item['id'] for item in items]
+        return [row for chunk in self.iter_item_identifiers(item_ids) for row in chunk]
+    
+    @timed_generation('catalog_item_identifiers')
+    def iter_item_identifiers(self, item_ids=None, chunk_size=CHUNK_SIZE):
+        """Genera identificadores en chunks recorriendo el pool de IDs de items.
+        
+        Si dos items sortean el mismo SKU principal se le agrega un sufijo al
+        segundo para que sigan siendo únicos (ver resolve_item_skus).
+        """
+        item_ids = self.items if item_ids is None else item_ids
+        seen = set()
+        
+        slices = ((item_ids[start:start + chunk_size],) for start in range(0, len(item_ids), chunk_size))
+        for chunk in self._map_chunks('catalog_item_identifiers', '_item_identifiers_chunk', slices):
+            for row in chunk:
+                if row['is_primary']:
+                    row['value'] = unique_sku(row['value'], seen)
+            yield chunk
+    
+    def resolve_item_skus(self, chunk_size=CHUNK_SIZE):
+        """SKU principal de cada item, igual al de catalog_item_identifiers, sin generar esa tabla.
         
-        for item in items:
+        Repite con la misma semilla solo el primer sorteo de cada chunk
+        (sku_column) y los mismos sufijos de desempate.
+        """
+        sku_items, skus, seen = [], [], set()
+        for index, start in enumerate(range(0, len(self.items), chunk_size)):
+            item_ids = self.items[start:start + chunk_size]
+            with _generation_lock:
+                self._seed_chunk('catalog_item_identifiers', self._chunk_number('catalog_item_identifiers', index))
+                values = sku_column(self.rng, len(item_ids))
+            sku_items += item_ids
+            skus += [unique_sku(sku, seen) for sku in values]
+        return sku_items, skus
+    
+    def _item_identifiers_chunk(self, item_ids):
+        rng = self.rng
+        size = len(item_ids)
+        skus = sku_column(rng, size)
+        has_ean = mask_column(rng, size, self.plan.ean_rate)  # EAN (70% por defecto)
+        eans = ean13_column(rng, size)
+        has_supplier = mask_column(rng, size, self.plan.supplier_code_rate)  # Código proveedor (40% por defecto)
+        suppliers = number_column(rng, size, 6).tolist()
+        ids = iter(self._ids(size + int(has_ean.sum()) + int(has_supplier.sum())))
+        created = now()
+        
+        result = []
+        for item_id, sku, ean_flag, ean, supplier_flag, supplier in zip(
+                item_ids, skus, has_ean.tolist(), eans, has_supplier.tolist(), suppliers):
             # SKU principal (siempre)
             result.append({
-                'id': generate_uuid(),
-                'item_id': item['id'],
+                'id': next(ids),
+                'item_id': item_id,
                 'variant_id': None,
                 'type': 'sku',
-                'value': generate_sku(),
+                'value': sku,
                 'is_primary': 1,
-                'created_at': now(),
-                'updated_at': now(),
+                'created_at': created,
+                'updated_at': created,
             })
             
-            # EAN (70% probabilidad)
-            if random.random() > 0.3:
+            if ean_flag:
                 result.append({
-                    'id': generate_uuid(),
-                    'item_id': item['id'],
+                    'id': next(ids),
+                    'item_id': item_id,
                     'variant_id': None,
                     'type': 'ean',
-                    'value': generate_ean(),
+                    'value': ean,
                     'is_primary': 0,
-                    'created_at': now(),
-                    'updated_at': now(),
+                    'created_at': created,
+                    'updated_at': created,
                 })
             
-            # Código proveedor (40% probabilidad)
-            if random.random() > 0.6:
+            if supplier_flag:
                 result.append({
-                    'id': generate_uuid(),
-                    'item_id': item['id'],
+                    'id': next(ids),
+                    'item_id': item_id,
                     'variant_id': None,
                     'type': 'supplier_code',
-                    'value': f"SUP-{fake.random_number(digits=6, fix_len=True)}",
+                    'value': f"SUP-{supplier}",
                     'is_primary': 0,
-                    'created_at': now(),
-                    'updated_at': now(),
+                    'created_at': created,
+                    'updated_at': created,
                 })
         
         return result
     
     def generate_item_terms(self, items):
         """Asocia términos a items (categorías, marcas, etc.)"""
-        result = []
+        item_ids = [item['id'] for item in items]
+        return [row for chunk in self.iter_item_terms(item_ids) for row in chunk]
+    
+    @timed_generation('catalog_item_terms')
+    def iter_item_terms(self, item_ids=None, chunk_size=CHUNK_SIZE):
+        """Asocia términos a items en chunks recorriendo el pool de IDs de items"""
+        item_ids = self.items if item_ids is None else item_ids
+        slices = ((item_ids[start:start + chunk_size],) for start in range(0, len(item_ids), chunk_size))
+        if self.rollups:
+            self.rollups.reset('catalog_item_terms')
+        for chunk in self._map_chunks('catalog_item_terms', '_item_terms_chunk', slices):
+            if self.rollups:
+                self.rollups.add_item_terms(chunk)
+            yield chunk
+    
+    def _item_terms_chunk(self, item_ids):
+        rng = self.rng
+        size = len(item_ids)
+        categories = self.terms.get('categories') or []
+        brands = self.terms.get('brands') or []
+        created = now()
         
-        for item in items:
-            # 1-2 categorías
-            if self.terms.get('categories'):
-                for term_id in random.sample(self.terms['categories'], min(random.randint(1, 2), len(self.terms['categories']))):
-                    result.append({
-                        'item_id': item['id'],
-                        'term_id': term_id,
-                        'created_at': now(),
-                        'updated_at': now(),
-                    })
+        category_weights = self.popularity('catalog_item_terms', 'categories', len(categories))
+        brand_weights = self.popularity('catalog_item_terms', 'brands', len(brands))
+        
+        # 1-2 categorías distintas: la segunda se desplaza 1..n-1 posiciones desde la primera
+        if categories:
+            if category_weights is None:
+                first = rng.integers(0, len(categories), size)
+            else:
+                first = WeightedSampler(category_weights).sample(rng, size)
+            has_second = mask_column(rng, size, self.plan.second_category_rate) if len(categories) > 1 else np.zeros(size, dtype=bool)
+            if category_weights is None:
+                second = (first + rng.integers(1, max(len(categories), 2), size)) % len(categories)
+            else:
+                # Con popularidad la segunda también sale del ranking; si repite, la siguiente
+                second = WeightedSampler(category_weights).sample(rng, size)
+                second = np.where(second == first, (second + 1) % len(categories), second)
+        
+        # 1 marca (80% por defecto)
+        has_brand = mask_column(rng, size, self.plan.brand_rate)
+        if brand_weights is None:
+            brand_idx = rng.integers(0, max(len(brands), 1), size)
+        else:
+            brand_idx = WeightedSampler(brand_weights).sample(rng, size)
+        
+        result = []
+        for i, item_id in enumerate(item_ids):
+            term_ids = []
+            if categories:
+                term_ids.append(categories[first[i]])
+                if has_second[i]:
+                    term_ids.append(categories[second[i]])
+            if brands and has_brand[i]:
+                term_ids.append(brands[brand_idx[i]])
             
-            # 1 marca (80% probabilidad)
-            if self.terms.get('brands') and random.random() > 0.2:
+            for term_id in term_ids:
                 result.append({
-                    'item_id': item['id'],
-                    'term_id': random.choice(self.terms['brands']),
-                    'created_at': now(),
-                    'updated_at': now(),
+                    'item_id': item_id,
+                    'term_id': term_id,
+                    'created_at': created,
+                    'updated_at': created,
                 })
         
         return result
     
     def generate_stock_items(self, count=5000):
         """Genera stock en ubicaciones"""
-        result = []
-        
-        if not self.items or not self.locations:
-            raise ValueError("Debe generar items y locations primero")
-        
-        used_combinations = set()
+        return [row for chunk in self.iter_stock_items(count) for row in chunk]
+    
+    def plan_stock(self, count, chunk_size=CHUNK_SIZE):
+        """Resuelve en memoria los pares (sku, location) de `count` stock items y arma el ledger.
         
-        for i in range(count):
-            # Evitar duplicados de SKU + location
-            attempts = 0
-            while attempts < 100:
-                item_id = random.choice(self.items)
-                location_id = random.choice(self.locations)
-                sku = generate_sku()
-                key = (sku, location_id)
-                
-                if key not in used_combinations:
-                    used_combinations.add(key)
-                    break
-                attempts += 1
+        Los pares salen de una permutación afín del espacio items × locations,
+        k -> (a·k + b) mod N con gcd(a, N) = 1: son únicos por construcción,
+        sin reintentos ni sets. Los SKU (resolve_item_skus) y las cantidades se
+        sortean con las mismas semillas que sus tablas, así stock_items y
+        stock_movements no esperan a que otra tabla se genere o se cargue.
+        Se calcula una sola vez por (count, chunk_size).
+        """
+        with self.stock_lock:
+            if self.stock_plan is not None and self.stock_plan[:2] == (count, chunk_size):
+                return self.stock_plan
+            if not self.items or not self.locations:
+                raise ValueError("Debe generar items y locations primero")
             
-            if attempts >= 100:
-                continue
+            space = len(self.items) * len(self.locations)
+            if count > space:
+                raise ValueError(f"No hay suficientes combinaciones sku/location para {count:,} stock items "
+                                 f"(máximo {space:,}: {len(self.items):,} SKUs × {len(self.locations):,} ubicaciones)")
             
-            quantity = random.randint(0, 1000)
-            reserved = random.randint(0, min(quantity, 100)) if quantity > 0 else 0
+            sku_items, skus = self.resolve_item_skus(chunk_size)
+            with _generation_lock:
+                self._seed_chunk('stock_items:allocator', 0)
+                multiplier, offset = pair_permutation(self.rng, space)
             
-            stock_item = {
-                'id': generate_uuid(),
-                'sku': sku,
-                'catalog_item_id': item_id,
-                'catalog_origin': 'internal',
-                'location_id': location_id,
-                'location_type': 'warehouse',
-                'quantity': quantity,
-                'reserved_quantity': reserved,
-                'lot_number': f"LOT-{fake.random_number(digits=6, fix_len=True)}" if random.random() > 0.5 else None,
-                'expiration_date': random_date(30, 730) if random.random() > 0.7 else None,
-                'serial_number': None,
-                'workspace_id': self.workspace_id,
-                'meta': None,
-                'created_at': now(),
-                'updated_at': now(),
-            }
+            ledger = StockLedger()
+            for index, start in enumerate(range(0, count, chunk_size)):
+                size = min(chunk_size, count - start)
+                item_index, location_index = np.divmod(permuted_range(start, size, multiplier, offset, space),
+                                                       len(self.locations))
+                with _generation_lock:
+                    # Primer sorteo de _stock_items_chunk
+                    self._seed_chunk('stock_items', self._chunk_number('stock_items', index))
+                    quantities = self.distributions.integers(self.rng, 'stock_items', 'quantity', 0, 1000, size)
+                for i, l, quantity in zip(item_index.tolist(), location_index.tolist(), quantities.tolist()):
+                    ledger.add(skus[i], l, quantity)
             
-            result.append(stock_item)
-            self.stock_items.append(stock_item['id'])
+            self.ledger = ledger
+            self.stock_plan = (count, chunk_size, sku_items, skus, multiplier, offset, space)
+            return self.stock_plan
+    
+    @timed_generation('stock_items')
+    def iter_stock_items(self, count=5000, chunk_size=CHUNK_SIZE):
+        """Genera stock en ubicaciones en chunks, exactamente `count` filas (ver plan_stock)"""
+        _, _, sku_items, skus, multiplier, offset, space = self.plan_stock(count, chunk_size)
         
-        return result
+        def chunk_args():
+            for start in range(0, count, chunk_size):
+                pairs = permuted_range(start, min(chunk_size, count - start), multiplier, offset, space)
+                item_index, location_index = np.divmod(pairs, len(self.locations))
+                item_index, location_index = item_index.tolist(), location_index.tolist()
+                yield ([sku_items[i] for i in item_index], [skus[i] for i in item_index],
+                       [self.locations[l] for l in location_index])
+        
+        if self.rollups:
+            self.rollups.reset('stock_items')
+        for chunk in self._map_chunks('stock_items', '_stock_items_chunk', chunk_args()):
+            if self.rollups:
+                self.rollups.add_stock(chunk)
+            yield chunk
+    
+    def _stock_items_chunk(self, item_ids, skus, location_ids):
+        rng = self.rng
+        size = len(item_ids)
+        quantities = self.distributions.integers(rng, 'stock_items', 'quantity', 0, 1000, size)
+        # reserved uniforme en [0, min(quantity, 100)]
+        reserved = (rng.random(size) * (np.minimum(quantities, 100) + 1)).astype(np.int64)
+        created = now()
+        
+        return rows_from_columns({
+            'id': self._ids(size),
+            'sku': skus,
+            'catalog_item_id': item_ids,
+            'catalog_origin': ['internal'] * size,
+            'location_id': location_ids,
+            'location_type': ['warehouse'] * size,
+            'quantity': quantities,
+            'reserved_quantity': reserved,
+            'lot_number': nullable(self.plan.present_mask(rng, 'stock_items', 'lot_number', size),
+                                   (f"LOT-{n}" for n in number_column(rng, size, 6).tolist())),
+            'expiration_date': nullable(self.plan.present_mask(rng, 'stock_items', 'expiration_date', size),
+                                        date_column(rng, size, 30, 730)),
+            'serial_number': [None] * size,
+            'workspace_id': [self.workspace_id] * size,
+            'meta': [None] * size,
+            'created_at': [created] * size,
+            'updated_at': [created] * size,
+        })
     
     def generate_stock_movements(self, count=10000):
         """Genera movimientos de stock históricos"""
-        result = []
+        return [row for chunk in self.iter_stock_movements(count) for row in chunk]
+    
+    def load_ledger(self, cursor, batch_size=10000):
+        """Carga en el ledger los stock_items ya existentes en la BD (modo --only-movements)"""
+        location_index = {location_id: i for i, location_id in enumerate(self.locations)}
+        self.ledger = StockLedger()
+        self.stock_plan = None
+        cursor.execute("SELECT sku, location_id, quantity FROM stock_items ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for sku, location_id, quantity in rows:
+                if location_id in location_index:
+                    self.ledger.add(sku, location_index[location_id], int(quantity))
+    
+    @timed_generation('stock_movements')
+    def iter_stock_movements(self, count=10000, chunk_size=CHUNK_SIZE, live=False):
+        """Genera el kardex en chunks, en orden temporal, simulado sobre los stock_items.
         
-        for i in range(count):
-            movement_type = random.choice(MOVEMENT_TYPES)
-            sku = generate_sku()
-            
-            location_from = random.choice(self.locations) if movement_type in ['out', 'transfer'] else None
-            location_to = random.choice(self.locations) if movement_type in ['in', 'transfer'] else None
-            
-            movement = {
-                'id': generate_uuid(),
-                'movement_id': generate_uuid() if random.random() > 0.5 else None,
-                'sku': sku,
-                'location_from_id': location_from,
-                'location_from_type': 'warehouse' if location_from else None,
-                'location_to_id': location_to,
-                'location_to_type': 'warehouse' if location_to else None,
-                'quantity': random.randint(1, 500),
-                'balance_after': random.randint(0, 2000),
-                'movement_type': movement_type,
-                'reference': f"REF-{fake.random_number(digits=8, fix_len=True)}" if random.random() > 0.4 else None,
-                'user_id': generate_uuid() if random.random() > 0.3 else None,
-                'workspace_id': self.workspace_id,
-                'meta': None,
-                'created_at': random_date(-365, 0) + ' ' + fake.time(),
-                'processed_at': random_date(-365, 0) + ' ' + fake.time(),
-            }
-            
-            result.append(movement)
+        El ledger es secuencial (cada evento depende del saldo anterior), así que
+        se simula en este proceso aunque haya workers. Con `live` son movimientos
+        nuevos a partir del stock actual (ver faker_live.py).
+        """
+        if not len(self.ledger):
+            raise ValueError("Debe generar stock items primero")
         
-        return result
+        with _generation_lock:
+            self._seed_chunk('stock_movements:ledger', 0)
+            self.ledger.prepare(self.rng, count, self._pair_weights(), live)
+        
+        if self.rollups:
+            self.rollups.reset('stock_movements')
+        window_start = np.datetime64(run_clock() - timedelta(days=365), 's')
+        window = 365 * 86400
+        chunks = max((count + chunk_size - 1) // chunk_size, 1)
+        timeline = self.distributions.timeline('stock_movements', 'created_at', run_clock() - timedelta(days=365), 365)
+        
+        for index, start in enumerate(range(0, count, chunk_size)):
+            size = min(chunk_size, count - start)
+            with _generation_lock:
+                self._seed_chunk('stock_movements', self._chunk_number('stock_movements', index))
+                # Cada chunk cubre un tramo consecutivo de la ventana de un año
+                if timeline is None:
+                    created_at = window_start + np.sort(self.rng.integers(window * index // chunks, window * (index + 1) // chunks, size))
+                else:
+                    # Tramo consecutivo de cuantiles: los chunks de horas pico son más cortos en tiempo
+                    created_at = timeline.sample(self.rng, start / count, (start + size) / count, size)
+                chunk = self._stock_movements_chunk(start, size, created_at)
+            if self.rollups:
+                self.rollups.add_movements(chunk)
+            yield chunk
+    
+    def revert_movement(self, row):
+        """Saca del ledger un movimiento de iter_stock_movements(live=True) que no se aplicó en la BD.
+        
+        Los eventos siguientes ya generados se calcularon con el saldo anterior.
+        """
+        location_index = {location_id: i for i, location_id in enumerate(self.locations)}
+        with _generation_lock:
+            self.ledger.revert(row['sku'], location_index.get(row['location_from_id']),
+                               location_index.get(row['location_to_id']), row['quantity'])
+    
+    def _pair_weights(self):
+        """Peso de cada par del ledger (popularidad del SKU × de la ubicación), o None si ambos son uniformes"""
+        ledger = self.ledger
+        sku_index = {}
+        item_weights = None
+        if self.distributions.spec('stock_movements', 'items') is not None:
+            pair_skus = [sku_index.setdefault(sku, len(sku_index)) for sku in ledger.skus]
+            item_weights = self.popularity('stock_movements', 'items', len(sku_index))[pair_skus]
+        location_weights = self.popularity('stock_movements', 'locations', len(self.locations))
+        if location_weights is not None:
+            location_weights = location_weights[np.frombuffer(ledger.locations, dtype=np.int64)]
+        if item_weights is None:
+            return location_weights
+        return item_weights if location_weights is None else item_weights * location_weights
+    
+    def _stock_movements_chunk(self, start, size, created_at):
+        rng, plan = self.rng, self.plan
+        events = self.ledger.step(rng, start, size, plan.movement_p, self.distributions)
+        locations = self.locations
+        location_from = [locations[i] if i is not None else None for i in events['location_from']]
+        location_to = [locations[i] if i is not None else None for i in events['location_to']]
+        
+        # Procesado entre 0 y 48 h después, sin pasar del reloj de la corrida
+        processed_at = np.minimum(created_at + rng.integers(0, 172800, size), np.datetime64(run_clock(), 's'))
+        
+        return rows_from_columns({
+            'id': self._ids(size),
+            'movement_id': nullable(plan.present_mask(rng, 'stock_movements', 'movement_id', size), uuid_column(rng, size)),
+            'sku': events['sku'],
+            'location_from_id': location_from,
+            'location_from_type': ['warehouse' if l else None for l in location_from],
+            'location_to_id': location_to,
+            'location_to_type': ['warehouse' if l else None for l in location_to],
+            'quantity': events['quantity'],
+            'balance_after': events['balance_after'],
+            'movement_type': events['movement_type'],
+            'reference': nullable(plan.present_mask(rng, 'stock_movements', 'reference', size),
+                                  (f"REF-{n}" for n in number_column(rng, size, 8).tolist())),
+            'user_id': nullable(plan.present_mask(rng, 'stock_movements', 'user_id', size), uuid_column(rng, size)),
+            'workspace_id': [self.workspace_id] * size,
+            'meta': [json.dumps({'balance_after_to': after}) if after is not None else None
+                     for after in events['balance_after_to']],
+            'created_at': datetime_strings(created_at),
+            'processed_at': datetime_strings(processed_at),
+        })
+    
+    @timed_generation('stock_current')
+    def iter_stock_current(self, chunk_size=CHUNK_SIZE):
+        """Genera stock_current desde el ledger: un registro por (sku, location) con el saldo final"""
+        ledger = self.ledger
+        for index, start in enumerate(range(0, len(ledger), chunk_size)):
+            end = min(start + chunk_size, len(ledger))
+            size = end - start
+            with _generation_lock:
+                self._seed_chunk('stock_current', self._chunk_number('stock_current', index))
+                ids = self._ids(size)
+            created = now()
+            yield rows_from_columns({
+                'id': ids,
+                'sku': ledger.skus[start:end],
+                'location_id': [self.locations[l] for l in ledger.locations[start:end]],
+                'location_type': ['warehouse'] * size,
+                'quantity': ledger.quantities[start:end].tolist(),
+                'workspace_id': [self.workspace_id] * size,
+                'created_at': [created] * size,
+                'updated_at': [created] * size,
+            })
+    
+    def rollup_rows(self, table):
+        """Filas de una tabla rollup_* a partir de lo acumulado en StockRollups"""
+        build = {
+            'rollup_stock_by_location': self.rollups.location_rows,
+            'rollup_inventory_by_category': self.rollups.category_rows,
+            'rollup_movements_daily': self.rollups.daily_rows,
+            'rollup_kpi_snapshot': self.rollups.kpi_rows,
+        }[table]
+        return build(self.workspace_id)
+    
+    def rollup_sources(self):
+        """(tabla, callable) de stock_current y rollup_*; vacío si no se acumulan rollups"""
+        if not self.rollups:
+            return []
+        return [('stock_current', self.iter_stock_current)] + [
+            (table, functools.partial(self.rollup_rows, table)) for table in ROLLUP_TABLES
+        ]
+
+
+# Serializa la generación de chunks entre threads (ver VesselFaker._map_chunks)
+_generation_lock = threading.Lock()
+
+# Estado por proceso del pool de generación (ver VesselFaker._map_chunks)
+_worker_faker = None
+
+def _init_worker(state):
+    global _worker_faker
+    set_run_clock(state['run_now'])
+    _worker_faker = VesselFaker(workspace_id=state['workspace_id'], seed=state['seed'], text_pool=state['text_pool'],
+                                id_strategy=state['id_strategy'], distributions=state['distributions'],
+                                plan=state['plan'])
+    _worker_faker.vocabularies = state['vocabularies']
+    _worker_faker.terms = state['terms']
+    _worker_faker.locations = state['locations']
+    _worker_faker.items = state['items']
+
+def _run_chunk(task):
+    table, index, method, args = task
+    _worker_faker._seed_chunk(table, index)
+    return getattr(_worker_faker, method)(*args)
+
+
+# =====================================================
+# MULTI-WORKSPACE (--workspaces)
+# =====================================================
+
+WORKSPACE_LAYOUTS = ['clustered', 'interleaved']
+
+# Filas por chunk de cada workspace con layout interleaved: la granularidad
+# del intercalado (la salida se reagrupa en chunks de CHUNK_SIZE)
+INTERLEAVE_ROWS = 100
+
+def split_counts(weights, total, minimum=0):
+    """Reparte `total` en partes proporcionales a `weights` (restos mayores), con al menos `minimum` por parte"""
+    weights = np.asarray(weights, dtype=float)
+    free = total - minimum * len(weights)
+    if free < 0:
+        raise ValueError(f"{total:,} no alcanza para {len(weights):,} workspaces con al menos {minimum} cada uno")
+    if not weights.sum():
+        return [minimum] * len(weights)
+    shares = weights / weights.sum() * free
+    counts = np.floor(shares).astype(np.int64)
+    # Las unidades que sobran van a las partes con mayor resto
+    counts[np.argsort(counts - shares, kind='stable')[:free - int(counts.sum())]] += 1
+    return (counts + minimum).tolist()
+
+def split_capped(weights, total, caps):
+    """Como split_counts sin pasar de `caps`: lo que no entra se reparte entre las partes con lugar"""
+    caps = np.asarray(caps, dtype=np.int64)
+    counts = np.zeros(len(caps), dtype=np.int64)
+    weights = np.asarray(weights, dtype=float)
+    remaining = min(total, int(caps.sum()))
+    while remaining > 0:
+        room = (counts < caps) * weights
+        counts = np.minimum(counts + split_counts(room, remaining), caps)
+        remaining = min(total, int(caps.sum())) - int(counts.sum())
+    return counts.tolist()
+
+def chunk_layout(chunk_counts, layout):
+    """Número global de cada chunk de cada workspace según el orden de emisión.
+    
+    clustered: todos los chunks de un workspace y luego los del siguiente.
+    interleaved: round-robin, un chunk de cada workspace por vuelta.
+    """
+    numbers = [[] for _ in chunk_counts]
+    if layout == 'clustered':
+        position = 0
+        for index, count in enumerate(chunk_counts):
+            numbers[index] = list(range(position, position + count))
+            position += count
+        return numbers
+    
+    position, turn = 0, 0
+    active = [index for index, count in enumerate(chunk_counts) if count]
+    while active:
+        for index in active:
+            numbers[index].append(position)
+            position += 1
+        turn += 1
+        active = [index for index in active if chunk_counts[index] > turn]
+    return numbers
+
+class MultiWorkspaceFaker:
+    """Genera N workspaces de tamaños con cola pesada (Zipf) en una sola corrida.
+    
+    Expone la misma interfaz que VesselFaker, así las salidas (carga directa,
+    dumps, exports) no cambian. Cada workspace es un VesselFaker con su propia
+    semilla derivada; todos comparten el corpus de textos, el plan y la
+    numeración de chunks, que define semillas e IDs: con uuid7/sequential las
+    PKs siguen el orden de emisión (agrupado o intercalado por workspace).
+    
+    La taxonomía (vocabularios y términos) es una sola y compartida, con
+    workspace_id NULL: el slug de taxonomy_vocabularies es único global. Los
+    rollups, por la misma razón (PK sin workspace), son totales globales.
+    """
+    
+    def __init__(self, count, seed=None, workers=1, text_pool=None, id_strategy='uuid4', rollups=False,
+                 distributions=None, plan=None, skew=1.0, layout='clustered'):
+        if count < 1:
+            raise ValueError("Se necesita al menos 1 workspace")
+        if layout not in WORKSPACE_LAYOUTS:
+            raise ValueError(f"Layout no válido: {layout} (opciones: {', '.join(WORKSPACE_LAYOUTS)})")
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.workers = max(1, workers)
+        self.id_strategy = id_strategy
+        self.layout = layout
+        self.chunk_size = CHUNK_SIZE if layout == 'clustered' else INTERLEAVE_ROWS
+        self.workspace_id = None
+        self.plan = plan or ScenarioPlan()
+        self.text = text_pool or TextPool.load(seed if seed is not None else 0)
+        # Taxonomía compartida: la genera un faker propio y se copia a cada workspace
+        self.shared = VesselFaker(seed=self.seed, text_pool=self.text, id_strategy=id_strategy,
+                                  distributions=distributions, plan=self.plan)
+        self.workspaces = [
+            VesselFaker(seed=chunk_seed(self.seed, 'workspace', index), text_pool=self.text, id_strategy=id_strategy,
+                        distributions=distributions, plan=self.plan)
+            for index in range(count)
+        ]
+        self.weights = zipf_weights(np.random.default_rng(chunk_seed(self.seed, 'workspaces:sizes', 0)), count, skew)
+        self.rollups = StockRollups() if rollups else None
+        # (count, filas por workspace) de stock_items ya resueltos (ver plan_stock)
+        self.stock_sizes = None
+        self.stock_lock = threading.Lock()
+    
+    def _number_chunks(self, table, chunk_counts):
+        """Fija en cada workspace la numeración global de sus chunks de `table`"""
+        numbers = chunk_layout(chunk_counts, self.layout)
+        for faker, chunk_numbers in zip(self.workspaces, numbers):
+            faker.chunk_numbers[table] = chunk_numbers
+        return numbers
+    
+    def _chunks(self, table, streams, chunk_counts):
+        """Emite los chunks de cada workspace en el orden del layout, con su numeración global"""
+        numbers = self._number_chunks(table, chunk_counts)
+        for faker, chunk_numbers in zip(self.workspaces, numbers):
+            # Los pools de procesos solo se justifican en los workspaces grandes
+            faker.workers = self.workers if len(chunk_numbers) * self.chunk_size >= SPLIT_THRESHOLD else 1
+        
+        streams = [iter(stream) for stream in streams]
+        if self.layout == 'clustered':
+            for stream in streams:
+                yield from stream
+            return
+        # Una vuelta toma un chunk chico de cada workspace; se entregan reagrupados en chunks de CHUNK_SIZE
+        pending = []
+        while streams:
+            alive = []
+            for stream in streams:
+                chunk = next(stream, None)
+                if chunk is not None:
+                    alive.append(stream)
+                    pending += chunk
+                    if len(pending) >= CHUNK_SIZE:
+                        yield pending
+                        pending = []
+            streams = alive
+        if pending:
+            yield pending
+    
+    def _accumulate(self, table, chunks, add):
+        if self.rollups:
+            self.rollups.reset(table)
+        for chunk in chunks:
+            if self.rollups:
+                add(chunk)
+            yield chunk
+    
+    def _chunk_count(self, rows):
+        return (rows + self.chunk_size - 1) // self.chunk_size
+    
+    def generate_vocabularies(self):
+        rows = self.shared.generate_vocabularies()
+        for row in rows:
+            row['workspace_id'] = None
+        return rows
+    
+    def generate_terms(self, count_per_vocab=None):
+        rows = self.shared.generate_terms(count_per_vocab)
+        for row in rows:
+            row['workspace_id'] = None
+        for faker in self.workspaces:
+            faker.vocabularies, faker.terms = self.shared.vocabularies, self.shared.terms
+        if self.rollups:
+            self.rollups.add_terms(rows)
+        return rows
+    
+    def generate_locations(self, count=None):
+        count = self.plan.counts['locations'] if count is None else count
+        rows = []
+        for faker, size in zip(self.workspaces, split_counts(self.weights, count, minimum=1)):
+            rows += faker.generate_locations(count=size)
+        if self.rollups:
+            self.rollups.add_locations(rows)
+        return rows
+    
+    def iter_items(self, count=1000):
+        sizes = split_counts(self.weights, count, minimum=1)
+        streams = [faker.iter_items(size, self.chunk_size) for faker, size in zip(self.workspaces, sizes)]
+        chunks = self._chunks('catalog_items', streams, [self._chunk_count(size) for size in sizes])
+        return self._accumulate('catalog_items', chunks, lambda chunk: self.rollups.add_items(chunk))
+    
+    def iter_item_identifiers(self):
+        streams = [faker.iter_item_identifiers(chunk_size=self.chunk_size) for faker in self.workspaces]
+        counts = [self._chunk_count(len(faker.items)) for faker in self.workspaces]
+        return self._chunks('catalog_item_identifiers', streams, counts)
+    
+    def iter_item_terms(self):
+        streams = [faker.iter_item_terms(chunk_size=self.chunk_size) for faker in self.workspaces]
+        counts = [self._chunk_count(len(faker.items)) for faker in self.workspaces]
+        chunks = self._chunks('catalog_item_terms', streams, counts)
+        return self._accumulate('catalog_item_terms', chunks, lambda chunk: self.rollups.add_item_terms(chunk))
+    
+    def plan_stock(self, count):
+        """Reparte `count` stock items entre los workspaces y arma el ledger de cada uno.
+        
+        Cada workspace recibe su parte sin pasar de sus combinaciones sku × ubicación
+        (un SKU principal por item); lo que no entra en los chicos pasa a los que
+        tienen lugar. Retorna las filas de cada workspace.
+        """
+        with self.stock_lock:
+            if self.stock_sizes is not None and self.stock_sizes[0] == count:
+                return self.stock_sizes[1]
+            sizes = split_capped(self.weights, count, [len(faker.items) * len(faker.locations)
+                                                       for faker in self.workspaces])
+            if sum(sizes) < count:
+                print(f"⚠ Stock recortado a {sum(sizes):,} filas: no hay más pares sku/ubicación en los workspaces")
+            # Las semillas de los chunks dependen de la numeración global de cada tabla
+            self._number_chunks('catalog_item_identifiers', [self._chunk_count(len(faker.items))
+                                                             for faker in self.workspaces])
+            self._number_chunks('stock_items', [self._chunk_count(size) for size in sizes])
+            for faker, size in zip(self.workspaces, sizes):
+                faker.plan_stock(size, self.chunk_size)
+            self.stock_sizes = (count, sizes)
+            return sizes
+    
+    def iter_stock_items(self, count=5000):
+        sizes = self.plan_stock(count)
+        streams = [faker.iter_stock_items(size, self.chunk_size) for faker, size in zip(self.workspaces, sizes)]
+        chunks = self._chunks('stock_items', streams, [self._chunk_count(size) for size in sizes])
+        return self._accumulate('stock_items', chunks, lambda chunk: self.rollups.add_stock(chunk))
+    
+    def iter_stock_movements(self, count=10000):
+        # Solo workspaces con stock pueden tener kardex
+        weights = self.weights * np.array([len(faker.ledger) > 0 for faker in self.workspaces])
+        sizes = split_counts(weights, count)
+        streams = [faker.iter_stock_movements(size, self.chunk_size) if size else iter(())
+                   for faker, size in zip(self.workspaces, sizes)]
+        chunks = self._chunks('stock_movements', streams, [self._chunk_count(size) for size in sizes])
+        return self._accumulate('stock_movements', chunks, lambda chunk: self.rollups.add_movements(chunk))
+    
+    def iter_stock_current(self):
+        streams = [faker.iter_stock_current(self.chunk_size) for faker in self.workspaces]
+        counts = [self._chunk_count(len(faker.ledger)) for faker in self.workspaces]
+        return self._chunks('stock_current', streams, counts)
+    
+    def generate_items(self, count=1000):
+        return [row for chunk in self.iter_items(count) for row in chunk]
+    
+    def generate_item_identifiers(self, items=None):
+        return [row for chunk in self.iter_item_identifiers() for row in chunk]
+    
+    def generate_item_terms(self, items=None):
+        return [row for chunk in self.iter_item_terms() for row in chunk]
+    
+    def generate_stock_items(self, count=5000):
+        return [row for chunk in self.iter_stock_items(count) for row in chunk]
+    
+    def generate_stock_movements(self, count=10000):
+        return [row for chunk in self.iter_stock_movements(count) for row in chunk]
+    
+    # Las mismas tablas que VesselFaker, sobre los agregados globales de todos los workspaces
+    rollup_rows = VesselFaker.rollup_rows
+    rollup_sources = VesselFaker.rollup_sources
+    
+    def describe(self):
+        """Resumen del reparto de tamaños (ítems por workspace)"""
+        items = sorted((len(faker.items) for faker in self.workspaces), reverse=True)
+        top = max(len(items) // 100, 1)
+        return (f"{len(items):,} workspaces ({self.layout}): mayor {items[0]:,} items, "
+                f"mediana {items[len(items) // 2]:,}, menor {items[-1]:,}; "
+                f"el top {top} concentra {sum(items[:top]) / max(sum(items), 1):.0%}")
+
+
+# =====================================================
+# PARTICIONES (--partition-movements)
+# =====================================================
+
+# Partición de desborde para movimientos posteriores a la ventana
+PARTITION_MAXVALUE = 'pmax'
+
+def month_partitions(start, end):
+    """Particiones mensuales que cubren [start, end]: [('p202401', '2024-02-01'), ...] (nombre, límite exclusivo)"""
+    partitions = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        name = f"p{year:04d}{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        partitions.append((name, f"{year:04d}-{month:02d}-01"))
+    return partitions
+
+
+def movement_partitions():
+    """Particiones de la ventana de stock_movements (último año hasta el reloj de la corrida)"""
+    return month_partitions(run_clock() - timedelta(days=365), run_clock())
+
+
+def partition_movements_ddl(partitions, table='stock_movements'):
+    """Sentencias que convierten `table` en RANGE por mes sobre created_at.
+    
+    MySQL exige que la columna de particionado forme parte de toda clave
+    única, así que la PK pasa a ser (id, created_at). La primera partición
+    recibe también lo anterior a la ventana y pmax lo posterior.
+    """
+    definitions = ',\n    '.join(
+        f"PARTITION `{name}` VALUES LESS THAN (TO_DAYS('{bound}'))" for name, bound in partitions
+    )
+    return [
+        f"ALTER TABLE `{table}` MODIFY `created_at` DATETIME NOT NULL, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (`id`, `created_at`)",
+        f"ALTER TABLE `{table}` PARTITION BY RANGE (TO_DAYS(`created_at`)) (\n    {definitions},\n"
+        f"    PARTITION `{PARTITION_MAXVALUE}` VALUES LESS THAN MAXVALUE\n)",
+    ]
+
+
+class PartitionChunk(list):
+    """Chunk de filas que caen todas en la partición `partition` (los slices la conservan)"""
+    
+    def __init__(self, rows, partition):
+        super().__init__(rows)
+        self.partition = partition
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PartitionChunk(list.__getitem__(self, index), self.partition)
+        return list.__getitem__(self, index)
+
+
+def iter_partition_chunks(chunks, partitions, column='created_at'):
+    """Reagrupa un iterable de chunks en PartitionChunk de un solo mes.
+    
+    Los movimientos salen ordenados por fecha, así que cada chunk se corta a
+    lo sumo en un cambio de mes y los datos son los mismos que sin particiones.
+    """
+    bounds = [bound for _, bound in partitions]
+    names = [name for name, _ in partitions] + [PARTITION_MAXVALUE]
+    for chunk in chunks:
+        groups = {}
+        for row in chunk:
+            # 'YYYY-MM-DD HH:MM:SS' se compara bien como texto contra 'YYYY-MM-01'
+            index = bisect.bisect_right(bounds, str(row[column]))
+            groups.setdefault(index, []).append(row)
+        for index in sorted(groups):
+            yield PartitionChunk(groups[index], names[index])
+
+
+def apply_partitioning(cursor, partitions, table='stock_movements'):
+    """Particiona `table` por mes (con datos existentes, MySQL los redistribuye)"""
+    print(f"🗂 Particionando {table} por mes ({len(partitions) + 1} particiones)...")
+    for statement in partition_movements_ddl(partitions, table):
+        cursor.execute(statement)
 
 
 # =====================================================
 # OUTPUT FORMATTERS
 # =====================================================
 
-def to_sql_insert(table, data):
-    """Convierte datos a sentencias INSERT SQL"""
-    if not data:
-        return ""
+# Comilla duplicada ('') como en SQL estándar; la barra invertida se duplica porque
+# el dump corre sin NO_BACKSLASH_ESCAPES (lo fija SqlDumpWriter.header)
+_SQL_ESCAPES = str.maketrans({"'": "''", '\\': '\\\\'})
+
+def to_sql_value(val):
+    """Serializa un valor como literal SQL de MySQL"""
+    if val is None:
+        return 'NULL'
+    if isinstance(val, bool):
+        return '1' if val else '0'
+    if isinstance(val, (int, float)):
+        return str(val)
+    if isinstance(val, (dict, list)):
+        val = json.dumps(val, ensure_ascii=False)
+    return f"'{str(val).translate(_SQL_ESCAPES)}'"
+
+
+class SqlDumpWriter:
+    """Escribe un dump SQL en streaming sobre un archivo binario.
     
-    columns = data[0].keys()
-    col_str = ', '.join(f'`{c}`' for c in columns)
+    Cada INSERT multi-fila se arma fila a fila y se corta por bytes para no
+    superar `max_packet` (el max_allowed_packet del servidor que lo va a
+    reproducir). Con `transaction_size` > 0 el dump desactiva UNIQUE_CHECKS y
+    AUTOCOMMIT y hace COMMIT cada `transaction_size` sentencias.
+    """
     
-    values = []
-    for row in data:
-        row_values = []
-        for col in columns:
-            val = row[col]
-            if val is None:
-                row_values.append('NULL')
-            elif isinstance(val, (int, float)):
-                row_values.append(str(val))
-            else:
-                escaped = str(val).replace("'", "''")
-                row_values.append(f"'{escaped}'")
-        values.append(f"({', '.join(row_values)})")
+    # Margen para el resto del paquete (cabecera del protocolo, ";")
+    PACKET_MARGIN = 1024
+    
+    def __init__(self, f, max_packet=DEFAULT_MAX_PACKET, transaction_size=0):
+        self.f = f
+        self.max_packet = max_packet
+        self.transaction_size = transaction_size
+        self.statements = 0
+        self.bytes = 0
+    
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.f.write(data)
+        self.bytes += len(data)
+    
+    def header(self, title='VESSEL CATALOG - FAKE DATA'):
+        self.write("-- =====================================================\n")
+        self.write(f"-- {title}\n")
+        self.write(f"-- Generated: {now()}\n")
+        self.write("-- =====================================================\n\n")
+        self.write("SET NAMES utf8mb4;\n")
+        # Los literales escapan la barra invertida como \\ (ver to_sql_value): con
+        # NO_BACKSLASH_ESCAPES en el servidor se cargarían duplicadas
+        self.write("SET SESSION sql_mode = REPLACE(@@SESSION.sql_mode, 'NO_BACKSLASH_ESCAPES', '');\n")
+        self.write("SET FOREIGN_KEY_CHECKS = 0;\n")
+        if self.transaction_size:
+            self.write("SET UNIQUE_CHECKS = 0;\n")
+            self.write("SET AUTOCOMMIT = 0;\n")
+        self.write("\n")
+    
+    def footer(self):
+        if self.transaction_size:
+            self.write("COMMIT;\n")
+            self.write("SET UNIQUE_CHECKS = 1;\n")
+            self.write("SET AUTOCOMMIT = 1;\n")
+        self.write("SET FOREIGN_KEY_CHECKS = 1;\n")
+        self.write("-- END OF DATA\n")
+    
+    def comment(self, text):
+        self.write(f"-- {text}\n")
+    
+    def write_table(self, table, data):
+        """Escribe los INSERT de una tabla a medida que llegan los chunks. Retorna filas escritas"""
+        self._start_table(table)
+        total = 0
+        prefix = None
+        rows, size = [], 0
+        limit = self.max_packet - self.PACKET_MARGIN
+        
+        written = self.bytes
+        
+        for batch in iter_batches(data):
+            started = time.perf_counter()
+            if prefix is None:
+                columns = list(batch[0].keys())
+                prefix = f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in columns)}) VALUES\n".encode('utf-8')
+                size = len(prefix)
+            
+            for row in batch:
+                value = f"({', '.join(to_sql_value(row[c]) for c in columns)})".encode('utf-8')
+                # 2 bytes del separador ",\n"
+                if rows and size + len(value) + 2 > limit:
+                    self._flush_insert(prefix, rows)
+                    rows, size = [], len(prefix)
+                rows.append(value)
+                size += len(value) + 2
+            total += len(batch)
+            metrics.add(table, 'serialize', time.perf_counter() - started)
+        
+        with metrics.timer(table, 'serialize') as counts:
+            if rows:
+                self._flush_insert(prefix, rows)
+            self._end_table()
+            counts['bytes'] = self.bytes - written
+        return total
+    
+    def _start_table(self, table):
+        pass
+    
+    def _end_table(self):
+        self.write("\n")
     
-    # Batch inserts (1000 por batch)
-    result = []
-    batch_size = 1000
-    for i in range(0, len(values), batch_size):
-        batch = values[i:i + batch_size]
-        result.append(f"INSERT INTO `{table}` ({col_str}) VALUES\n" + ',\n'.join(batch) + ';')
+    def _flush_insert(self, prefix, rows):
+        data = prefix + b',\n'.join(rows) + b';\n'
+        self.f.write(data)
+        self.bytes += len(data)
+        self.statements += 1
+        if self.transaction_size and self.statements % self.transaction_size == 0:
+            self.write("COMMIT;\n")
+        self._statement_written(len(rows))
     
-    return '\n\n'.join(result)
+    def _statement_written(self, rows):
+        pass
 
 
-def batch_insert(cursor, table, data, batch_size=1000):
-    """Inserta datos en batches directamente en la BD"""
-    if not data:
-        return 0
+class SplitSqlDumpWriter(SqlDumpWriter):
+    """SqlDumpWriter que escribe cada tabla en sus propios archivos dentro de un DumpDirectory.
     
-    columns = list(data[0].keys())
-    col_str = ', '.join(f'`{c}`' for c in columns)
-    placeholders = ', '.join(['%s'] * len(columns))
+    Cada parte lleva su cabecera y pie (SET NAMES, FOREIGN_KEY_CHECKS, ...), así
+    que se puede cargar sola y en paralelo con las demás. Con `split_bytes` una
+    tabla se corta en varias partes de ~ese tamaño (sin comprimir).
+    """
+    
+    def __init__(self, directory, max_packet=DEFAULT_MAX_PACKET, transaction_size=0, split_bytes=0):
+        super().__init__(None, max_packet=max_packet, transaction_size=transaction_size)
+        self.directory = directory
+        self.split_bytes = split_bytes
+        self.table = None
+        self.part_rows = 0
+    
+    def header(self, title='VESSEL CATALOG - FAKE DATA'):
+        self.title = title
+    
+    def footer(self):
+        pass
+    
+    def comment(self, text):
+        # El nombre de cada parte ya indica la tabla
+        pass
+    
+    def _open_part(self):
+        self.f = self.directory.open_part(self.table, 'sql')
+        self.part_rows = 0
+        SqlDumpWriter.header(self, f"{self.title} - {self.table}")
+    
+    def _close_part(self):
+        SqlDumpWriter.footer(self)
+        self.directory.close_part(self.f, self.table, self.part_rows)
+        self.f = None
+    
+    def _start_table(self, table):
+        self.table = table
+        self._open_part()
+    
+    def _end_table(self):
+        self._close_part()
+    
+    def _statement_written(self, rows):
+        self.part_rows += rows
+        if self.split_bytes and self.f.bytes >= self.split_bytes:
+            self._close_part()
+            self._open_part()
+
+
+class _HashingWriter:
+    """Escribe en un archivo contando bytes y calculando el sha256 de lo que llega a disco"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.raw.write(data)
+    
+    def flush(self):
+        self.raw.flush()
+
+
+class OutputFile:
+    """Archivo de salida binario con compresión en streaming (gzip/zstd).
     
-    sql = f"INSERT INTO `{table}` ({col_str}) VALUES ({placeholders})"
+    `bytes` cuenta lo escrito sin comprimir; `compressed_bytes` y `sha256()`
+    corresponden al archivo en disco (para verificar cada parte de un dump).
+    """
+    
+    def __init__(self, path, compression='none'):
+        if compression == 'zstd' and not HAS_ZSTD:
+            raise ValueError("La compresión zstd requiere: pip install zstandard")
+        self.path = path
+        self.compression = compression
+        self.raw = open(path, 'wb', buffering=SQL_WRITE_BUFFER)
+        self.disk = _HashingWriter(self.raw)
+        if compression == 'gzip':
+            # mtime=0 y sin nombre: misma semilla = mismo .gz
+            self.stream = gzip.GzipFile(filename='', mode='wb', compresslevel=6, fileobj=self.disk, mtime=0)
+        elif compression == 'zstd':
+            self.stream = zstandard.ZstdCompressor(level=3).stream_writer(self.disk, closefd=False)
+        else:
+            self.stream = self.disk
+        self.bytes = 0
+    
+    def write(self, data):
+        self.bytes += len(data)
+        return self.stream.write(data)
+    
+    def tell(self):
+        return self.bytes
+    
+    def flush(self):
+        pass
+    
+    @property
+    def closed(self):
+        return self.raw.closed
+    
+    def close(self):
+        if self.closed:
+            return
+        if self.stream is not self.disk:
+            self.stream.close()
+        self.raw.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @property
+    def compressed_bytes(self):
+        return self.disk.bytes
+    
+    def sha256(self):
+        return self.disk.sha256.hexdigest()
+
+
+class DumpDirectory:
+    """Directorio con un dump partido en archivos y su manifest.json.
+    
+    El manifest lista cada parte con su tabla, filas, tamaño y sha256, más
+    las dependencias entre tablas (TABLE_DEPENDENCIES): las partes de tablas
+    sin dependencias pendientes se pueden cargar en paralelo.
+    """
+    
+    MANIFEST = 'manifest.json'
+    
+    def __init__(self, path, compression='none', **meta):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.compression = compression
+        self.meta = meta
+        self.parts = []
+        self.part_counts = {}
+    
+    def open_part(self, table, extension, compressed=True):
+        """Abre la siguiente parte de `table`; con compressed=False el formato comprime internamente"""
+        number = self.part_counts.get(table, 0) + 1
+        self.part_counts[table] = number
+        compression = self.compression if compressed else 'none'
+        name = f"{len(self.parts) + 1:04d}_{table}_{number:03d}.{extension}{COMPRESSIONS[compression]}"
+        return OutputFile(os.path.join(self.path, name), compression)
+    
+    def close_part(self, f, table, rows):
+        f.close()
+        self.parts.append({
+            'file': os.path.basename(f.path),
+            'table': table,
+            'rows': rows,
+            'bytes': f.bytes,
+            'compressed_bytes': f.compressed_bytes,
+            'sha256': f.sha256(),
+        })
+    
+    def write_manifest(self):
+        manifest = {
+            'generated': now(),
+            'compression': self.compression,
+            **self.meta,
+            'depends_on': {table: deps for table, deps in TABLE_DEPENDENCIES.items() if table in self.part_counts},
+            'parts': self.parts,
+        }
+        with open(os.path.join(self.path, self.MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return manifest
+
+
+def verify_manifest(path):
+    """Verifica el sha256 de cada parte de un DumpDirectory. Retorna las partes con error"""
+    with open(os.path.join(path, DumpDirectory.MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    failed = []
+    for part in manifest['parts']:
+        digest = hashlib.sha256()
+        try:
+            with open(os.path.join(path, part['file']), 'rb') as f:
+                for block in iter(lambda: f.read(SQL_WRITE_BUFFER), b''):
+                    digest.update(block)
+        except FileNotFoundError:
+            failed.append(part['file'])
+            continue
+        if digest.hexdigest() != part['sha256']:
+            failed.append(part['file'])
+    return failed
+
+
+def batch_insert(cursor, table, data, batch_size=1000, ignore=False):
+    """Inserta datos en batches directamente en la BD (lista de filas o iterable de chunks).
+    
+    Con ignore=True usa INSERT IGNORE (reintento de un chunk que quizás ya se commiteó).
+    Los PartitionChunk se insertan con PARTITION (...) en su partición.
+    """
+    statements = {}
+    columns = None
     
     total = 0
-    for i in range(0, len(data), batch_size):
-        batch = data[i:i + batch_size]
-        values = [tuple(row[col] for col in columns) for row in batch]
-        cursor.executemany(sql, values)
+    for batch in iter_batches(data, batch_size):
+        if columns is None:
+            columns = list(batch[0].keys())
+        partition = getattr(batch, 'partition', None)
+        sql = statements.get(partition)
+        if sql is None:
+            col_str = ', '.join(f'`{c}`' for c in columns)
+            placeholders = ', '.join(['%s'] * len(columns))
+            target = f"`{table}` PARTITION (`{partition}`)" if partition else f"`{table}`"
+            sql = statements[partition] = f"INSERT {'IGNORE ' if ignore else ''}INTO {target} ({col_str}) VALUES ({placeholders})"
+        
+        with metrics.timer(table, 'serialize'):
+            values = [tuple(row[col] for col in columns) for row in batch]
+        with metrics.timer(table, 'db'):
+            cursor.executemany(sql, values)
         total += len(batch)
         
-        if total % 10000 == 0:
-            print(f"   ... {total:,} registros insertados")
+        # Avisar cada vez que se cruza un múltiplo de 10.000 (los batches no siempre son de 1000)
+        if total // 10000 > (total - len(batch)) // 10000:
+            print(f"   ... {total:,} registros insertados en {table}")
     
     return total
 
 
-def insert_direct_to_db(faker, host, port, user, password, database,
-                        items_count=1000, locations_count=50, stock_count=3000, 
-                        movements_count=5000, clean_tables=False, only_movements=False):
-    """Inserta datos directamente en MySQL"""
+# Escapes del formato por defecto de LOAD DATA (FIELDS ESCAPED BY '\\')
+_INFILE_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+def to_infile_value(val):
+    """Serializa un valor para un archivo TSV de LOAD DATA (NULL como \\N)"""
+    if val is None:
+        return '\\N'
+    if isinstance(val, (dict, list)):
+        val = json.dumps(val, ensure_ascii=False)
+    return str(val).translate(_INFILE_ESCAPES)
+
+
+def _write_infile(path, table, batches, columns, first_batch, counter, cancel=None):
+    with open(path, 'wb') as f:
+        batch = first_batch
+        while batch is not None and not (cancel and cancel.is_set()):
+            with metrics.timer(table, 'serialize') as counts:
+                data = ''.join(
+                    '\t'.join(to_infile_value(row[col]) for col in columns) + '\n'
+                    for row in batch
+                ).encode('utf-8')
+                f.write(data)
+                counts['bytes'] = len(data)
+            counter[0] += len(batch)
+            batch = next(batches, None)
+
+
+def infile_insert(cursor, table, data, pipe=False, partition=None):
+    """Inserta datos con LOAD DATA LOCAL INFILE, volcándolos a un TSV temporal.
     
-    print(f"🔌 Conectando a {host}:{port}/{database}...")
+    Con pipe=True (solo POSIX) los datos se escriben a un named pipe desde un
+    thread mientras el servidor los lee, sin tocar disco. Con `partition` el
+    LOAD DATA se restringe a esa partición.
+    """
+    batches = iter_batches(data)
+    first_batch = next(batches, None)
+    if first_batch is None:
+        return 0
+    
+    columns = list(first_batch[0].keys())
+    col_str = ', '.join(f'`{c}`' for c in columns)
+    counter = [0]
+    pipe = pipe and hasattr(os, 'mkfifo')
+    
+    tmp_dir = tempfile.mkdtemp(prefix='vessel_infile_')
+    path = os.path.join(tmp_dir, f'{table}.tsv')
+    sql = (
+        f"LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}' INTO TABLE `{table}` "
+        f"{f'PARTITION (`{partition}`) ' if partition else ''}"
+        "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+        f"LINES TERMINATED BY '\\n' ({col_str})"
+    )
     
+    try:
+        if not pipe:
+            _write_infile(path, table, batches, columns, first_batch, counter)
+            with metrics.timer(table, 'db'):
+                cursor.execute(sql)
+            return counter[0]
+        
+        os.mkfifo(path)
+        errors = []
+        cancel = threading.Event()
+        
+        def writer():
+            try:
+                _write_infile(path, table, batches, columns, first_batch, counter, cancel)
+            except Exception as e:
+                errors.append(e)
+        
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        try:
+            # Incluye la espera al writer: con el pipe servidor y generación se solapan
+            with metrics.timer(table, 'db'):
+                cursor.execute(sql)
+        except Exception:
+            # El servidor no leyó el pipe: cancelar y drenarlo para liberar al writer
+            cancel.set()
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                while thread.is_alive():
+                    try:
+                        if not os.read(fd, 1 << 16):
+                            thread.join(0.05)
+                    except BlockingIOError:
+                        thread.join(0.05)
+            finally:
+                os.close(fd)
+            raise
+        thread.join()
+        
+        if errors:
+            raise errors[0]
+        return counter[0]
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        os.rmdir(tmp_dir)
+
+
+def sql_statements(path):
+    """Lee un archivo .sql y retorna sus sentencias, sin comentarios '--'"""
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f if not line.lstrip().startswith('--')]
+    return [statement.strip() for statement in ''.join(lines).split(';') if statement.strip()]
+
+
+def apply_sql_file(cursor, path):
+    """Ejecuta todas las sentencias de un archivo .sql (schema, vistas, ...)"""
+    for statement in sql_statements(path):
+        cursor.execute(statement)
+
+
+def insert_with_loader(cursor, table, data, loader='executemany', ignore=False):
+    """Inserta datos con el loader elegido (executemany, infile o infile-pipe)"""
+    # LOAD DATA LOCAL ya ignora las claves duplicadas
+    if loader in ('infile', 'infile-pipe'):
+        # Un LOAD DATA por tramo de chunks de la misma partición (uno solo sin particiones)
+        groups = itertools.groupby(iter_batches(data), key=lambda batch: getattr(batch, 'partition', None))
+        return sum(
+            infile_insert(cursor, table, batches, pipe=loader == 'infile-pipe', partition=partition)
+            for partition, batches in groups
+        )
+    return batch_insert(cursor, table, data, ignore=ignore)
+
+
+def report_load(table, total, elapsed, loader, writers=1):
+    # Incluye el tiempo de generación: las tablas grandes se generan en streaming
+    rate = total / elapsed if elapsed > 0 else 0
+    via = f"{loader}, {writers} conexiones" if writers > 1 else loader
+    print(f"     {table}: {total:,} filas en {elapsed:.2f}s ({rate:,.0f} filas/s, {via})")
+
+
+def load_table(conn, cursor, table, data, loader='executemany', checkpoint=None):
+    """Carga una tabla con el loader elegido, hace commit e informa filas/s.
+    
+    Con `checkpoint` hace commit por chunk y salta los ya cargados (ver LoadCheckpoint).
+    """
+    started = time.perf_counter()
+    if checkpoint:
+        total = insert_checkpointed(conn, cursor, table, checkpoint.chunks(table, data), checkpoint, loader)
+        checkpoint.finish(table)
+    else:
+        total = insert_with_loader(cursor, table, data, loader)
+        conn.commit()
+    report_load(table, total, time.perf_counter() - started, loader)
+    return total
+
+
+def connect_db(host, port, user, password, database, loader='executemany'):
+    """Abre una conexión con la sesión preparada para carga masiva"""
     conn = mysql.connector.connect(
         host=host,
         port=port,
         user=user,
         password=password,
         database=database,
-        charset='utf8mb4'
+        charset='utf8mb4',
+        allow_local_infile=loader.startswith('infile')
     )
     cursor = conn.cursor()
     
@@ -523,6 +2901,262 @@ def insert_direct_to_db(faker, host, port, user, password, database,
     cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
     cursor.execute("SET UNIQUE_CHECKS = 0")
     cursor.execute("SET AUTOCOMMIT = 0")
+    cursor.close()
+    return conn
+
+
+# =====================================================
+# CHECKPOINTS (cargas reanudables)
+# =====================================================
+
+def _to_ranges(indices):
+    """{0, 1, 2, 5} -> [[0, 2], [5, 5]]"""
+    ranges = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ranges
+
+def _from_ranges(ranges):
+    return {index for start, end in ranges for index in range(start, end + 1)}
+
+
+class LoadCheckpoint:
+    """Archivo de estado de una carga directa reanudable.
+    
+    Guarda los parámetros de generación (semilla, reloj, conteos, ...) y por
+    tabla los chunks ya commiteados. Como cada chunk tiene su propia semilla,
+    --resume regenera exactamente los mismos datos y solo inserta los chunks
+    que faltan. Un chunk se marca 'pending' antes de su commit: si la corrida
+    se cae justo ahí, al reanudar se reintenta con INSERT IGNORE.
+    """
+    
+    def __init__(self, path, params):
+        self.path = path
+        self.params = params
+        self.tables = {}
+        self.completed = False
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        checkpoint = cls(path, state['params'])
+        checkpoint.completed = state.get('completed', False)
+        checkpoint.tables = {
+            table: {
+                'committed': _from_ranges(info['committed']),
+                'pending': set(info['pending']),
+                'done': info['done'],
+            }
+            for table, info in state['tables'].items()
+        }
+        return checkpoint
+    
+    def save(self):
+        state = {
+            'params': self.params,
+            'completed': self.completed,
+            'tables': {
+                table: {
+                    'committed': _to_ranges(info['committed']),
+                    'pending': sorted(info['pending']),
+                    'done': info['done'],
+                }
+                for table, info in self.tables.items()
+            },
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, self.path)
+    
+    def _table(self, table):
+        return self.tables.setdefault(table, {'committed': set(), 'pending': set(), 'done': False})
+    
+    def is_done(self, table):
+        return self._table(table)['done']
+    
+    def chunks(self, table, data):
+        """Numera los chunks de `data`; los ya commiteados se generan (para el estado del faker) pero no se cargan.
+        
+        Retorna (index, chunk, reintento) solo para los chunks que faltan.
+        """
+        info = self._table(table)
+        skipped = 0
+        for index, chunk in enumerate(iter_batches(data)):
+            if index in info['committed']:
+                skipped += len(chunk)
+                continue
+            yield index, chunk, index in info['pending']
+        if skipped:
+            print(f"   ↷ {table}: {skipped:,} filas ya cargadas (checkpoint)")
+    
+    def begin(self, table, index):
+        with self.lock:
+            self._table(table)['pending'].add(index)
+            self.save()
+    
+    def commit(self, table, index):
+        with self.lock:
+            info = self._table(table)
+            info['pending'].discard(index)
+            info['committed'].add(index)
+            self.save()
+    
+    def finish(self, table):
+        with self.lock:
+            self._table(table)['done'] = True
+            self.save()
+    
+    def finish_load(self):
+        with self.lock:
+            self.completed = True
+            self.save()
+
+
+def insert_checkpointed(conn, cursor, table, chunks, checkpoint, loader='executemany'):
+    """Inserta (index, chunk, reintento) de LoadCheckpoint.chunks con un commit por chunk"""
+    total = 0
+    for index, chunk, retry in chunks:
+        checkpoint.begin(table, index)
+        total += insert_with_loader(cursor, table, chunk, loader, ignore=retry)
+        conn.commit()
+        checkpoint.commit(table, index)
+    return total
+
+
+def _shared_chunks(chunks, lock):
+    """Reparte un iterable de chunks entre varios writers (cada chunk va a uno solo)"""
+    while True:
+        with lock:
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _load_graph_task(pool, table, source, expected, loader, max_writers, checkpoint=None):
+    conns = [pool.get()]
+    # Tablas grandes: sumar las conexiones libres en este momento como writers extra
+    if expected >= SPLIT_THRESHOLD:
+        while len(conns) < max_writers:
+            try:
+                conns.append(pool.get_nowait())
+            except queue.Empty:
+                break
+    
+    try:
+        print(f"  → {table} ({expected:,})")
+        started = time.perf_counter()
+        data = source()
+        if checkpoint:
+            data = checkpoint.chunks(table, data)
+        
+        def insert(conn, cursor, chunks):
+            if checkpoint:
+                return insert_checkpointed(conn, cursor, table, chunks, checkpoint, loader)
+            count = insert_with_loader(cursor, table, chunks, loader)
+            conn.commit()
+            return count
+        
+        if len(conns) == 1:
+            cursor = conns[0].cursor()
+            try:
+                total = insert(conns[0], cursor, data)
+            finally:
+                cursor.close()
+        else:
+            lock = threading.Lock()
+            chunks = iter(data)
+            
+            def writer(conn):
+                cursor = conn.cursor()
+                try:
+                    return insert(conn, cursor, _shared_chunks(chunks, lock))
+                finally:
+                    cursor.close()
+            
+            with ThreadPoolExecutor(max_workers=len(conns)) as writers:
+                total = sum(writers.map(writer, conns))
+        
+        if checkpoint:
+            checkpoint.finish(table)
+        report_load(table, total, time.perf_counter() - started, loader, len(conns))
+        return total
+    finally:
+        for conn in conns:
+            pool.put(conn)
+
+
+def run_load_graph(connections, sources, loader='executemany', checkpoint=None):
+    """Carga tablas en paralelo sobre un pool de conexiones respetando TABLE_DEPENDENCIES.
+    
+    `sources` mapea tabla -> (callable que retorna los datos, filas esperadas).
+    Las tablas independientes se cargan a la vez y las grandes se reparten en
+    varios writers, así el tiempo total lo marca la tabla más grande.
+    Retorna las filas insertadas por tabla.
+    """
+    pool = queue.Queue()
+    for conn in connections:
+        pool.put(conn)
+    
+    pending = dict(sources)
+    totals = {}
+    running = {}
+    
+    with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+        try:
+            while pending or running:
+                ready = [
+                    table for table in pending
+                    if all(dep in totals or dep not in sources for dep in TABLE_DEPENDENCIES[table])
+                ]
+                for table in ready:
+                    source, expected = pending.pop(table)
+                    future = executor.submit(_load_graph_task, pool, table, source, expected, loader, len(connections),
+                                             checkpoint)
+                    running[future] = table
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    totals[running.pop(future)] = future.result()
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    
+    return totals
+
+
+def insert_direct_to_db(faker, host, port, user, password, database,
+                        items_count=1000, locations_count=50, stock_count=3000, 
+                        movements_count=5000, clean_tables=False, only_movements=False,
+                        loader='executemany', connections=1, checkpoint=None, partition_movements=False):
+    """Inserta datos directamente en MySQL, generando e insertando cada tabla en streaming.
+    
+    Con connections > 1 las tablas sin dependencias entre sí se cargan en
+    paralelo (ver run_load_graph). Con `checkpoint` cada chunk se commitea por
+    separado y una corrida reanudada continúa donde quedó (ver LoadCheckpoint).
+    Con `partition_movements` stock_movements se particiona por mes y cada
+    chunk mensual se carga directo en su partición.
+    """
+    
+    print(f"🔌 Conectando a {host}:{port}/{database}...")
+    
+    conn = connect_db(host, port, user, password, database, loader)
+    extra_conns = []
+    cursor = conn.cursor()
+    
+    partitions = movement_partitions() if partition_movements else None
+    
+    def movements():
+        if not only_movements:
+            faker.plan_stock(stock_count)
+        chunks = faker.iter_stock_movements(count=movements_count)
+        return iter_partition_chunks(chunks, partitions) if partitions else chunks
     
     try:
         # Modo solo movements - usa locations existentes de la BD
@@ -535,20 +3169,28 @@ def insert_direct_to_db(faker, host, port, user, password, database,
             if not faker.locations:
                 raise ValueError("No hay ubicaciones en la BD. Ejecuta primero sin --only-movements")
             
-            print(f"Generando {movements_count:,} movimientos...")
-            movements = faker.generate_stock_movements(count=movements_count)
+            # El kardex se concilia contra el stock actual de la BD
+            print("📦 Cargando stock items existentes de la BD...")
+            faker.load_ledger(cursor)
+            print(f"   Encontrados {len(faker.ledger):,} stock items")
             
-            print(f"\n📥 Insertando {len(movements):,} movimientos...")
-            batch_insert(cursor, 'stock_movements', movements)
-            conn.commit()
+            if partitions and not (checkpoint and checkpoint.tables):
+                apply_partitioning(cursor, partitions)
+            
+            print(f"\n📥 Generando e insertando {movements_count:,} movimientos...")
+            total_movements = load_table(conn, cursor, 'stock_movements', movements(), loader, checkpoint)
             
             cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
             cursor.execute("SET UNIQUE_CHECKS = 1")
+            if checkpoint:
+                checkpoint.finish_load()
             
-            print(f"\n✅ Insertados {len(movements):,} movimientos!")
+            print(f"\n✅ Insertados {total_movements:,} movimientos!")
             return
         
-        if clean_tables:
+        if clean_tables and checkpoint and checkpoint.tables:
+            print("⚠ Reanudando desde checkpoint: se omite --clean")
+        elif clean_tables:
             print("🧹 Limpiando tablas...")
             tables_to_clean = [
                 'stock_movements', 'stock_items', 'stock_current', 'stock_batches',
@@ -557,6 +3199,8 @@ def insert_direct_to_db(faker, host, port, user, password, database,
                 'locations_locations', 'locations_addresses',
                 'taxonomy_vocabularies'
             ]
+            if faker.rollups:
+                tables_to_clean += ROLLUP_TABLES
             for table in tables_to_clean:
                 try:
                     cursor.execute(f"TRUNCATE TABLE `{table}`")
@@ -565,216 +3209,479 @@ def insert_direct_to_db(faker, host, port, user, password, database,
                     print(f"   ⚠ {table}: {e}")
             conn.commit()
         
-        print("Generando vocabularios...")
-        vocabularies = faker.generate_vocabularies()
-        
-        print("Generando términos...")
-        terms = faker.generate_terms(count_per_vocab=25)
-        
-        print(f"Generando {locations_count:,} ubicaciones...")
-        locations = faker.generate_locations(count=locations_count, storage_units_per_location=5)
-        
-        print(f"Generando {items_count:,} items...")
-        items = faker.generate_items(count=items_count)
+        # Al reanudar la tabla ya quedó particionada en la corrida original
+        if partitions and not (checkpoint and checkpoint.tables):
+            apply_partitioning(cursor, partitions)
         
-        print("Generando identificadores...")
-        identifiers = faker.generate_item_identifiers(items)
-        
-        print("Generando item-terms...")
-        item_terms = faker.generate_item_terms(items)
-        
-        print(f"Generando {stock_count:,} stock items...")
-        stock_items = faker.generate_stock_items(count=stock_count)
-        
-        movements = []
-        if movements_count > 0:
-            print(f"Generando {movements_count:,} movimientos...")
-            movements = faker.generate_stock_movements(count=movements_count)
-        
-        # Insertar en orden de dependencias
-        print("\n📥 Insertando en base de datos...")
-        
-        print(f"  → taxonomy_vocabularies ({len(vocabularies)})")
-        batch_insert(cursor, 'taxonomy_vocabularies', vocabularies)
-        conn.commit()
-        
-        print(f"  → catalog_terms ({len(terms)})")
-        batch_insert(cursor, 'catalog_terms', terms)
-        conn.commit()
+        # Las tablas pequeñas se generan antes de arrancar los threads; las
+        # grandes se generan chunk a chunk mientras se cargan y solo los pools
+        # de IDs quedan en memoria
+        vocabularies = faker.generate_vocabularies()
+        terms = faker.generate_terms()
+        locations = faker.generate_locations(count=locations_count)
         
         # Primero locations root, luego children
         locations_root = [l for l in locations if l['parent_id'] is None]
         locations_children = [l for l in locations if l['parent_id'] is not None]
         
-        print(f"  → locations_locations root ({len(locations_root)})")
-        batch_insert(cursor, 'locations_locations', locations_root)
-        conn.commit()
-        
-        if locations_children:
-            print(f"  → locations_locations children ({len(locations_children)})")
-            batch_insert(cursor, 'locations_locations', locations_children)
-            conn.commit()
-        
-        print(f"  → catalog_items ({len(items):,})")
-        batch_insert(cursor, 'catalog_items', items)
-        conn.commit()
-        
-        print(f"  → catalog_item_identifiers ({len(identifiers):,})")
-        batch_insert(cursor, 'catalog_item_identifiers', identifiers)
-        conn.commit()
-        
-        print(f"  → catalog_item_terms ({len(item_terms):,})")
-        batch_insert(cursor, 'catalog_item_terms', item_terms)
-        conn.commit()
+        sources = {
+            'taxonomy_vocabularies': (lambda: vocabularies, len(vocabularies)),
+            'catalog_terms': (lambda: terms, len(terms)),
+            'locations_locations': (lambda: iter([locations_root, locations_children]), len(locations)),
+            'catalog_items': (lambda: faker.iter_items(count=items_count), items_count),
+            'catalog_item_identifiers': (faker.iter_item_identifiers, items_count * 2),
+            'catalog_item_terms': (faker.iter_item_terms, items_count * 2),
+            'stock_items': (lambda: faker.iter_stock_items(count=stock_count), stock_count),
+        }
+        if movements_count > 0:
+            sources['stock_movements'] = (movements, movements_count)
+        for table, source in faker.rollup_sources():
+            sources[table] = (source, stock_count if table == 'stock_current' else 0)
         
-        print(f"  → stock_items ({len(stock_items):,})")
-        batch_insert(cursor, 'stock_items', stock_items)
-        conn.commit()
+        extra_conns = [connect_db(host, port, user, password, database, loader) for _ in range(connections - 1)]
         
-        if movements:
-            print(f"  → stock_movements ({len(movements):,})")
-            batch_insert(cursor, 'stock_movements', movements)
-            conn.commit()
+        print(f"\n📥 Generando e insertando en base de datos ({connections} conexiones, IDs {faker.id_strategy})...")
+        started = time.perf_counter()
+        totals = run_load_graph([conn] + extra_conns, sources, loader, checkpoint)
         
         cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         cursor.execute("SET UNIQUE_CHECKS = 1")
+        if checkpoint:
+            checkpoint.finish_load()
         
-        print("\n✅ Datos insertados correctamente!")
+        print(f"\n✅ Datos insertados correctamente en {time.perf_counter() - started:.2f}s!")
         print(f"   - {len(vocabularies)} vocabularios")
         print(f"   - {len(terms)} términos")
         print(f"   - {len(locations)} ubicaciones")
-        print(f"   - {len(items):,} items")
-        print(f"   - {len(identifiers):,} identificadores")
-        print(f"   - {len(item_terms):,} relaciones item-term")
-        print(f"   - {len(stock_items):,} stock items")
-        print(f"   - {len(movements):,} movimientos")
-        
+        print(f"   - {totals['catalog_items']:,} items")
+        print(f"   - {totals['catalog_item_identifiers']:,} identificadores")
+        print(f"   - {totals['catalog_item_terms']:,} relaciones item-term")
+        print(f"   - {totals['stock_items']:,} stock items")
+        print(f"   - {totals.get('stock_movements', 0):,} movimientos")
+        for table, _ in faker.rollup_sources():
+            print(f"   - {totals[table]:,} filas en {table}")
+    
     except Exception as e:
-        conn.rollback()
+        for c in [conn] + extra_conns:
+            c.rollback()
         print(f"\n❌ Error: {e}")
         raise
     finally:
         cursor.close()
-        conn.close()
+        for c in [conn] + extra_conns:
+            c.close()
 
 
-def generate_sql_file(faker, output_file, items_count=1000, locations_count=50, stock_count=3000, movements_count=5000):
-    """Genera archivo SQL completo"""
-    
-    print("Generando vocabularios...")
-    vocabularies = faker.generate_vocabularies()
-    
-    print("Generando términos...")
-    terms = faker.generate_terms(count_per_vocab=25)
-    
-    print(f"Generando {locations_count} ubicaciones...")
-    locations = faker.generate_locations(count=locations_count, storage_units_per_location=5)
+def _timed_chunks(chunks, timer):
+    """Itera `chunks` acumulando en timer[0] el tiempo pasado generándolos"""
+    chunks = iter(chunks)
+    while True:
+        started = time.perf_counter()
+        chunk = next(chunks, None)
+        timer[0] += time.perf_counter() - started
+        if chunk is None:
+            return
+        yield chunk
+
+
+def compare_id_strategies(host, port, user, password, database, seed=None, text_pool=None,
+                          items_count=1000, locations_count=50, stock_count=3000, movements_count=5000,
+                          loader='executemany'):
+    """Carga stock_items y stock_movements con cada estrategia de IDs y compara el throughput.
     
-    print(f"Generando {items_count} items...")
-    items = faker.generate_items(count=items_count)
+    Usa tablas scratch (CREATE TABLE ... LIKE) que se eliminan al terminar, así
+    no toca los datos existentes. El tiempo de generación se descuenta y se
+    informa el tamaño de datos/índices resultante de cada variante.
+    """
+    seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+    conn = connect_db(host, port, user, password, database, loader)
+    cursor = conn.cursor()
+    results = []
     
-    print("Generando identificadores...")
-    identifiers = faker.generate_item_identifiers(items)
+    try:
+        for strategy in ID_STRATEGIES:
+            print(f"\n🔑 Estrategia {strategy}")
+            faker = VesselFaker(seed=seed, text_pool=text_pool, id_strategy=strategy)
+            faker.generate_locations(count=locations_count)
+            for _ in faker.iter_items(count=items_count):
+                pass
+            for _ in faker.iter_item_identifiers():
+                pass
+            
+            sources = [
+                ('stock_items', lambda: faker.iter_stock_items(count=stock_count)),
+                ('stock_movements', lambda: faker.iter_stock_movements(count=movements_count)),
+            ]
+            for table, source in sources:
+                scratch = f"bench_ids_{table}"
+                cursor.execute(f"DROP TABLE IF EXISTS `{scratch}`")
+                cursor.execute(f"CREATE TABLE `{scratch}` LIKE `{table}`")
+                
+                generation = [0.0]
+                started = time.perf_counter()
+                total = insert_with_loader(cursor, scratch, _timed_chunks(source(), generation), loader)
+                conn.commit()
+                elapsed = time.perf_counter() - started - generation[0]
+                
+                cursor.execute(f"ANALYZE TABLE `{scratch}`")
+                cursor.fetchall()
+                cursor.execute(
+                    "SELECT data_length, index_length FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s",
+                    (scratch,)
+                )
+                data_length, index_length = cursor.fetchone()
+                cursor.execute(f"DROP TABLE `{scratch}`")
+                
+                rate = total / elapsed if elapsed > 0 else 0
+                print(f"     {table}: {total:,} filas en {elapsed:.2f}s ({rate:,.0f} filas/s)")
+                results.append((strategy, table, total, elapsed, rate, data_length, index_length))
+    finally:
+        cursor.close()
+        conn.close()
     
-    print("Generando item-terms...")
-    item_terms = faker.generate_item_terms(items)
+    baseline = {table: rate for strategy, table, _, _, rate, _, _ in results if strategy == ID_STRATEGIES[0]}
+    print(f"\n📊 Throughput de inserción por estrategia de IDs ({loader})")
+    print(f"   {'estrategia':<12} {'tabla':<16} {'filas/s':>12} {'vs uuid4':>9} {'datos MB':>9} {'índices MB':>11}")
+    for strategy, table, total, elapsed, rate, data_length, index_length in results:
+        ratio = rate / baseline[table] if baseline.get(table) else 0
+        print(f"   {strategy:<12} {table:<16} {rate:>12,.0f} {ratio:>8.2f}x "
+              f"{data_length / 2 ** 20:>9.1f} {index_length / 2 ** 20:>11.1f}")
+    return results
+
+
+def generate_sql_file(faker, output_file, items_count=1000, locations_count=50, stock_count=3000, movements_count=5000,
+                      max_packet=DEFAULT_MAX_PACKET, transaction_size=0, compression='none', split=False, split_bytes=0):
+    """Genera archivo SQL completo, escribiendo cada tabla a medida que se genera.
     
-    print(f"Generando {stock_count} stock items...")
-    stock_items = faker.generate_stock_items(count=stock_count)
+    Los INSERT se dimensionan para `max_packet` bytes; con `transaction_size`
+    se agrupan en transacciones de ese número de sentencias (ver SqlDumpWriter).
+    Con `split` (o `split_bytes`) `output_file` es un directorio con una o más
+    partes por tabla y un manifest.json (ver DumpDirectory).
+    """
     
-    movements = []
-    if movements_count > 0:
-        print(f"Generando {movements_count} movimientos...")
-        movements = faker.generate_stock_movements(count=movements_count)
+    if split or split_bytes:
+        directory = DumpDirectory(output_file, compression, format='sql', seed=faker.seed)
+        f = None
+        dump = SplitSqlDumpWriter(directory, max_packet=max_packet, transaction_size=transaction_size,
+                                  split_bytes=split_bytes)
+    else:
+        directory = None
+        output_file += COMPRESSIONS[compression]
+        f = OutputFile(output_file, compression)
+        dump = SqlDumpWriter(f, max_packet=max_packet, transaction_size=transaction_size)
     
     print(f"Escribiendo a {output_file}...")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("-- =====================================================\n")
-        f.write("-- VESSEL CATALOG - FAKE DATA\n")
-        f.write(f"-- Generated: {now()}\n")
-        f.write("-- =====================================================\n\n")
-        f.write("SET NAMES utf8mb4;\n")
-        f.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
+    try:
+        dump.header()
         
-        f.write("-- VOCABULARIES\n")
-        f.write(to_sql_insert('taxonomy_vocabularies', vocabularies) + '\n\n')
+        print("Generando vocabularios...")
+        vocabularies = faker.generate_vocabularies()
+        dump.comment("VOCABULARIES")
+        dump.write_table('taxonomy_vocabularies', vocabularies)
         
-        f.write("-- TERMS\n")
-        f.write(to_sql_insert('catalog_terms', terms) + '\n\n')
+        print("Generando términos...")
+        terms = faker.generate_terms()
+        dump.comment("TERMS")
+        dump.write_table('catalog_terms', terms)
         
-        f.write("-- LOCATIONS\n")
+        print(f"Generando {locations_count} ubicaciones...")
+        locations = faker.generate_locations(count=locations_count)
+        dump.comment("LOCATIONS")
         # Primero las ubicaciones sin parent, luego las que tienen parent
         locations_root = [l for l in locations if l['parent_id'] is None]
         locations_children = [l for l in locations if l['parent_id'] is not None]
-        f.write(to_sql_insert('locations_locations', locations_root) + '\n\n')
+        dump.write_table('locations_locations', locations_root)
         if locations_children:
-            f.write(to_sql_insert('locations_locations', locations_children) + '\n\n')
+            dump.write_table('locations_locations', locations_children)
         
-        f.write("-- ITEMS\n")
-        f.write(to_sql_insert('catalog_items', items) + '\n\n')
+        print(f"Generando {items_count} items...")
+        dump.comment("ITEMS")
+        total_items = dump.write_table('catalog_items', faker.iter_items(count=items_count))
         
-        f.write("-- ITEM IDENTIFIERS\n")
-        f.write(to_sql_insert('catalog_item_identifiers', identifiers) + '\n\n')
+        print("Generando identificadores...")
+        dump.comment("ITEM IDENTIFIERS")
+        total_identifiers = dump.write_table('catalog_item_identifiers', faker.iter_item_identifiers())
+        
+        print("Generando item-terms...")
+        dump.comment("ITEM TERMS (M:M)")
+        total_item_terms = dump.write_table('catalog_item_terms', faker.iter_item_terms())
         
-        f.write("-- ITEM TERMS (M:M)\n")
-        f.write(to_sql_insert('catalog_item_terms', item_terms) + '\n\n')
+        print(f"Generando {stock_count} stock items...")
+        dump.comment("STOCK ITEMS")
+        total_stock = dump.write_table('stock_items', faker.iter_stock_items(count=stock_count))
         
-        f.write("-- STOCK ITEMS\n")
-        f.write(to_sql_insert('stock_items', stock_items) + '\n\n')
+        total_movements = 0
+        if movements_count > 0:
+            print(f"Generando {movements_count} movimientos...")
+            dump.comment("STOCK MOVEMENTS")
+            total_movements = dump.write_table('stock_movements', faker.iter_stock_movements(count=movements_count))
         
-        if movements:
-            f.write("-- STOCK MOVEMENTS\n")
-            f.write(to_sql_insert('stock_movements', movements) + '\n\n')
+        rollup_totals = {}
+        for table, source in faker.rollup_sources():
+            dump.comment(table.upper().replace('_', ' '))
+            rollup_totals[table] = dump.write_table(table, source())
         
-        f.write("SET FOREIGN_KEY_CHECKS = 1;\n")
-        f.write("-- END OF DATA\n")
+        dump.footer()
+    finally:
+        if f:
+            f.close()
     
-    print(f"✅ Generado: {output_file}")
+    if directory:
+        directory.write_manifest()
+        print(f"✅ Generado: {output_file}/ ({len(directory.parts)} partes, {dump.bytes / 1024 / 1024:.1f} MB sin comprimir, "
+              f"{dump.statements:,} INSERT)")
+    else:
+        print(f"✅ Generado: {output_file} ({dump.bytes / 1024 / 1024:.1f} MB sin comprimir, "
+              f"{f.compressed_bytes / 1024 / 1024:.1f} MB en disco, {dump.statements:,} INSERT)")
     print(f"   - {len(vocabularies)} vocabularios")
     print(f"   - {len(terms)} términos")
     print(f"   - {len(locations)} ubicaciones")
-    print(f"   - {len(items)} items")
-    print(f"   - {len(identifiers)} identificadores")
-    print(f"   - {len(item_terms)} relaciones item-term")
-    print(f"   - {len(stock_items)} stock items")
-    print(f"   - {len(movements)} movimientos")
+    print(f"   - {total_items} items")
+    print(f"   - {total_identifiers} identificadores")
+    print(f"   - {total_item_terms} relaciones item-term")
+    print(f"   - {total_stock} stock items")
+    print(f"   - {total_movements} movimientos")
+    for table, total in rollup_totals.items():
+        print(f"   - {total} filas en {table}")
+
+
+def write_json(f, data):
+    """Serializa `data` con indentación directamente sobre un OutputFile"""
+    for part in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(data):
+        f.write(part.encode('utf-8'))
 
 
-def generate_json_file(faker, output_file):
-    """Genera archivo JSON con todos los datos"""
+def generate_json_file(faker, output_file, items_count=1000, locations_count=50, stock_count=3000, movements_count=5000,
+                       compression='none', split=False):
+    """Genera archivo JSON con todos los datos (o un archivo por tabla con `split`).
+    
+    Arma todas las tablas en memoria: para volúmenes grandes usar export_tables.
+    """
     
     data = {
         'vocabularies': faker.generate_vocabularies(),
-        'terms': faker.generate_terms(count_per_vocab=25),
-        'locations': faker.generate_locations(count=50),
-        'items': faker.generate_items(count=1000),
+        'terms': faker.generate_terms(),
+        'locations': faker.generate_locations(count=locations_count),
+        'items': faker.generate_items(count=items_count),
     }
     
     data['item_identifiers'] = faker.generate_item_identifiers(data['items'])
     data['item_terms'] = faker.generate_item_terms(data['items'])
-    data['stock_items'] = faker.generate_stock_items(count=3000)
-    data['stock_movements'] = faker.generate_stock_movements(count=5000)
+    data['stock_items'] = faker.generate_stock_items(count=stock_count)
+    data['stock_movements'] = faker.generate_stock_movements(count=movements_count) if movements_count > 0 else []
+    
+    if split:
+        directory = DumpDirectory(output_file, compression, format='json', seed=faker.seed)
+        for table, rows in data.items():
+            f = directory.open_part(table, 'json')
+            write_json(f, rows)
+            directory.close_part(f, table, len(rows))
+        directory.write_manifest()
+        print(f"✅ Generado: {output_file}/ ({len(directory.parts)} partes)")
+        return
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_file += COMPRESSIONS[compression]
+    with OutputFile(output_file, compression) as f:
+        write_json(f, data)
     
     print(f"✅ Generado: {output_file}")
 
 
+# =====================================================
+# TABLE EXPORTS (NDJSON / Parquet / Arrow IPC)
+# =====================================================
+
+class NdjsonTableWriter:
+    """Una fila JSON por línea, escrita chunk a chunk"""
+    
+    extension = 'ndjson'
+    compressed = True
+    
+    def __init__(self, f):
+        self.f = f
+    
+    def write(self, chunk):
+        self.f.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in chunk).encode('utf-8'))
+    
+    def close(self):
+        pass
+
+
+class ArrowTableWriter:
+    """Parquet o Arrow IPC en row groups de ARROW_BATCH_ROWS filas.
+    
+    El schema se infiere del primer row group: las columnas 'YYYY-MM-DD' y
+    'YYYY-MM-DD HH:MM:SS' se guardan como date32/timestamp y las que solo traen
+    NULL como string. La compresión (gzip/zstd) es la interna del formato.
+    """
+    
+    compressed = False
+    
+    def __init__(self, f, fmt='parquet', compression='none', batch_rows=ARROW_BATCH_ROWS):
+        if not HAS_PYARROW:
+            raise ValueError("Los exports parquet/arrow requieren: pip install pyarrow")
+        if fmt == 'arrow' and compression == 'gzip':
+            raise ValueError("Arrow IPC solo soporta compresión zstd (o lz4)")
+        self.f = f
+        self.fmt = fmt
+        self.extension = 'parquet' if fmt == 'parquet' else 'arrow'
+        self.compression = None if compression == 'none' else compression
+        self.batch_rows = batch_rows
+        self.pending = []
+        self.schema = None
+        self.writer = None
+    
+    @staticmethod
+    def infer_schema(rows):
+        table = pa.Table.from_pylist(rows)
+        fields = []
+        for field in table.schema:
+            column = table.column(field.name)
+            sample = next((v for v in column.to_pylist() if v is not None), None)
+            if pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+            elif isinstance(sample, str) and len(sample) == 19 and sample[4] == '-' and sample[10] == ' ':
+                field = field.with_type(pa.timestamp('s'))
+            elif isinstance(sample, str) and len(sample) == 10 and sample[4] == '-' and sample[7] == '-':
+                field = field.with_type(pa.date32())
+            fields.append(field)
+        return pa.schema(fields)
+    
+    def _flush(self):
+        rows, self.pending = self.pending, []
+        if self.schema is None:
+            self.schema = self.infer_schema(rows)
+            strings = pa.schema([
+                f.with_type(pa.string()) if pa.types.is_timestamp(f.type) or pa.types.is_date(f.type) else f
+                for f in self.schema
+            ])
+            self.source_schema = strings
+            sink = pa.PythonFile(self.f, mode='w')
+            if self.fmt == 'parquet':
+                self.writer = pa.parquet.ParquetWriter(sink, self.schema, compression=self.compression or 'none')
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self.writer = pa.ipc.new_file(sink, self.schema, options=options)
+        table = pa.Table.from_pylist(rows, schema=self.source_schema).cast(self.schema)
+        self.writer.write_table(table)
+    
+    def write(self, chunk):
+        self.pending.extend(chunk)
+        if len(self.pending) >= self.batch_rows:
+            self._flush()
+    
+    def close(self):
+        if self.pending:
+            self._flush()
+        if self.writer:
+            self.writer.close()
+
+
+def export_tables(faker, output_dir, fmt='ndjson', items_count=1000, locations_count=50, stock_count=3000,
+                  movements_count=5000, compression='none'):
+    """Exporta cada tabla a su propio archivo (NDJSON, Parquet o Arrow IPC) en streaming.
+    
+    Las tablas grandes se escriben chunk a chunk a medida que se generan;
+    `output_dir` queda como un DumpDirectory con su manifest.json.
+    """
+    directory = DumpDirectory(output_dir, compression, format=fmt, seed=faker.seed)
+    
+    vocabularies = faker.generate_vocabularies()
+    terms = faker.generate_terms()
+    locations = faker.generate_locations(count=locations_count)
+    
+    sources = [
+        ('taxonomy_vocabularies', lambda: vocabularies),
+        ('catalog_terms', lambda: terms),
+        ('locations_locations', lambda: locations),
+        ('catalog_items', lambda: faker.iter_items(count=items_count)),
+        ('catalog_item_identifiers', faker.iter_item_identifiers),
+        ('catalog_item_terms', faker.iter_item_terms),
+        ('stock_items', lambda: faker.iter_stock_items(count=stock_count)),
+    ]
+    if movements_count > 0:
+        sources.append(('stock_movements', lambda: faker.iter_stock_movements(count=movements_count)))
+    sources += faker.rollup_sources()
+    
+    print(f"Exportando a {output_dir}/ ({fmt})...")
+    for table, source in sources:
+        started = time.perf_counter()
+        writer_class = NdjsonTableWriter if fmt == 'ndjson' else ArrowTableWriter
+        f = directory.open_part(table, 'ndjson' if fmt == 'ndjson' else fmt, compressed=writer_class.compressed)
+        writer = NdjsonTableWriter(f) if fmt == 'ndjson' else ArrowTableWriter(f, fmt, compression)
+        total = 0
+        try:
+            for batch in iter_batches(source()):
+                with metrics.timer(table, 'serialize'):
+                    writer.write(batch)
+                total += len(batch)
+            with metrics.timer(table, 'serialize'):
+                writer.close()
+            metrics.add(table, 'serialize', 0.0, nbytes=f.bytes)
+        finally:
+            directory.close_part(f, table, total)
+        print(f"   ✓ {table}: {total:,} filas en {time.perf_counter() - started:.2f}s "
+              f"({f.compressed_bytes / 1024 / 1024:.1f} MB)")
+    
+    directory.write_manifest()
+    print(f"✅ Generado: {output_dir}/ ({len(directory.parts)} archivos)")
+
+
 # =====================================================
 # MAIN
 # =====================================================
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Vessel Catalog Data Faker')
-    parser.add_argument('--items', type=int, default=1000, help='Número de items a generar')
-    parser.add_argument('--locations', type=int, default=50, help='Número de ubicaciones')
-    parser.add_argument('--stock', type=int, default=3000, help='Número de stock items')
-    parser.add_argument('--movements', type=int, default=5000, help='Número de movimientos')
-    parser.add_argument('--output', choices=['sql', 'json', 'direct'], default='direct', help='Modo de salida')
+    parser.add_argument('--items', type=int, default=None, help='Número de items a generar (default: escenario, 1000)')
+    parser.add_argument('--locations', type=int, default=None, help='Número de ubicaciones (default: escenario, 50)')
+    parser.add_argument('--stock', type=int, default=None, help='Número de stock items (default: escenario, 3000)')
+    parser.add_argument('--movements', type=int, default=None, help='Número de movimientos (default: escenario, 5000)')
+    parser.add_argument('--scenario', type=str, default=None, metavar='NAME|FILE',
+                        help='Escenario JSON/YAML con conteos, relaciones, proporciones, nulos y distribuciones '
+                             f"(presets: {', '.join(list_scenarios()) or 'ninguno'})")
+    parser.add_argument('--output', choices=['sql', 'json', 'ndjson', 'parquet', 'arrow', 'direct'], default='direct',
+                        help='Modo de salida (ndjson/parquet/arrow: un archivo por tabla en un directorio)')
     parser.add_argument('--file', type=str, default=None, help='Nombre del archivo de salida')
     parser.add_argument('--workspace', type=str, default=None, help='Workspace ID')
+    parser.add_argument('--workspaces', type=int, default=1,
+                        help='Generar N workspaces con tamaños de cola pesada repartiendo los conteos totales')
+    parser.add_argument('--workspace-skew', type=float, default=1.0,
+                        help='Exponente Zipf del tamaño de los workspaces (0 = todos iguales)')
+    parser.add_argument('--workspace-layout', choices=WORKSPACE_LAYOUTS, default='clustered',
+                        help='Orden de las filas (y de las PKs uuid7/sequential): agrupadas por workspace o intercaladas')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla maestra (misma semilla = mismos datos)')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos de generación en paralelo')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=None,
+                        help="Fija el 'ahora' de la corrida (YYYY-MM-DD HH:MM:SS); con --seed la salida es idéntica")
+    parser.add_argument('--text-pool-size', type=int, default=TEXT_POOL_SIZE,
+                        help='Frases por locale en el corpus de textos pregenerado')
+    parser.add_argument('--text-cache', type=str, default=TEXT_CACHE_DIR,
+                        help='Directorio de cache del corpus de textos (vacío = sin cache)')
+    parser.add_argument('--text-combine', action='store_true',
+                        help='Armar descripciones combinando frases del corpus (más variedad)')
+    parser.add_argument('--max-allowed-packet', type=parse_size, default=DEFAULT_MAX_PACKET,
+                        help='Tamaño máximo de cada INSERT del dump SQL (ej: 4M, 64M)')
+    parser.add_argument('--transaction-size', type=int, default=0,
+                        help='Dump SQL: COMMIT cada N sentencias con UNIQUE_CHECKS/AUTOCOMMIT desactivados (0 = sin transacciones)')
+    parser.add_argument('--compress', choices=list(COMPRESSIONS), default='none',
+                        help='Comprimir el dump SQL/JSON mientras se escribe (zstd requiere zstandard)')
+    parser.add_argument('--split', choices=['none', 'table'], default='none',
+                        help='Partir el dump en un directorio con un archivo por tabla y manifest.json')
+    parser.add_argument('--split-size', type=parse_size, default=0,
+                        help='Dump SQL: cortar cada tabla en partes de ~N bytes sin comprimir (ej: 64M); implica --split table')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Mostrar al final tiempos por fase (generación / serialización / BD), filas/s y pico de RSS')
+    parser.add_argument('--metrics-json', type=str, default=None, metavar='FILE',
+                        help='Guardar el resumen de métricas en JSON (para comparar entre commits en CI)')
+    parser.add_argument('--profile', type=str, default=None, metavar='FILE',
+                        help='Perfilar la corrida y guardar el resultado en FILE')
+    parser.add_argument('--profile-format', choices=['pstats', 'collapsed'], default='pstats',
+                        help='pstats (cProfile, thread principal) o collapsed stacks por muestreo (flamegraph/speedscope)')
+    parser.add_argument('--verify-manifest', type=str, default=None, metavar='DIR',
+                        help='Verificar el sha256 de las partes de un dump partido y salir')
     
     # DB connection args
     parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
@@ -784,41 +3691,221 @@ if __name__ == '__main__':
     parser.add_argument('--database', type=str, default=os.getenv('DB_DATABASE', 'vessel_test'), help='MySQL database')
     parser.add_argument('--clean', action='store_true', help='Limpiar tablas antes de insertar')
     parser.add_argument('--only-movements', action='store_true', help='Solo insertar movements (usa locations existentes)')
+    parser.add_argument('--partition-movements', action='store_true',
+                        help='Particionar stock_movements por mes (RANGE sobre created_at) y cargar cada mes en su partición')
+    parser.add_argument('--rollups', action='store_true',
+                        help='Calcular durante la generación stock_current y las tablas rollup_* (rollups_schema.sql)')
+    parser.add_argument('--distributions', type=str, default=None, metavar='NAME|FILE',
+                        help='Perfil de distribuciones por tabla: Zipf en items/ubicaciones, Pareto en cantidades, '
+                             'patrón diurno/semanal/estacional y ráfagas en created_at (preset de distributions/ o ruta; '
+                             'reemplaza al del escenario)')
+    parser.add_argument('--id-strategy', choices=ID_STRATEGIES, default='uuid4',
+                        help='PKs de las tablas grandes: uuid4 aleatorio, uuid7 ordenado en el tiempo o secuencial')
+    parser.add_argument('--compare-id-strategies', action='store_true',
+                        help='Comparar filas/s de stock_items/stock_movements con cada estrategia de IDs (tablas scratch)')
+    parser.add_argument('--connections', type=int, default=1,
+                        help='Conexiones a MySQL para cargar tablas independientes en paralelo')
+    parser.add_argument('--checkpoint', type=str, default=None, metavar='FILE',
+                        help='Carga directa con commit por chunk y estado en FILE para poder reanudarla')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reanudar la carga del checkpoint (misma semilla y parámetros; default vessel_faker.checkpoint.json)')
+    parser.add_argument('--loader', choices=['executemany', 'infile', 'infile-pipe'], default='executemany',
+                        help='Método de carga: INSERT con executemany o LOAD DATA LOCAL INFILE (archivo temporal o named pipe)')
     
     args = parser.parse_args()
     
-    faker = VesselFaker(workspace_id=args.workspace)
+    if args.verify_manifest:
+        failed = verify_manifest(args.verify_manifest)
+        for name in failed:
+            print(f"❌ {name}: sha256 no coincide o falta el archivo")
+        print("✅ Todas las partes verificadas" if not failed else f"❌ {len(failed)} partes con error")
+        exit(1 if failed else 0)
+    
+    split = args.split == 'table' or bool(args.split_size)
+    
+    if args.partition_movements and args.output != 'direct':
+        print("❌ Error: --partition-movements solo aplica a --output direct")
+        exit(1)
     
-    if args.output == 'direct':
-        if not HAS_MYSQL:
-            print("❌ Error: mysql-connector-python no está instalado")
-            print("   Ejecuta: pip install mysql-connector-python")
+    # Parámetros que determinan los datos generados: se guardan en el checkpoint
+    # y --resume los restaura para regenerar exactamente lo mismo
+    checkpoint = None
+    # Sin --seed el corpus de textos usa la semilla 0 (así se reutiliza su cache)
+    args.text_seed = args.seed if args.seed is not None else 0
+    checkpoint_params = ['seed', 'now', 'workspace', 'id_strategy', 'text_seed', 'text_pool_size', 'text_combine',
+                         'items', 'locations', 'stock', 'movements', 'only_movements', 'rollups', 'distributions',
+                         'scenario', 'workspaces', 'workspace_skew', 'workspace_layout', 'partition_movements']
+    if args.resume:
+        args.checkpoint = args.checkpoint or 'vessel_faker.checkpoint.json'
+        if not os.path.exists(args.checkpoint):
+            print(f"❌ Error: no existe el checkpoint {args.checkpoint}")
             exit(1)
-        
-        insert_direct_to_db(
-            faker,
-            host=args.host,
-            port=args.port,
-            user=args.user,
-            password=args.password,
-            database=args.database,
-            items_count=args.items,
-            locations_count=args.locations,
-            stock_count=args.stock,
-            movements_count=args.movements,
-            clean_tables=args.clean,
-            only_movements=getattr(args, 'only_movements', False)
-        )
-    elif args.output == 'sql':
-        output_file = args.file or 'vessel_fake_data.sql'
-        generate_sql_file(
-            faker, 
-            output_file,
-            items_count=args.items,
-            locations_count=args.locations,
-            stock_count=args.stock,
-            movements_count=args.movements
-        )
+        checkpoint = LoadCheckpoint.load(args.checkpoint)
+        if checkpoint.completed:
+            print(f"✅ La carga de {args.checkpoint} ya está completa")
+            exit(0)
+        for name in checkpoint_params:
+            setattr(args, name, checkpoint.params[name])
+        args.now = datetime.fromisoformat(args.now)
+        print(f"↻ Reanudando desde {args.checkpoint}")
+    
+    if args.now:
+        set_run_clock(args.now)
+    
+    # En el checkpoint se guardan el escenario y el perfil ya leídos, no sus rutas
+    try:
+        if isinstance(args.scenario, str):
+            args.scenario = load_scenario(args.scenario)
+        plan = ScenarioPlan(args.scenario, {name: getattr(args, name) for _, name in SCENARIO_COUNTS})
+        distributions = None
+        if isinstance(args.distributions, str):
+            distributions = Distributions.load(args.distributions)
+        elif args.distributions:
+            distributions = Distributions(args.distributions)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en el escenario o perfil de distribuciones: {e}")
+        exit(1)
+    args.distributions = distributions.profile if distributions else None
+    for _, name in SCENARIO_COUNTS:
+        setattr(args, name, plan.counts[name])
+    if args.scenario:
+        print(f"📋 Escenario: {plan.describe()}")
+    
+    # Cada item tiene un solo SKU principal y stock_items no repite (sku, ubicación). Las
+    # storage units suman ubicaciones al azar: se valida contra las principales, que siempre
+    # están. Con --workspaces el stock se recorta a lo que entra en cada workspace
+    if args.workspaces <= 1 and not args.only_movements and args.stock > args.items * args.locations:
+        print(f"❌ Error: --stock {args.stock:,} supera los pares sku/ubicación garantizados "
+              f"({args.items:,} items × {args.locations:,} ubicaciones = {args.items * args.locations:,}); "
+              "subir --items o --locations")
+        exit(1)
+    
+    text_pool = TextPool.load(
+        args.text_seed,
+        size=args.text_pool_size,
+        cache_dir=args.text_cache or None,
+        combine=args.text_combine
+    )
+    if args.workspaces > 1:
+        if args.workspace or args.only_movements or args.compare_id_strategies:
+            print("❌ Error: --workspaces no se combina con --workspace, --only-movements ni --compare-id-strategies")
+            exit(1)
+        if args.workspaces > min(args.items, args.locations):
+            print(f"❌ Error: cada workspace necesita al menos 1 item y 1 ubicación "
+                  f"(--items y --locations >= {args.workspaces:,})")
+            exit(1)
+        faker = MultiWorkspaceFaker(args.workspaces, seed=args.seed, workers=args.workers, text_pool=text_pool,
+                                    id_strategy=args.id_strategy, rollups=args.rollups, distributions=distributions,
+                                    plan=plan, skew=args.workspace_skew, layout=args.workspace_layout)
     else:
-        output_file = args.file or 'vessel_fake_data.json'
-        generate_json_file(faker, output_file)
+        faker = VesselFaker(workspace_id=args.workspace, seed=args.seed, workers=args.workers,
+                            text_pool=text_pool, id_strategy=args.id_strategy, rollups=args.rollups,
+                            distributions=distributions, plan=plan)
+    print(f"🎲 Semilla: {faker.seed} (workers: {faker.workers})")
+    
+    if args.checkpoint and not checkpoint and args.output == 'direct':
+        args.seed, args.now, args.workspace = faker.seed, run_clock(), faker.workspace_id
+        checkpoint = LoadCheckpoint(args.checkpoint, {
+            name: (value.isoformat(sep=' ') if isinstance(value, datetime) else value)
+            for name, value in ((name, getattr(args, name)) for name in checkpoint_params)
+        })
+        checkpoint.save()
+    
+    profiler = start_profile(args.profile_format) if args.profile else None
+    try:
+        if args.output == 'direct':
+            if not HAS_MYSQL:
+                print("❌ Error: mysql-connector-python no está instalado")
+                print("   Ejecuta: pip install mysql-connector-python")
+                exit(1)
+            
+            if args.compare_id_strategies:
+                compare_id_strategies(
+                    host=args.host,
+                    port=args.port,
+                    user=args.user,
+                    password=args.password,
+                    database=args.database,
+                    seed=faker.seed,
+                    text_pool=text_pool,
+                    items_count=args.items,
+                    locations_count=args.locations,
+                    stock_count=args.stock,
+                    movements_count=args.movements,
+                    loader=args.loader
+                )
+                exit(0)
+            
+            insert_direct_to_db(
+                faker,
+                host=args.host,
+                port=args.port,
+                user=args.user,
+                password=args.password,
+                database=args.database,
+                items_count=args.items,
+                locations_count=args.locations,
+                stock_count=args.stock,
+                movements_count=args.movements,
+                clean_tables=args.clean,
+                only_movements=getattr(args, 'only_movements', False),
+                loader=args.loader,
+                connections=max(1, args.connections),
+                checkpoint=checkpoint,
+                partition_movements=args.partition_movements
+            )
+        elif args.output == 'sql':
+            output_file = args.file or ('vessel_fake_data' if split else 'vessel_fake_data.sql')
+            generate_sql_file(
+                faker, 
+                output_file,
+                items_count=args.items,
+                locations_count=args.locations,
+                stock_count=args.stock,
+                movements_count=args.movements,
+                max_packet=args.max_allowed_packet,
+                transaction_size=args.transaction_size,
+                compression=args.compress,
+                split=split,
+                split_bytes=args.split_size
+            )
+        elif args.output == 'json':
+            output_file = args.file or ('vessel_fake_data' if split else 'vessel_fake_data.json')
+            generate_json_file(
+                faker,
+                output_file,
+                items_count=args.items,
+                locations_count=args.locations,
+                stock_count=args.stock,
+                movements_count=args.movements,
+                compression=args.compress,
+                split=split
+            )
+        else:
+            export_tables(
+                faker,
+                args.file or f"vessel_fake_data_{args.output}",
+                fmt=args.output,
+                items_count=args.items,
+                locations_count=args.locations,
+                stock_count=args.stock,
+                movements_count=args.movements,
+                compression=args.compress
+            )
+        if args.workspaces > 1:
+            print(f"🏢 {faker.describe()}")
+    finally:
+        if profiler:
+            stop_profile(profiler, args.profile)
+        if args.metrics:
+            metrics.report()
+        if args.metrics_json:
+            summary = metrics.summary(
+                output=args.output, loader=args.loader, workers=faker.workers, connections=args.connections,
+                workspaces=args.workspaces,
+                seed=faker.seed, counts={'items': args.items, 'locations': args.locations,
+                                         'stock': args.stock, 'movements': args.movements},
+            )
+            with open(args.metrics_json, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+            print(f"📊 Métricas guardadas en {args.metrics_json}")
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - Replay HTTP de datos generados contra la API REST
+insert_direct_to_db escribe directo en MySQL y se salta los módulos Stock y
+Catalog de Laravel; este script manda las mismas filas de VesselFaker como
+requests HTTP para medir la API: locations, items, identificadores, stock items
+y movimientos, en ese orden (cada fase usa los IDs que devolvió la anterior).
+
+Cliente asíncrono (aiohttp) con concurrencia configurable y conexiones
+keep-alive reutilizadas. Registra por endpoint un histograma de latencias,
+p50/p95/p99 y tasa de errores.
+
+Los movimientos salen del ledger en modo live a partir de los stock items
+recién creados, y los de un mismo SKU se mandan siempre por el mismo worker y
+en orden, así ningún despacho deja stock negativo en el servidor.
+
+Uso:
+    python faker_http.py --base-url http://localhost:8000 --concurrency 16
+    python faker_http.py --stub  # Contra el servidor stub local (probar el harness)
+    python faker_http.py --stub --stub-latency 20 --stub-error-rate 0.01 --output replay.json
+    python faker_http.py --serve-stub --port 8089  # Solo levantar el stub
+    python faker_http.py --scenario minimarket --header "Authorization: Bearer TOKEN"
+
+Requisitos:
+    pip install faker numpy aiohttp
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import aiohttp
+    from aiohttp import web
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from faker_bench import latency_stats
+from faker_data import SCENARIO_COUNTS, Distributions, ScenarioPlan, VesselFaker, load_scenario
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+DEFAULT_BASE_URL = 'http://localhost:8000'
+
+# Límites superiores (ms) de los buckets del histograma; el último es abierto
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Tipos de identificador del faker que la API nombra distinto (IdentifierType)
+IDENTIFIER_TYPES = {'supplier_code': 'supplier'}
+
+# Endpoints que usa el replay (mismas plantillas que las rutas de Laravel)
+ENDPOINTS = {
+    'location': ('POST', '/api/v1/locations/create'),
+    'item': ('POST', '/api/v1/items/create'),
+    'identifier': ('POST', '/api/v1/items/{id}/identifiers/create'),
+    'stock_item': ('POST', '/api/v1/stock/items/create'),
+    'receipt': ('POST', '/api/v1/stock/movements/receipt'),
+    'shipment': ('POST', '/api/v1/stock/movements/shipment'),
+    'transfer': ('POST', '/api/v1/stock/movements/transfer'),
+    'adjustment': ('POST', '/api/v1/stock/movements/adjustment'),
+}
+
+# =====================================================
+# FILAS -> REQUESTS
+# =====================================================
+# Cada builder retorna (endpoint, path, payload) o None si una FK no se creó
+# en el servidor (la fila se cuenta como omitida)
+
+def location_request(row, ids):
+    parent_id = ids.get(row['parent_id']) if row['parent_id'] else None
+    if row['parent_id'] and not parent_id:
+        return None
+    payload = {'name': row['name'], 'type': row['type'], 'description': row['description'], 'parent_id': parent_id}
+    return 'location', ENDPOINTS['location'][1], payload
+
+
+def item_request(row, ids):
+    payload = {key: row[key] for key in ('name', 'description', 'notes', 'status')}
+    return 'item', ENDPOINTS['item'][1], payload
+
+
+def identifier_request(row, ids):
+    item_id = ids.get(row['item_id'])
+    if not item_id:
+        return None
+    payload = {
+        'type': IDENTIFIER_TYPES.get(row['type'], row['type']),
+        'value': row['value'],
+        'is_primary': bool(row['is_primary']),
+    }
+    return 'identifier', ENDPOINTS['identifier'][1].format(id=item_id), payload
+
+
+def stock_item_request(row, ids):
+    item_id, location_id = ids.get(row['catalog_item_id']), ids.get(row['location_id'])
+    if not item_id or not location_id:
+        return None
+    payload = {key: row[key] for key in ('sku', 'catalog_origin', 'location_type', 'quantity', 'reserved_quantity',
+                                         'lot_number', 'expiration_date', 'workspace_id')}
+    payload.update(catalog_item_id=item_id, location_id=location_id)
+    return 'stock_item', ENDPOINTS['stock_item'][1], payload
+
+
+def movement_request(row, ids):
+    """Un movimiento del ledger al endpoint de su tipo (item_id es el SKU, como en stock_movements)"""
+    origin = ids.get(row['location_from_id']) if row['location_from_id'] else None
+    destination = ids.get(row['location_to_id']) if row['location_to_id'] else None
+    if (row['location_from_id'] and not origin) or (row['location_to_id'] and not destination):
+        return None
+    payload = {'item_id': row['sku'], 'workspace_id': row['workspace_id']}
+    kind = row['movement_type']
+    if kind == 'transfer':
+        endpoint = 'transfer'
+        payload.update(source_location_id=origin, destination_location_id=destination, quantity=row['quantity'])
+    elif kind == 'adjustment':
+        endpoint = 'adjustment'
+        payload.update(location_id=destination, delta=row['quantity'])
+    else:
+        endpoint = 'receipt' if kind == 'in' else 'shipment'
+        payload.update(location_id=destination or origin, quantity=row['quantity'], reference_id=row['reference'])
+    return endpoint, ENDPOINTS[endpoint][1], payload
+
+# =====================================================
+# ESTADÍSTICAS
+# =====================================================
+
+class EndpointStats:
+    """Latencias, histograma y códigos de respuesta de un endpoint"""
+    
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+    
+    def record(self, elapsed_ms, status):
+        self.latencies.append(elapsed_ms)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors += 1
+    
+    def histogram(self):
+        """{'<=1ms': n, ..., '>5000ms': n} con los buckets de HISTOGRAM_BUCKETS_MS"""
+        counts = np.bincount(np.searchsorted(HISTOGRAM_BUCKETS_MS, self.latencies),
+                             minlength=len(HISTOGRAM_BUCKETS_MS) + 1)
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, counts.tolist()))
+    
+    def summary(self):
+        return {
+            'requests': len(self.latencies),
+            'errors': self.errors,
+            'error_rate': round(self.errors / len(self.latencies), 4) if self.latencies else 0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            'latency_ms': latency_stats(self.latencies) if self.latencies else None,
+            'histogram': self.histogram(),
+        }
+
+# =====================================================
+# REPLAY
+# =====================================================
+
+class HttpReplayer:
+    """Manda fases de filas como requests con `concurrency` workers sobre una sesión keep-alive"""
+    
+    def __init__(self, base_url, concurrency=8, keepalive=True, headers=None, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.keepalive = keepalive
+        self.headers = {'Accept': 'application/json', **(headers or {})}
+        self.timeout = timeout
+        # ID local (faker) -> ID que asignó el servidor
+        self.ids = {}
+        self.endpoints = {}
+        self.phases = []
+        self.connections = {'opened': 0, 'reused': 0}
+    
+    def _trace(self):
+        trace = aiohttp.TraceConfig()
+        
+        async def opened(session, context, params):
+            self.connections['opened'] += 1
+        
+        async def reused(session, context, params):
+            self.connections['reused'] += 1
+        
+        trace.on_connection_create_end.append(opened)
+        trace.on_connection_reuseconn.append(reused)
+        return trace
+    
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, force_close=not self.keepalive)
+        self.session = aiohttp.ClientSession(
+            connector=connector, headers=self.headers, trace_configs=[self._trace()],
+            timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.session.close()
+    
+    async def send(self, endpoint, path, payload, local_id=None):
+        started = time.perf_counter()
+        try:
+            async with self.session.post(self.base_url + path, json=payload) as response:
+                body = await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status, body = type(e).__name__, None
+        self.endpoints.setdefault(endpoint, EndpointStats()).record((time.perf_counter() - started) * 1000, status)
+        
+        if local_id is not None and status in (200, 201) and body:
+            try:
+                data = json.loads(body).get('data') or {}
+            except ValueError:
+                data = {}
+            if data.get('id'):
+                self.ids[local_id] = data['id']
+    
+    async def run_phase(self, name, rows, build, key=None):
+        """Replay de `rows`; con `key` las filas de una misma clave van en orden por el mismo worker"""
+        queues = [asyncio.Queue() for _ in range(self.concurrency)]
+        for index, row in enumerate(rows):
+            # crc32 y no hash(): el de str cambia por proceso (PYTHONHASHSEED) y el reparto no sería reproducible
+            shard = zlib.crc32(str(key(row)).encode()) if key else index
+            queues[shard % self.concurrency].put_nowait(row)
+        skipped = 0
+        
+        async def worker(queue):
+            nonlocal skipped
+            while not queue.empty():
+                row = queue.get_nowait()
+                request = build(row, self.ids)
+                if request is None:
+                    skipped += 1
+                    continue
+                await self.send(*request, local_id=row.get('id'))
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(queue) for queue in queues))
+        elapsed = time.perf_counter() - started
+        sent = len(rows) - skipped
+        phase = {'phase': name, 'rows': len(rows), 'sent': sent, 'skipped': skipped,
+                 'elapsed_s': round(elapsed, 3), 'rps': round(sent / elapsed, 1) if elapsed else 0}
+        self.phases.append(phase)
+        print(f"   ✓ {name:<26} {sent:>8,} requests en {elapsed:>7.2f}s ({phase['rps']:>8,.0f} req/s)"
+              f"{f'  ⚠ {skipped:,} omitidas (FK sin crear)' if skipped else ''}")
+        return phase
+    
+    def report(self):
+        print(f"\n{'endpoint':<12} {'requests':>9} {'errores':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>9}")
+        summaries = {name: stats.summary() for name, stats in self.endpoints.items()}
+        for name, summary in summaries.items():
+            latency = summary['latency_ms']
+            print(f"{name:<12} {summary['requests']:>9,} {summary['error_rate']:>7.1%} {latency['p50']:>8.1f} "
+                  f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>9.1f}")
+            failed = {status: count for status, count in summary['statuses'].items() if not status.startswith('2')}
+            if failed:
+                print(f"{'':<12} códigos: {', '.join(f'{status}×{count}' for status, count in failed.items())}")
+        print(f"   Conexiones: {self.connections['opened']:,} abiertas, {self.connections['reused']:,} reutilizadas")
+        return {'phases': self.phases, 'endpoints': summaries, 'connections': self.connections}
+
+
+async def replay(faker, args, headers):
+    """Genera el dataset y lo manda fase por fase (cada una espera a la anterior por las FKs)"""
+    faker.generate_vocabularies()
+    faker.generate_terms()
+    locations = faker.generate_locations(count=args.locations)
+    items = faker.generate_items(count=args.items)
+    identifiers = faker.generate_item_identifiers(items)
+    stock_items = faker.generate_stock_items(count=args.stock)
+    # Movimientos nuevos sobre el stock recién creado: el servidor parte de esos saldos
+    movements = [row for chunk in faker.iter_stock_movements(args.movements, live=True) for row in chunk]
+    
+    async with HttpReplayer(args.base_url, args.concurrency, not args.no_keepalive, headers, args.timeout) as replayer:
+        print(f"\n🌐 Replay contra {replayer.base_url} ({replayer.concurrency} concurrentes, "
+              f"keep-alive {'no' if args.no_keepalive else 'sí'})")
+        started = time.perf_counter()
+        # Los storage units referencian a su almacén: primero las ubicaciones raíz
+        await replayer.run_phase('locations_locations', [row for row in locations if not row['parent_id']], location_request)
+        await replayer.run_phase('storage_units', [row for row in locations if row['parent_id']], location_request)
+        await replayer.run_phase('catalog_items', items, item_request)
+        await replayer.run_phase('catalog_item_identifiers', identifiers, identifier_request)
+        await replayer.run_phase('stock_items', stock_items, stock_item_request)
+        await replayer.run_phase('stock_movements', movements, movement_request, key=lambda row: row['sku'])
+        elapsed = time.perf_counter() - started
+        report = replayer.report()
+    report['elapsed_s'] = round(elapsed, 3)
+    return report
+
+# =====================================================
+# STUB SERVER
+# =====================================================
+
+def stub_app(latency_ms=0.0, error_rate=0.0, seed=None):
+    """App aiohttp con los endpoints del replay: responde 201 con un ID nuevo.
+    
+    `latency_ms` agrega una demora media (exponencial) y `error_rate` la
+    fracción de requests que fallan con 500, para probar el harness.
+    """
+    rng = random.Random(seed)
+    counts = {}
+    
+    async def handle(request):
+        template = request.match_info.route.resource.canonical
+        counts[template] = counts.get(template, 0) + 1
+        await request.json()
+        if latency_ms:
+            await asyncio.sleep(rng.expovariate(1 / latency_ms) / 1000)
+        if rng.random() < error_rate:
+            return web.json_response({'error': 'stub: error simulado'}, status=500)
+        return web.json_response({'data': {'id': str(uuid.uuid4())}}, status=201)
+    
+    async def stats(request):
+        return web.json_response(counts)
+    
+    app = web.Application()
+    for method, path in ENDPOINTS.values():
+        app.router.add_route(method, path, handle)
+    app.router.add_get('/__stub/stats', stats)
+    return app
+
+
+async def start_stub(host='127.0.0.1', port=0, **options):
+    """Levanta el stub en el loop actual. Retorna (runner, url); port=0 elige uno libre"""
+    runner = web.AppRunner(stub_app(**options))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound}"
+
+
+async def serve_stub(args):
+    runner, url = await start_stub(args.host, args.port, latency_ms=args.stub_latency,
+                                   error_rate=args.stub_error_rate, seed=args.seed)
+    print(f"🧪 Stub escuchando en {url} (Ctrl+C para terminar)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run(faker, args, headers):
+    if not args.stub:
+        return await replay(faker, args, headers)
+    runner, args.base_url = await start_stub(latency_ms=args.stub_latency, error_rate=args.stub_error_rate,
+                                             seed=args.seed)
+    try:
+        return await replay(faker, args, headers)
+    finally:
+        await runner.cleanup()
+
+# =====================================================
+# MAIN
+# =====================================================
+
+def parse_header(text):
+    name, separator, value = text.partition(':')
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"Header no válido: {text!r} (formato: 'Nombre: valor')")
+    return name.strip(), value.strip()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - Replay HTTP de datos generados contra la API')
+    parser.add_argument('--base-url', type=str, default=DEFAULT_BASE_URL, help='URL base de la API de Vessel')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests en vuelo a la vez')
+    parser.add_argument('--no-keepalive', action='store_true', help='Abrir una conexión por request (comparar con keep-alive)')
+    parser.add_argument('--timeout', type=float, default=30, help='Timeout por request en segundos')
+    parser.add_argument('--header', type=parse_header, action='append', default=[], metavar='"NOMBRE: VALOR"',
+                        help='Header extra en cada request (repetible, ej. Authorization)')
+    
+    parser.add_argument('--items', type=int, default=None, help='Número de items (default: el del escenario)')
+    parser.add_argument('--locations', type=int, default=None, help='Número de locations (default: el del escenario)')
+    parser.add_argument('--stock', type=int, default=None, help='Número de stock items (default: el del escenario)')
+    parser.add_argument('--movements', type=int, default=None, help='Número de movimientos (default: el del escenario)')
+    parser.add_argument('--scenario', type=str, default=None, metavar='NAME|FILE', help='Escenario, ver faker_data.py')
+    parser.add_argument('--distributions', type=str, default=None, metavar='NAME|FILE',
+                        help='Perfil de distribuciones, ver faker_data.py')
+    parser.add_argument('--workspace', type=str, default=None, help='Workspace ID (UUID) de las filas')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla del dataset (y del stub)')
+    parser.add_argument('--output', type=str, default=None, metavar='FILE', help='Guardar el reporte en JSON')
+    
+    parser.add_argument('--stub', action='store_true', help='Levantar el stub local y hacer el replay contra él')
+    parser.add_argument('--serve-stub', action='store_true', help='Solo levantar el stub (en --host/--port)')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Host del stub con --serve-stub')
+    parser.add_argument('--port', type=int, default=8089, help='Puerto del stub con --serve-stub')
+    parser.add_argument('--stub-latency', type=float, default=0, help='Latencia media simulada del stub en ms')
+    parser.add_argument('--stub-error-rate', type=float, default=0, help='Fracción de requests que el stub responde con 500')
+    
+    args = parser.parse_args()
+    
+    if not HAS_AIOHTTP:
+        print("❌ Error: aiohttp no está instalado")
+        print("   Ejecuta: pip install aiohttp")
+        exit(1)
+    
+    if args.serve_stub:
+        try:
+            asyncio.run(serve_stub(args))
+        except KeyboardInterrupt:
+            pass
+        exit(0)
+    
+    try:
+        plan = ScenarioPlan(load_scenario(args.scenario) if args.scenario else None,
+                            {name: getattr(args, name) for _, name in SCENARIO_COUNTS})
+        distributions = Distributions.load(args.distributions) if args.distributions else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en el escenario o perfil de distribuciones: {e}")
+        exit(1)
+    for _, name in SCENARIO_COUNTS:
+        setattr(args, name, plan.counts[name])
+    
+    faker = VesselFaker(workspace_id=args.workspace, seed=args.seed, distributions=distributions, plan=plan)
+    print(f"📦 Generando {args.locations:,} locations, {args.items:,} items, {args.stock:,} stock items y "
+          f"{args.movements:,} movimientos (semilla {faker.seed})")
+    report = asyncio.run(run(faker, args, dict(args.header)))
+    
+    requests = sum(summary['requests'] for summary in report['endpoints'].values())
+    errors = sum(summary['errors'] for summary in report['endpoints'].values())
+    print(f"\n✅ {requests:,} requests en {report['elapsed_s']}s ({requests / report['elapsed_s']:,.0f} req/s), "
+          f"{errors:,} errores ({errors / max(requests, 1):.2%})")
+    
+    if args.output:
+        report.update(generated=datetime.now().isoformat(sep=' ', timespec='seconds'),
+                      base_url=args.base_url, concurrency=args.concurrency, keepalive=not args.no_keepalive,
+                      seed=faker.seed, scenario=plan.name, counts=plan.counts)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Reporte guardado en {args.output}")
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - Driver de escritura sostenida (modo live)
+Inyecta movimientos de stock en una BD ya sembrada a un ritmo objetivo, como
+lo haría la operación diaria, mientras opcionalmente corren lecturas de
+dashboard (vistas Power BI) en paralelo.
+
+Cada evento es una transacción: INSERT en stock_movements + UPDATE relativo de
+stock_items.quantity en las ubicaciones afectadas. Los eventos salen del mismo
+ledger que faker_data.py (VesselFaker.iter_stock_movements en modo live) a
+partir del stock actual de la BD, así nunca dejan saldos negativos.
+
+La carga es de lazo abierto: cada evento tiene su instante programado y la
+latencia de respuesta se mide desde ese instante (incluye la cola), así la
+saturación se ve como latencia creciente y no como un ritmo que baja solo.
+
+Por intervalo informa ritmo objetivo vs logrado, p50/p95/p99 de commit y p99
+de respuesta; al final marca el primer intervalo saturado.
+
+Uso:
+    python faker_live.py --rate 200 --duration 60
+    python faker_live.py --stages 50@30,50-2000@300 --connections 8  # Rampa para buscar el punto de saturación
+    python faker_live.py --rate 500 --duration 120 --readers 2  # Con lecturas de dashboard en paralelo
+    python faker_live.py --rate 300 --distributions retail --output live.json  # SKUs calientes, reporte JSON
+
+Requisitos:
+    pip install faker numpy mysql-connector-python
+    BD sembrada con faker_data.py (stock_items y locations_locations)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from faker_bench import BENCH_VIEWS, latency_stats, load_queries
+from faker_data import HAS_MYSQL, Distributions, VesselFaker, connect_db
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+# Eventos en cola por conexión antes de que el productor espere
+QUEUE_PER_CONNECTION = 100
+
+# Un intervalo está saturado si logra menos que esta fracción del objetivo...
+SATURATION_RATIO = 0.9
+# ...o si la respuesta p99 supera este valor (la cola crece)
+SATURATION_LAG_MS = 1000
+
+# Errores de MySQL por contención que se cuentan aparte
+LOCK_ERRORS = {1205: 'lock_wait_timeout', 1213: 'deadlock'}
+# Reintentos de un evento que perdió por contención; si se descarta se saca del ledger
+LOCK_RETRIES = 5
+
+UPDATE_STOCK = ("UPDATE `stock_items` SET `quantity` = `quantity` + %s, `updated_at` = %s "
+                "WHERE `sku` = %s AND `location_id` = %s")
+
+# =====================================================
+# PERFIL DE CARGA
+# =====================================================
+
+def parse_stages(text):
+    """'50@30,50-1000@120' -> [(50, 50, 30), (50, 1000, 120)]: ritmo (o rampa inicio-fin) @ segundos"""
+    stages = []
+    for part in text.split(','):
+        rate, _, seconds = part.strip().partition('@')
+        start, _, end = rate.partition('-')
+        try:
+            stage = (float(start), float(end or start), float(seconds))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Etapa no válida: {part!r} (formato: ritmo@segundos o inicio-fin@segundos)")
+        if min(stage) < 0 or stage[2] == 0:
+            raise argparse.ArgumentTypeError(f"Etapa no válida: {part!r} (ritmos >= 0 y duración > 0)")
+        stages.append(stage)
+    return stages
+
+
+def event_times(stages):
+    """Instante programado (s desde el inicio) de cada evento: rampas lineales por etapa.
+    
+    En una rampa de a a b ev/s en T segundos van N(t) = a·t + (b - a)·t²/2T
+    eventos; el k-ésimo se programa donde N(t) = k + 0.5.
+    """
+    times = []
+    offset = 0.0
+    for start, end, seconds in stages:
+        count = int(round((start + end) / 2 * seconds))
+        k = np.arange(count) + 0.5
+        if start == end:
+            t = k / start if start else np.zeros(0)
+        else:
+            slope = (end - start) / seconds
+            t = (np.sqrt(start * start + 2 * slope * k) - start) / slope
+        times.append(offset + t)
+        offset += seconds
+    return np.concatenate(times) if times else np.zeros(0)
+
+
+def target_rate(stages, moment):
+    """Ritmo objetivo (ev/s) en el instante `moment`"""
+    offset = 0.0
+    for start, end, seconds in stages:
+        if moment < offset + seconds:
+            return start + (end - start) * (moment - offset) / seconds
+        offset += seconds
+    return 0.0
+
+# =====================================================
+# ESTADÍSTICAS
+# =====================================================
+
+class LiveStats:
+    """Latencias y contadores por intervalo de reporte y acumulados.
+    
+    Cada intervalo se mide sobre su duración real (desde el cierre del
+    anterior), así una demora del reporte no infla ni achica el ritmo logrado.
+    """
+    
+    def __init__(self, stages, interval):
+        self.stages = stages
+        self.interval = interval
+        self.started = None
+        # Segundos desde el inicio en que arrancó el intervalo actual
+        self.interval_start = 0.0
+        self.intervals = []
+        self.commit_ms, self.response_ms, self.read_ms = [], [], []
+        self.errors = {}
+        self._reset()
+    
+    def _reset(self):
+        self.current = {'commit': [], 'response': [], 'read': [], 'scheduled': 0, 'errors': 0}
+    
+    def scheduled(self):
+        self.current['scheduled'] += 1
+    
+    def commit(self, service_ms, response_ms):
+        self.current['commit'].append(service_ms)
+        self.current['response'].append(response_ms)
+    
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+        self.current['errors'] += 1
+    
+    def read(self, elapsed_ms):
+        self.current['read'].append(elapsed_ms)
+    
+    def flush(self, elapsed, final=False):
+        """Cierra el intervalo actual en `elapsed`, lo imprime y lo agrega a la serie.
+        
+        Con `final` (fin de la corrida) el intervalo puede ser más corto que
+        los demás: si lo es queda marcado `partial` y saturation() lo ignora.
+        """
+        current = self.current
+        self._reset()
+        self.commit_ms += current['commit']
+        self.response_ms += current['response']
+        self.read_ms += current['read']
+        span = elapsed - self.interval_start
+        point = {
+            't': round(elapsed, 1),
+            'span_s': round(span, 3),
+            'partial': final and span < self.interval,
+            'target_rate': round(target_rate(self.stages, self.interval_start + span / 2), 1),
+            'achieved_rate': round(len(current['commit']) / span, 1) if span > 0 else 0.0,
+            'scheduled': current['scheduled'],
+            'commits': len(current['commit']),
+            'errors': current['errors'],
+            'commit_ms': latency_stats(current['commit']) if current['commit'] else None,
+            'response_p99_ms': round(float(np.percentile(current['response'], 99)), 3) if current['response'] else None,
+            'read_ms': latency_stats(current['read']) if current['read'] else None,
+        }
+        self.intervals.append(point)
+        self.interval_start = elapsed
+        
+        commit = point['commit_ms'] or {'p50': 0, 'p95': 0, 'p99': 0}
+        reads = f"  lecturas p95 {point['read_ms']['p95']:>8.1f} ms" if point['read_ms'] else ""
+        partial = f"  (parcial, {span:.1f}s)" if point['partial'] else ""
+        print(f"   {point['t']:>6.0f}s  objetivo {point['target_rate']:>7.0f}/s  logrado {point['achieved_rate']:>7.0f}/s  "
+              f"commit p50 {commit['p50']:>6.1f} p95 {commit['p95']:>6.1f} p99 {commit['p99']:>7.1f} ms  "
+              f"respuesta p99 {point['response_p99_ms'] or 0:>8.1f} ms  errores {point['errors']}{reads}{partial}")
+    
+    def saturation(self):
+        """Primer intervalo completo con ritmo logrado bajo el objetivo o cola creciente (None si no saturó)"""
+        for point in self.intervals:
+            # El último tramo de la corrida es corto y ruidoso: no cuenta
+            if not point['target_rate'] or point['partial']:
+                continue
+            lagging = point['response_p99_ms'] is not None and point['response_p99_ms'] > SATURATION_LAG_MS
+            if point['achieved_rate'] < SATURATION_RATIO * point['target_rate'] or lagging:
+                return point
+        return None
+    
+    def summary(self, elapsed):
+        saturated = self.saturation()
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'commits': len(self.commit_ms),
+            'throughput': round(len(self.commit_ms) / elapsed, 1) if elapsed else 0,
+            'errors': self.errors,
+            'commit_ms': latency_stats(self.commit_ms) if self.commit_ms else None,
+            'response_ms': latency_stats(self.response_ms) if self.response_ms else None,
+            'read_ms': latency_stats(self.read_ms) if self.read_ms else None,
+            'saturation': saturated and {'t': saturated['t'], 'target_rate': saturated['target_rate'],
+                                         'achieved_rate': saturated['achieved_rate']},
+            'intervals': self.intervals,
+        }
+
+# =====================================================
+# BD
+# =====================================================
+
+def live_connection(args):
+    """Conexión con la sesión de una app normal (connect_db la deja preparada para carga masiva)"""
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database)
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.execute("SET UNIQUE_CHECKS = 1")
+    cursor.close()
+    return conn
+
+
+def load_stock(faker, conn, creates=()):
+    """Carga locations y el stock actual en el ledger del faker. Retorna el workspace de cada par"""
+    cursor = conn.cursor()
+    try:
+        # Vistas que consultan los lectores
+        for statement in creates:
+            cursor.execute(statement)
+        cursor.execute("SELECT id FROM locations_locations")
+        faker.locations = [row[0] for row in cursor.fetchall()]
+        faker.load_ledger(cursor)
+        cursor.execute("SELECT sku, location_id, workspace_id FROM stock_items")
+        workspaces = {(sku, location_id): workspace_id for sku, location_id, workspace_id in cursor.fetchall()}
+        conn.commit()
+        return workspaces
+    finally:
+        cursor.close()
+
+
+def apply_movement(conn, row):
+    """Registra un movimiento y ajusta stock_items en una transacción. Retorna el tiempo de servicio en ms"""
+    moment = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    row = dict(row, created_at=moment, processed_at=moment)
+    quantity = row['quantity']
+    updates = []
+    if row['location_from_id']:
+        updates.append((row['location_from_id'], -quantity))
+    if row['location_to_id']:
+        updates.append((row['location_to_id'], quantity))
+    
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"INSERT INTO `stock_movements` ({', '.join(f'`{c}`' for c in row)}) "
+                       f"VALUES ({', '.join(['%s'] * len(row))})", list(row.values()))
+        # Siempre en el mismo orden de ubicación: dos transferencias cruzadas no se bloquean en ciclo
+        for location_id, delta in sorted(updates):
+            cursor.execute(UPDATE_STOCK, (delta, moment, row['sku'], location_id))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return (time.perf_counter() - started) * 1000
+
+
+def run_read(conn, query):
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query)
+        cursor.fetchall()
+        conn.commit()
+    finally:
+        cursor.close()
+    return (time.perf_counter() - started) * 1000
+
+# =====================================================
+# DRIVER
+# =====================================================
+
+async def produce(faker, times, workspaces, queues, stats, started):
+    """Entrega cada movimiento a la cola de su writer en su instante programado.
+    
+    Todos los movimientos de un SKU van al mismo writer (crc32 del SKU): los
+    de cada par (sku, ubicación), incluidas las dos puntas de una
+    transferencia, se aplican en el orden en que el ledger los generó.
+    """
+    chunks = faker.iter_stock_movements(len(times), live=True)
+    index = 0
+    while True:
+        # Generar en un thread: el loop sigue despachando mientras tanto
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            break
+        for row in chunk:
+            row['workspace_id'] = workspaces.get((row['sku'], row['location_from_id'] or row['location_to_id']),
+                                                 row['workspace_id'])
+            delay = started + times[index] - time.perf_counter()
+            if delay > 0.001:
+                await asyncio.sleep(delay)
+            stats.scheduled()
+            await queues[zlib.crc32(row['sku'].encode()) % len(queues)].put((started + times[index], row))
+            index += 1
+    for queue in queues:
+        await queue.put(None)
+
+
+async def write_worker(conn, queue, stats, faker):
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        scheduled, row = item
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                service_ms = await asyncio.to_thread(apply_movement, conn, row)
+            except Exception as e:
+                errno = getattr(e, 'errno', None)
+                stats.error(LOCK_ERRORS.get(errno, f"error_{errno}" if errno else type(e).__name__))
+                if errno in LOCK_ERRORS and attempt < LOCK_RETRIES:
+                    continue
+                # No quedó en la BD: los eventos que se generen después parten del saldo real
+                faker.revert_movement(row)
+                stats.error('dropped')
+                break
+            stats.commit(service_ms, (time.perf_counter() - scheduled) * 1000)
+            break
+
+
+async def read_worker(conn, queries, stats, done, rng):
+    while not done.is_set():
+        try:
+            stats.read(await asyncio.to_thread(run_read, conn, rng.choice(queries)))
+        except Exception as e:
+            stats.error(f"read_{getattr(e, 'errno', None) or type(e).__name__}")
+
+
+async def report_loop(stats, started, done):
+    """Cierra un intervalo en cada started + k·interval: la demora de un cierre no corre los siguientes"""
+    tick = 1
+    while not done.is_set():
+        try:
+            await asyncio.wait_for(done.wait(), max(started + tick * stats.interval - time.perf_counter(), 0))
+        except asyncio.TimeoutError:
+            elapsed = time.perf_counter() - started
+            stats.flush(elapsed)
+            # Si el loop se atrasó más de un intervalo, los vencidos se saltean
+            tick = max(tick + 1, int(elapsed // stats.interval) + 1)
+
+
+async def run_live(args, faker, workspaces, times, queries):
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(args.connections + args.readers + 1))
+    writers = await asyncio.gather(*(asyncio.to_thread(live_connection, args) for _ in range(args.connections)))
+    readers = await asyncio.gather(*(asyncio.to_thread(live_connection, args) for _ in range(args.readers)))
+    stats = LiveStats(args.stages, args.report_interval)
+    queues = [asyncio.Queue(maxsize=QUEUE_PER_CONNECTION) for _ in writers]
+    done = asyncio.Event()
+    rng = random.Random(args.seed)
+    
+    try:
+        started = time.perf_counter()
+        reporter = asyncio.create_task(report_loop(stats, started, done))
+        reading = [asyncio.create_task(read_worker(conn, list(queries.values()), stats, done, rng)) for conn in readers]
+        await asyncio.gather(
+            produce(faker, times, workspaces, queues, stats, started),
+            *(write_worker(conn, queue, stats, faker) for conn, queue in zip(writers, queues)),
+        )
+        elapsed = time.perf_counter() - started
+        done.set()
+        await asyncio.gather(reporter, *reading)
+        stats.flush(elapsed, final=True)
+        return stats.summary(elapsed)
+    finally:
+        for conn in writers + readers:
+            conn.close()
+
+# =====================================================
+# MAIN
+# =====================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - Driver de escritura sostenida de movimientos')
+    parser.add_argument('--rate', type=float, default=100, help='Movimientos por segundo (ritmo constante)')
+    parser.add_argument('--duration', type=float, default=60, help='Segundos a ritmo constante')
+    parser.add_argument('--stages', type=parse_stages, default=None,
+                        help="Perfil por etapas 'ritmo@s' o rampas 'inicio-fin@s' separadas por coma (reemplaza --rate/--duration)")
+    parser.add_argument('--connections', type=int, default=4, help='Conexiones de escritura')
+    parser.add_argument('--readers', type=int, default=0,
+                        help='Conexiones que consultan las vistas de dashboard en bucle mientras tanto')
+    parser.add_argument('--views', type=str, default=None,
+                        help=f"Vistas para los lectores separadas por coma (default: {','.join(BENCH_VIEWS)})")
+    parser.add_argument('--report-interval', type=float, default=5, help='Segundos por intervalo del reporte')
+    parser.add_argument('--distributions', type=str, default=None, metavar='NAME|FILE',
+                        help='Perfil de distribuciones (SKUs/ubicaciones calientes, cantidades), ver faker_data.py')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla de los eventos')
+    parser.add_argument('--output', type=str, default=None, metavar='FILE', help='Guardar el reporte en JSON')
+    
+    # DB connection args
+    parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3307')), help='MySQL port')
+    parser.add_argument('--user', type=str, default=os.getenv('DB_USER', 'root'), help='MySQL user')
+    parser.add_argument('--password', type=str, default=os.getenv('DB_PASSWORD', ''), help='MySQL password')
+    parser.add_argument('--database', type=str, default=os.getenv('DB_DATABASE', 'vessel_test'), help='MySQL database')
+    
+    args = parser.parse_args()
+    
+    if not HAS_MYSQL:
+        print("❌ Error: mysql-connector-python no está instalado")
+        print("   Ejecuta: pip install mysql-connector-python")
+        exit(1)
+    
+    try:
+        distributions = Distributions.load(args.distributions) if args.distributions else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en el perfil de distribuciones: {e}")
+        exit(1)
+    
+    args.stages = args.stages or [(args.rate, args.rate, args.duration)]
+    times = event_times(args.stages)
+    creates, queries = load_queries(args.views.split(',') if args.views else None)
+    
+    faker = VesselFaker(seed=args.seed, distributions=distributions)
+    conn = live_connection(args)
+    try:
+        print(f"📦 Cargando stock actual de {args.database}...")
+        workspaces = load_stock(faker, conn, creates if args.readers else ())
+    finally:
+        conn.close()
+    if not len(faker.ledger):
+        print("❌ Error: no hay stock_items en la BD. Sembrar primero con faker_data.py")
+        exit(1)
+    print(f"   {len(faker.ledger):,} stock items en {len(faker.locations):,} ubicaciones")
+    
+    seconds = sum(stage[2] for stage in args.stages)
+    print(f"\n🚚 {len(times):,} movimientos en {seconds:.0f}s por {args.connections} conexiones"
+          f"{f' + {args.readers} lectores' if args.readers else ''} (semilla {faker.seed})")
+    summary = asyncio.run(run_live(args, faker, workspaces, times, queries))
+    
+    commit = summary['commit_ms'] or {'p50': 0, 'p95': 0, 'p99': 0}
+    print(f"\n✅ {summary['commits']:,} commits en {summary['elapsed_s']}s ({summary['throughput']:,}/s)")
+    print(f"   commit p50 {commit['p50']} ms · p95 {commit['p95']} ms · p99 {commit['p99']} ms")
+    if summary['errors']:
+        print(f"   ⚠ errores: {', '.join(f'{kind} {count}' for kind, count in summary['errors'].items())}")
+    saturation = summary['saturation']
+    if saturation:
+        print(f"   ⚠ Saturación desde t={saturation['t']}s: objetivo {saturation['target_rate']}/s, "
+              f"logrado {saturation['achieved_rate']}/s")
+    else:
+        print("   Sin saturación en el perfil probado")
+    
+    if args.output:
+        summary.update(generated=datetime.now().isoformat(sep=' ', timespec='seconds'), stages=args.stages,
+                       connections=args.connections, readers=args.readers, seed=faker.seed)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"📊 Reporte guardado en {args.output}")
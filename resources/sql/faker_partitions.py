@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - Benchmark de stock_movements particionado por mes
+Compara el kardex en una tabla normal contra la misma tabla con RANGE por mes
+sobre created_at (ver --partition-movements en faker_data.py):
+
+    1. Genera --movements movimientos sobre el stock ya sembrado y los carga
+       idénticos en dos tablas scratch: una normal y otra particionada, donde
+       cada chunk mensual va directo a su partición
+    2. Mide consultas de kardex acotadas por fecha (p50/p95/p99) y guarda del
+       EXPLAIN cuántas particiones lee cada una (partition pruning)
+    3. Retención del mes más antiguo: DELETE contra DROP PARTITION, y archivado
+       del siguiente: INSERT ... SELECT + DELETE contra EXCHANGE PARTITION
+
+Las tablas scratch se crean con CREATE TABLE ... LIKE stock_movements y se
+borran al terminar (salvo --keep-tables); stock_movements no se toca.
+
+Uso:
+    python faker_partitions.py --movements 500000
+    python faker_partitions.py --movements 1000000 --loader infile --runs 20
+    python faker_partitions.py --now '2025-01-01 00:00:00' --output partitions.json
+
+Requisitos:
+    pip install faker numpy mysql-connector-python
+    BD sembrada con faker_data.py (locations y stock_items)
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from faker_bench import latency_stats, time_query
+from faker_data import (
+    HAS_MYSQL, Distributions, VesselFaker, connect_db, insert_with_loader, iter_partition_chunks, movement_partitions,
+    partition_movements_ddl, run_clock, set_run_clock,
+)
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+PLAIN_TABLE = 'bench_movements_plain'
+PARTITIONED_TABLE = 'bench_movements_partitioned'
+
+# Sufijo de las tablas a las que se archiva un mes
+ARCHIVE_SUFFIX = '_archive'
+
+KARDEX_COLUMNS = "`id`, `sku`, `created_at`, `movement_type`, `quantity`, `balance_after`"
+
+
+def bench_queries(sku, location, month, week_start):
+    """{nombre: (query con {table}, parámetros)} del kardex a comparar"""
+    start, end = month
+    return {
+        # Kardex de un SKU en un mes: el caso típico de la pantalla de movimientos
+        'kardex_sku_month': (
+            f"SELECT {KARDEX_COLUMNS} FROM `{{table}}` "
+            "WHERE `sku` = %s AND `created_at` >= %s AND `created_at` < %s ORDER BY `created_at`",
+            (sku, start, end),
+        ),
+        'kardex_location_week': (
+            f"SELECT {KARDEX_COLUMNS} FROM `{{table}}` "
+            "WHERE `location_to_id` = %s AND `created_at` >= %s ORDER BY `created_at`",
+            (location, week_start),
+        ),
+        'movements_by_type_month': (
+            "SELECT `movement_type`, COUNT(*), SUM(`quantity`) FROM `{table}` "
+            "WHERE `created_at` >= %s AND `created_at` < %s GROUP BY `movement_type`",
+            (start, end),
+        ),
+        # Sin filtro de fecha no hay pruning: mide el costo de recorrer todas las particiones
+        'kardex_sku_all': (
+            f"SELECT {KARDEX_COLUMNS} FROM `{{table}}` WHERE `sku` = %s ORDER BY `created_at`",
+            (sku,),
+        ),
+    }
+
+# =====================================================
+# CARGA
+# =====================================================
+
+def create_scratch_tables(cursor, partitions):
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        cursor.execute(f"DROP TABLE IF EXISTS `{table}`, `{table}{ARCHIVE_SUFFIX}`")
+        cursor.execute(f"CREATE TABLE `{table}` LIKE `stock_movements`")
+    for statement in partition_movements_ddl(partitions, PARTITIONED_TABLE):
+        cursor.execute(statement)
+
+
+def drop_scratch_tables(cursor):
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        cursor.execute(f"DROP TABLE IF EXISTS `{table}`, `{table}{ARCHIVE_SUFFIX}`")
+
+
+def load_movements(conn, faker, table, count, loader, partitions=None):
+    """Genera y carga el kardex en `table` (por partición si se pasan `partitions`)"""
+    cursor = conn.cursor()
+    try:
+        started = time.perf_counter()
+        chunks = faker.iter_stock_movements(count=count)
+        if partitions:
+            chunks = iter_partition_chunks(chunks, partitions)
+        total = insert_with_loader(cursor, table, chunks, loader)
+        conn.commit()
+        elapsed = time.perf_counter() - started
+        print(f"   {table}: {total:,} filas en {elapsed:.2f}s ({total / elapsed:,.0f} filas/s)")
+        return {'rows': total, 'seconds': round(elapsed, 3), 'rows_per_s': round(total / elapsed)}
+    finally:
+        cursor.close()
+
+
+def table_size(cursor, database, table):
+    cursor.execute(
+        "SELECT data_length, index_length FROM information_schema.tables WHERE table_schema = %s AND table_name = %s",
+        (database, table)
+    )
+    data_length, index_length = cursor.fetchone()
+    return {'data_mb': round(data_length / 1024 ** 2, 2), 'index_mb': round(index_length / 1024 ** 2, 2)}
+
+
+def partition_rows(cursor, table, partition):
+    cursor.execute(f"SELECT COUNT(*) FROM `{table}` PARTITION (`{partition}`)")
+    return cursor.fetchone()[0]
+
+# =====================================================
+# QUERIES
+# =====================================================
+
+def pick_targets(cursor, month, week_start):
+    """SKU con más movimientos en el mes y ubicación destino más usada en la semana"""
+    cursor.execute(
+        f"SELECT `sku` FROM `{PLAIN_TABLE}` WHERE `created_at` >= %s AND `created_at` < %s "
+        "GROUP BY `sku` ORDER BY COUNT(*) DESC LIMIT 1",
+        month
+    )
+    row = cursor.fetchone()
+    sku = row[0] if row else ''
+    cursor.execute(
+        f"SELECT `location_to_id` FROM `{PLAIN_TABLE}` WHERE `created_at` >= %s AND `location_to_id` IS NOT NULL "
+        "GROUP BY `location_to_id` ORDER BY COUNT(*) DESC LIMIT 1",
+        (week_start,)
+    )
+    row = cursor.fetchone()
+    return sku, row[0] if row else ''
+
+
+def explain_partitions(cursor, query, params):
+    """Particiones que lee la query según EXPLAIN y filas estimadas"""
+    cursor.execute(f"EXPLAIN {query}", params)
+    columns = [column[0] for column in cursor.description]
+    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    partitions = rows[0].get('partitions') if rows else None
+    return {
+        'partitions': len(partitions.split(',')) if partitions else None,
+        'estimated_rows': sum(int(row.get('rows') or 0) for row in rows),
+    }
+
+
+def bench_tables(cursor, queries, runs, warmup):
+    results = {}
+    for name, (template, params) in queries.items():
+        results[name] = {}
+        for label, table in (('plain', PLAIN_TABLE), ('partitioned', PARTITIONED_TABLE)):
+            query = template.format(table=table)
+            latencies, rows = time_query(cursor, query, runs, warmup, params)
+            results[name][label] = {
+                'rows': rows,
+                'latency_ms': latency_stats(latencies),
+                'explain': explain_partitions(cursor, query, params),
+            }
+        plain, partitioned = results[name]['plain'], results[name]['partitioned']
+        results[name]['speedup'] = round(plain['latency_ms']['p50'] / max(partitioned['latency_ms']['p50'], 1e-6), 2)
+        print(f"   {name}: p50 {plain['latency_ms']['p50']} ms → {partitioned['latency_ms']['p50']} ms "
+              f"(x{results[name]['speedup']}, {partitioned['explain']['partitions']} particiones)")
+    return results
+
+# =====================================================
+# RETENCIÓN
+# =====================================================
+
+def timed(conn, statements):
+    """Ejecuta las sentencias y el commit. Retorna (ms, filas afectadas por la última)"""
+    cursor = conn.cursor()
+    try:
+        started = time.perf_counter()
+        for statement, params in statements:
+            cursor.execute(statement, params)
+        conn.commit()
+        return round((time.perf_counter() - started) * 1000, 3), cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def drop_oldest(conn, partitions):
+    """Borra el mes más antiguo: DELETE por rango contra DROP PARTITION"""
+    name, bound = partitions[0]
+    cursor = conn.cursor()
+    rows = partition_rows(cursor, PARTITIONED_TABLE, name)
+    cursor.close()
+    
+    delete_ms, deleted = timed(conn, [(f"DELETE FROM `{PLAIN_TABLE}` WHERE `created_at` < %s", (bound,))])
+    drop_ms, _ = timed(conn, [(f"ALTER TABLE `{PARTITIONED_TABLE}` DROP PARTITION `{name}`", None)])
+    print(f"   {name} ({rows:,} filas): DELETE {delete_ms:,.1f} ms · DROP PARTITION {drop_ms:,.1f} ms")
+    return {'partition': name, 'rows': rows, 'deleted': deleted, 'delete_ms': delete_ms, 'drop_partition_ms': drop_ms}
+
+
+def archive_month(conn, partitions):
+    """Archiva un mes a otra tabla: INSERT ... SELECT + DELETE contra EXCHANGE PARTITION"""
+    (_, start), (name, end) = partitions[0], partitions[1]
+    plain_archive, partitioned_archive = f"{PLAIN_TABLE}{ARCHIVE_SUFFIX}", f"{PARTITIONED_TABLE}{ARCHIVE_SUFFIX}"
+    cursor = conn.cursor()
+    try:
+        rows = partition_rows(cursor, PARTITIONED_TABLE, name)
+        cursor.execute(f"CREATE TABLE `{plain_archive}` LIKE `{PLAIN_TABLE}`")
+        # EXCHANGE exige una tabla con la misma estructura y sin particiones
+        cursor.execute(f"CREATE TABLE `{partitioned_archive}` LIKE `{PARTITIONED_TABLE}`")
+        cursor.execute(f"ALTER TABLE `{partitioned_archive}` REMOVE PARTITIONING")
+    finally:
+        cursor.close()
+    
+    window = "`created_at` >= %s AND `created_at` < %s"
+    copy_ms, moved = timed(conn, [
+        (f"INSERT INTO `{plain_archive}` SELECT * FROM `{PLAIN_TABLE}` WHERE {window}", (start, end)),
+        (f"DELETE FROM `{PLAIN_TABLE}` WHERE {window}", (start, end)),
+    ])
+    exchange_ms, _ = timed(conn, [
+        (f"ALTER TABLE `{PARTITIONED_TABLE}` EXCHANGE PARTITION `{name}` WITH TABLE `{partitioned_archive}`", None),
+    ])
+    print(f"   {name} ({rows:,} filas): INSERT+DELETE {copy_ms:,.1f} ms · EXCHANGE PARTITION {exchange_ms:,.1f} ms")
+    return {'partition': name, 'rows': rows, 'moved': moved, 'insert_delete_ms': copy_ms, 'exchange_partition_ms': exchange_ms}
+
+# =====================================================
+# MAIN
+# =====================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - Benchmark de stock_movements particionado por mes')
+    parser.add_argument('--movements', type=int, default=200000, help='Movimientos a generar en cada tabla')
+    parser.add_argument('--runs', type=int, default=10, help='Ejecuciones medidas por query')
+    parser.add_argument('--warmup', type=int, default=1, help='Ejecuciones de calentamiento por query')
+    parser.add_argument('--loader', choices=['executemany', 'infile', 'infile-pipe'], default='executemany',
+                        help='Método de carga (ver faker_data.py)')
+    parser.add_argument('--distributions', type=str, default=None, metavar='NAME|FILE',
+                        help='Perfil de distribuciones (SKUs/ubicaciones calientes, cantidades), ver faker_data.py')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=None, metavar='DATETIME',
+                        help="Fin de la ventana de un año de movimientos (default: ahora)")
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de los movimientos')
+    parser.add_argument('--keep-tables', action='store_true', help='No borrar las tablas scratch al terminar')
+    parser.add_argument('--output', type=str, default=None, metavar='FILE', help='Guardar el reporte en JSON')
+    
+    # DB connection args
+    parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3307')), help='MySQL port')
+    parser.add_argument('--user', type=str, default=os.getenv('DB_USER', 'root'), help='MySQL user')
+    parser.add_argument('--password', type=str, default=os.getenv('DB_PASSWORD', ''), help='MySQL password')
+    parser.add_argument('--database', type=str, default=os.getenv('DB_DATABASE', 'vessel_test'), help='MySQL database')
+    
+    args = parser.parse_args()
+    
+    if not HAS_MYSQL:
+        print("❌ Error: mysql-connector-python no está instalado")
+        print("   Ejecuta: pip install mysql-connector-python")
+        exit(1)
+    
+    try:
+        distributions = Distributions.load(args.distributions) if args.distributions else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en el perfil de distribuciones: {e}")
+        exit(1)
+    
+    if args.now:
+        set_run_clock(args.now)
+    partitions = movement_partitions()
+    # Último mes completo de la ventana y última semana
+    month = (partitions[-3][1], partitions[-2][1])
+    week_start = (run_clock() - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+    
+    faker = VesselFaker(seed=args.seed, distributions=distributions)
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database, args.loader)
+    cursor = conn.cursor()
+    try:
+        print(f"📦 Cargando stock actual de {args.database}...")
+        cursor.execute("SELECT id FROM locations_locations")
+        faker.locations = [row[0] for row in cursor.fetchall()]
+        faker.load_ledger(cursor)
+        if not len(faker.ledger):
+            print("❌ Error: no hay stock_items en la BD. Sembrar primero con faker_data.py")
+            exit(1)
+        
+        print(f"\n📥 Cargando {args.movements:,} movimientos en cada tabla ({len(partitions) + 1} particiones, {args.loader})...")
+        create_scratch_tables(cursor, partitions)
+        load = {
+            'plain': load_movements(conn, faker, PLAIN_TABLE, args.movements, args.loader),
+            'partitioned': load_movements(conn, faker, PARTITIONED_TABLE, args.movements, args.loader, partitions),
+        }
+        for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+            cursor.execute(f"ANALYZE TABLE `{table}`")
+            cursor.fetchall()
+        sizes = {
+            'plain': table_size(cursor, args.database, PLAIN_TABLE),
+            'partitioned': table_size(cursor, args.database, PARTITIONED_TABLE),
+        }
+        
+        print(f"\n⏱ Kardex ({args.runs} ejecuciones, mes {month[0][:7]}): tabla normal → particionada")
+        sku, location = pick_targets(cursor, month, week_start)
+        queries = bench_tables(cursor, bench_queries(sku, location, month, week_start), args.runs, args.warmup)
+        
+        print("\n🗄 Retención")
+        retention = {'drop': drop_oldest(conn, partitions), 'archive': archive_month(conn, partitions)}
+        
+        if not args.keep_tables:
+            drop_scratch_tables(cursor)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.execute("SET UNIQUE_CHECKS = 1")
+    finally:
+        cursor.close()
+        conn.close()
+    
+    if args.output:
+        report = {
+            'generated': datetime.now().isoformat(sep=' ', timespec='seconds'),
+            'seed': faker.seed,
+            'movements': args.movements,
+            'loader': args.loader,
+            'runs': args.runs,
+            'partitions': [name for name, _ in partitions],
+            'load': load,
+            'sizes': sizes,
+            'queries': queries,
+            'retention': retention,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Reporte guardado en {args.output}")
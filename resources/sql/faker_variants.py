@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+VESSEL CATALOG - A/B de variantes de schema (costo de índices vs beneficio en queries)
+Siembra la misma semilla en varias variantes de índices de vessel_schema.sql y,
+por cada una, mide el tiempo de carga, el tamaño en disco de los índices y la
+latencia de las queries de powerbi_queries.sql. El reporte las pone lado a
+lado contra la primera variante (baseline = schema sin cambios).
+
+Cada variante es un JSON/YAML en schema_variants/ (o una ruta):
+
+    {
+      "name": "composite",
+      "description": "...",
+      "tables": {
+        "stock_items": {
+          "drop_indexes": ["idx_sku"],
+          "add_indexes": {"idx_workspace_sku": ["workspace_id", "sku"]}
+        }
+      },
+      "statements": ["ALTER TABLE ..."]     (opcional, SQL libre)
+    }
+
+Los cambios se aplican sobre el schema recién creado y antes de sembrar, así
+el tiempo de carga incluye mantener exactamente esos índices.
+
+⚠ Borra y recrea las tablas de --database: usar una BD dedicada.
+
+Uso:
+    python faker_variants.py --variants lean-indexes,composite,covering
+    python faker_variants.py --variants composite --stock 1000000 --runs 20 --output variants/
+    python faker_variants.py --list  # Variantes disponibles
+
+Requisitos:
+    pip install faker numpy mysql-connector-python
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import faker_data
+from faker_bench import BENCH_VIEWS, SIZE_TABLES, bench_scale, load_queries, seed_scale
+from faker_data import (
+    HAS_MYSQL, Distributions, Metrics, TextPool, connect_db, find_spec, read_spec, set_run_clock,
+)
+
+# =====================================================
+# CONFIGURACIÓN
+# =====================================================
+
+VARIANTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema_variants')
+
+# Tablas cuyo tiempo de carga (round-trip con la BD) se compara entre variantes
+LOAD_TABLES = ['stock_items', 'stock_movements']
+
+# =====================================================
+# VARIANTES
+# =====================================================
+
+def list_variants():
+    """Nombres de los presets de schema_variants/"""
+    if not os.path.isdir(VARIANTS_DIR):
+        return []
+    return sorted({os.path.splitext(name)[0] for name in os.listdir(VARIANTS_DIR)
+                   if name.endswith(('.json', '.yaml', '.yml'))})
+
+
+def load_variant(name):
+    """Lee una variante por nombre de preset o ruta"""
+    path = find_spec(name, VARIANTS_DIR)
+    if path is None:
+        raise ValueError(f"No existe la variante {name} (presets: {', '.join(list_variants()) or 'ninguna'})")
+    spec = read_spec(path)
+    spec.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    return spec
+
+
+def variant_statements(spec):
+    """Un ALTER TABLE por tabla (drop + add en una sola reconstrucción) más los statements libres"""
+    statements = []
+    for table, changes in (spec.get('tables') or {}).items():
+        unknown = set(changes) - {'drop_indexes', 'add_indexes'}
+        if unknown:
+            raise ValueError(f"{spec['name']}: claves desconocidas en {table}: {', '.join(sorted(unknown))}")
+        clauses = [f"DROP INDEX `{index}`" for index in changes.get('drop_indexes') or []]
+        for index, columns in (changes.get('add_indexes') or {}).items():
+            if not columns:
+                raise ValueError(f"{spec['name']}: el índice {table}.{index} no tiene columnas")
+            clauses.append(f"ADD INDEX `{index}` ({', '.join(f'`{column}`' for column in columns)})")
+        if clauses:
+            statements.append(f"ALTER TABLE `{table}` {', '.join(clauses)}")
+    return statements + list(spec.get('statements') or [])
+
+# =====================================================
+# MEDICIÓN
+# =====================================================
+
+def index_sizes(args):
+    """Tamaño de cada índice de SIZE_TABLES en MB (mysql.innodb_index_stats, tras ANALYZE TABLE)"""
+    conn = connect_db(args.host, args.port, args.user, args.password, args.database)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT table_name, index_name, stat_value * @@innodb_page_size FROM mysql.innodb_index_stats "
+            f"WHERE database_name = %s AND stat_name = 'size' AND table_name IN ({', '.join(['%s'] * len(SIZE_TABLES))})",
+            (args.database, *SIZE_TABLES)
+        )
+        sizes = {}
+        for table, index, size in cursor.fetchall():
+            sizes.setdefault(table, {})[index] = round(int(size) / 1024 / 1024, 2)
+        return sizes
+    except Exception as e:
+        print(f"   ⚠ Sin tamaño por índice: {e}")
+        return {}
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def run_variant(args, spec, creates, queries, text_pool):
+    statements = variant_statements(spec)
+    print(f"\n🧬 Variante: {spec['name']}" + (f" — {spec['description']}" if spec.get('description') else ''))
+    for statement in statements:
+        print(f"   {statement}")
+    
+    # Métricas de carga propias de esta variante
+    faker_data.metrics = Metrics()
+    started = time.perf_counter()
+    counts = seed_scale(args, args.stock, text_pool, statements)
+    seed_seconds = time.perf_counter() - started
+    phases = faker_data.metrics.summary()['phases']
+    
+    print(f"\n⏱  Ejecutando {len(queries)} queries × {args.runs}...")
+    results, sizes = bench_scale(args, creates, queries)
+    return {
+        'name': spec['name'],
+        'description': spec.get('description'),
+        'statements': statements,
+        'counts': counts,
+        'seed_s': round(seed_seconds, 2),
+        'load': {table: {'wall_s': phases[table]['wall_s'], 'db_s': phases[table]['db_s'],
+                         'rows_per_s': phases[table]['rows_per_s']}
+                 for table in LOAD_TABLES if table in phases},
+        'table_sizes': sizes,
+        'index_sizes': index_sizes(args),
+        'queries': results,
+    }
+
+# =====================================================
+# REPORTE
+# =====================================================
+
+def _change(value, base):
+    return f" ({(value - base) / base * 100:+.0f}%)" if base else ""
+
+
+def markdown_report(report):
+    variants = report['variants']
+    base = variants[0]
+    header = "| | " + " | ".join(variant['name'] for variant in variants) + " |"
+    separator = "|---|" + "---|" * len(variants)
+    lines = [
+        "# Variantes de schema",
+        "",
+        f"Generado: {report['generated']} · semilla {report['seed']} · ahora {report['now']} · "
+        f"{report['stock']:,} stock items · "
+        f"{report['runs']} ejecuciones por query · cambios relativos a `{base['name']}`",
+        "",
+    ]
+    for variant in variants:
+        lines.append(f"- **{variant['name']}**: {variant['description'] or '-'}")
+        lines += [f"  - `` {statement} ``" for statement in variant['statements']]
+    
+    lines += ["", "## Carga (s)", "", header, separator]
+    cells = [f"{v['seed_s']:.2f}{'' if v is base else _change(v['seed_s'], base['seed_s'])}" for v in variants]
+    lines.append("| Siembra total | " + " | ".join(cells) + " |")
+    for table in LOAD_TABLES:
+        cells = []
+        for variant in variants:
+            load, base_load = variant['load'].get(table), None if variant is base else base['load'].get(table)
+            cells.append(f"{load['wall_s']:.2f}{_change(load['wall_s'], base_load['wall_s']) if base_load else ''}"
+                         if load else "-")
+        lines.append(f"| {table} | " + " | ".join(cells) + " |")
+    
+    lines += ["", "## Índices en disco (MB)", "", header, separator]
+    for table in sorted({table for variant in variants for table in variant['table_sizes']}):
+        cells = []
+        for variant in variants:
+            size, base_size = variant['table_sizes'].get(table), None if variant is base else base['table_sizes'].get(table)
+            cells.append(f"{size['index_mb']:.1f}{_change(size['index_mb'], base_size['index_mb']) if base_size else ''}"
+                         if size else "-")
+        lines.append(f"| {table} | " + " | ".join(cells) + " |")
+    
+    lines += ["", "## Latencia p50 / p95 (ms)", "", header, separator]
+    for name in report['queries']:
+        cells = []
+        for variant in variants:
+            stats, base_stats = variant['queries'][name]['latency_ms'], base['queries'][name]['latency_ms']
+            change = '' if variant is base else _change(stats['p50'], base_stats['p50'])
+            cells.append(f"{stats['p50']:.2f} / {stats['p95']:.2f}{change}")
+        lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    
+    if any(variant['index_sizes'] for variant in variants):
+        lines += ["", "## Detalle por índice (MB)", ""]
+        for variant in variants:
+            lines += [f"### {variant['name']}", "", "| Tabla | Índice | MB |", "|---|---|---|"]
+            for table, indexes in sorted(variant['index_sizes'].items()):
+                lines += [f"| {table} | {index} | {size:.2f} |" for index, size in sorted(indexes.items())]
+            lines.append("")
+    
+    explains = [(variant['name'], name, result['explain'])
+                for variant in variants for name, result in variant['queries'].items() if result['explain']]
+    if explains:
+        lines += ["", "## EXPLAIN ANALYZE", ""]
+        for variant, name, explain in explains:
+            lines += [f"### {name} ({variant})", "", "```", explain, "```", ""]
+    
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(report, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, 'variants.json')
+    md_path = os.path.join(output_dir, 'variants.md')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_report(report))
+    print(f"\n✅ Reporte: {md_path} (datos en {json_path})")
+
+# =====================================================
+# MAIN
+# =====================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Vessel Catalog - A/B de variantes de índices del schema')
+    parser.add_argument('--variants', type=str, default=','.join(list_variants()),
+                        help='Variantes a comparar separadas por coma (presets de schema_variants/ o rutas)')
+    parser.add_argument('--no-baseline', dest='baseline', action='store_false',
+                        help='No incluir el schema sin cambios como primera variante')
+    parser.add_argument('--list', action='store_true', help='Listar las variantes disponibles y salir')
+    parser.add_argument('--stock', type=int, default=100000, help='Filas de stock_items a sembrar en cada variante')
+    parser.add_argument('--locations', type=int, default=50, help='Ubicaciones a sembrar')
+    parser.add_argument('--runs', type=int, default=10, help='Ejecuciones medidas por query')
+    parser.add_argument('--warmup', type=int, default=1, help='Ejecuciones previas no medidas')
+    parser.add_argument('--views', type=str, default=None,
+                        help=f"Vistas a medir separadas por coma (default: {','.join(BENCH_VIEWS)})")
+    parser.add_argument('--no-explain', dest='explain', action='store_false', help='No capturar EXPLAIN ANALYZE')
+    parser.add_argument('--distributions', type=str, default=None, metavar='NAME|FILE',
+                        help='Perfil de distribuciones de la siembra (ver faker_data.py --distributions)')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla de los datos (igual en todas las variantes)')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=datetime(2025, 1, 1),
+                        help="'Ahora' fijo de los datos generados; las vistas lo usan como CURDATE()")
+    parser.add_argument('--workers', type=int, default=1, help='Procesos de generación en paralelo')
+    parser.add_argument('--connections', type=int, default=1, help='Conexiones de carga en paralelo')
+    parser.add_argument('--loader', choices=['executemany', 'infile', 'infile-pipe'], default='executemany',
+                        help='Método de carga de la siembra')
+    parser.add_argument('--output', type=str, default='variants_results', help='Directorio del reporte')
+    
+    # DB connection args
+    parser.add_argument('--host', type=str, default=os.getenv('DB_HOST', 'localhost'), help='MySQL host')
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3307')), help='MySQL port')
+    parser.add_argument('--user', type=str, default=os.getenv('DB_USER', 'root'), help='MySQL user')
+    parser.add_argument('--password', type=str, default=os.getenv('DB_PASSWORD', ''), help='MySQL password')
+    parser.add_argument('--database', type=str, default=os.getenv('DB_BENCH_DATABASE', 'vessel_bench'),
+                        help='BD dedicada (se recrean sus tablas en cada variante)')
+    
+    args = parser.parse_args()
+    
+    if args.list:
+        for name in list_variants():
+            print(f"   {name:<16} {load_variant(name).get('description', '')}")
+        exit(0)
+    
+    if not HAS_MYSQL:
+        print("❌ Error: mysql-connector-python no está instalado")
+        print("   Ejecuta: pip install mysql-connector-python")
+        exit(1)
+    
+    try:
+        specs = [load_variant(name.strip()) for name in args.variants.split(',') if name.strip()]
+        for spec in specs:
+            variant_statements(spec)
+        args.distributions = Distributions.load(args.distributions) if args.distributions else Distributions()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en las variantes o el perfil de distribuciones: {e}")
+        exit(1)
+    if args.baseline:
+        specs.insert(0, {'name': 'baseline', 'description': 'vessel_schema.sql sin cambios'})
+    if not specs:
+        print("❌ Error: no hay variantes que comparar")
+        exit(1)
+    
+    # seed_scale y bench_scale de faker_bench: mismas opciones que el benchmark de escalas
+    args.rollups = False
+    set_run_clock(args.now)
+    creates, queries = load_queries(args.views.split(',') if args.views else None, today=args.now)
+    text_pool = TextPool.load(args.seed)
+    report = {
+        'generated': datetime.now().isoformat(sep=' ', timespec='seconds'),
+        'seed': args.seed,
+        'now': args.now.isoformat(sep=' '),
+        'stock': args.stock,
+        'distributions': args.distributions.profile,
+        'runs': args.runs,
+        'queries': queries,
+        'variants': [run_variant(args, spec, creates, queries, text_pool) for spec in specs],
+    }
+    write_report(report, args.output)
@@ -86,6 +86,8 @@ SELECT
     m.movement_type,
     m.quantity,
     m.balance_after,
+    -- Transferencias: saldo del destino tras recibir (balance_after es el del origen)
+    CAST(JSON_EXTRACT(m.meta, '$.balance_after_to') AS SIGNED) AS balance_after_to,
     m.reference,
     lf.name AS location_from,
     lt.name AS location_to,
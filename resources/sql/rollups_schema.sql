@@ -0,0 +1,81 @@
+-- =====================================================
+-- VESSEL CATALOG - TABLAS DE ROLLUPS PARA DASHBOARDS
+-- Database: MySQL 8.0+
+-- =====================================================
+-- Agregados precalculados que faker_data.py --rollups llena mientras genera
+-- los datos (junto con stock_current). Permiten comparar dashboards que leen
+-- rollups contra los que escanean stock_items/stock_movements en cada refresh
+-- (ver faker_bench.py --rollups).
+-- =====================================================
+
+SET NAMES utf8mb4;
+
+-- =====================================================
+-- Stock por ubicación (equivalente a vw_stock_by_location)
+-- =====================================================
+DROP TABLE IF EXISTS `rollup_stock_by_location`;
+CREATE TABLE `rollup_stock_by_location` (
+    `location_id` CHAR(36) NOT NULL PRIMARY KEY,
+    `location_name` VARCHAR(255) NOT NULL,
+    `location_type` VARCHAR(100) NULL,
+    `parent_location` VARCHAR(255) NULL,
+    `total_skus` INT NOT NULL DEFAULT 0,
+    `total_quantity` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `total_reserved` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `available_quantity` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `workspace_id` CHAR(36) NULL,
+    `updated_at` DATETIME NULL,
+    INDEX `idx_workspace` (`workspace_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- Inventario por categoría (equivalente a vw_inventory_by_category)
+-- Como la vista: una fila por nombre de término (de cualquier vocabulario)
+-- y 'Sin categoría' para los items sin términos; un item suma en cada uno
+-- =====================================================
+DROP TABLE IF EXISTS `rollup_inventory_by_category`;
+CREATE TABLE `rollup_inventory_by_category` (
+    `category` VARCHAR(255) NOT NULL PRIMARY KEY COMMENT 'Nombre del término (GROUP BY t.name de la vista)',
+    `total_items` INT NOT NULL DEFAULT 0,
+    `total_stock_records` INT NOT NULL DEFAULT 0,
+    `total_quantity` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `reserved` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `avg_quantity_per_location` DECIMAL(20,4) NULL,
+    `workspace_id` CHAR(36) NULL,
+    `updated_at` DATETIME NULL,
+    INDEX `idx_workspace` (`workspace_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- Movimientos por día y tipo (kardex agregado)
+-- =====================================================
+DROP TABLE IF EXISTS `rollup_movements_daily`;
+CREATE TABLE `rollup_movements_daily` (
+    `day` DATE NOT NULL,
+    `movement_type` VARCHAR(64) NOT NULL,
+    `movements` INT NOT NULL DEFAULT 0,
+    `total_quantity` BIGINT NOT NULL DEFAULT 0,
+    `workspace_id` CHAR(36) NULL,
+    `updated_at` DATETIME NULL,
+    PRIMARY KEY (`day`, `movement_type`),
+    INDEX `idx_workspace` (`workspace_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- Snapshot de KPIs (equivalente a la query de KPIs del dashboard)
+-- =====================================================
+DROP TABLE IF EXISTS `rollup_kpi_snapshot`;
+CREATE TABLE `rollup_kpi_snapshot` (
+    `snapshot_at` DATETIME NOT NULL PRIMARY KEY,
+    `total_items` INT NOT NULL DEFAULT 0,
+    `active_items` INT NOT NULL DEFAULT 0,
+    `total_locations` INT NOT NULL DEFAULT 0,
+    `warehouses` INT NOT NULL DEFAULT 0,
+    `stock_records` INT NOT NULL DEFAULT 0,
+    `total_stock_quantity` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `total_reserved` DECIMAL(20,4) NOT NULL DEFAULT 0,
+    `out_of_stock` INT NOT NULL DEFAULT 0,
+    `low_stock` INT NOT NULL DEFAULT 0,
+    `total_movements` INT NOT NULL DEFAULT 0,
+    `workspace_id` CHAR(36) NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;